@@ -0,0 +1,72 @@
+"""order status: native enum + CHECK constraint + index
+
+``orders.status`` is filtered on by every list, board and statistics query
+but was never indexed. The ORM now declares it as
+``SAEnum(OrderStatusEnum, native_enum=True, create_constraint=True,
+validate_strings=True)`` with ``index=True``.
+
+Fresh DBs get all of this from ``v1_initial``'s ``create_all``. Legacy
+PostgreSQL DBs that still carry ``status`` as ``VARCHAR`` (pre-enum
+deployments) are converted in place via ``USING status::orderstatusenum``;
+the enum type is created first if it is missing. Non-PG dialects only get
+the index — SQLite cannot ALTER a column type and already stores the enum
+as VARCHAR + CHECK.
+
+Revision ID: 20261015_p1_order_status_enum
+Revises: 20260705_v13t5_qli_est_meta
+Create Date: 2026-10-15
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_p1_order_status_enum"
+down_revision: Union[str, None] = "20260705_v13t5_qli_est_meta"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEX_NAME = "ix_orders_status"
+
+
+def upgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        create_index_if_not_exists,
+    )
+    from goldsmith_erp.db.models import OrderStatusEnum  # noqa: PLC0415
+
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        data_type = bind.execute(
+            sa.text(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_name = 'orders' AND column_name = 'status'"
+            )
+        ).scalar()
+        if data_type is not None and data_type != "USER-DEFINED":
+            labels = ", ".join(f"'{member.value}'" for member in OrderStatusEnum)
+            op.execute(
+                "DO $$ BEGIN "
+                f"CREATE TYPE orderstatusenum AS ENUM ({labels}); "
+                "EXCEPTION WHEN duplicate_object THEN NULL; END $$"
+            )
+            op.execute("ALTER TABLE orders ALTER COLUMN status DROP DEFAULT")
+            op.execute(
+                "ALTER TABLE orders ALTER COLUMN status TYPE orderstatusenum "
+                "USING status::orderstatusenum"
+            )
+
+    create_index_if_not_exists(_INDEX_NAME, "orders", ["status"])
+
+
+def downgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        drop_index_if_exists,
+    )
+
+    # The enum type conversion is not reverted — the ORM has declared a
+    # native enum since v1_initial; only the index is new here.
+    drop_index_if_exists(_INDEX_NAME, "orders")
@@ -0,0 +1,73 @@
+"""metal inventory: Float -> NUMERIC for weights and money
+
+``metal_purchases`` (weight_g, remaining_weight_g, price_total,
+price_per_gram) and ``material_usage`` (weight_used_g, cost_at_time,
+price_per_gram_at_time) move from ``double precision`` to exact
+``NUMERIC``: weights as ``NUMERIC(10,4)``, EUR totals as ``NUMERIC(12,2)``
+and per-gram prices as ``NUMERIC(12,4)``. FIFO depletion and the
+inventory value aggregates then run without binary rounding drift.
+
+PostgreSQL only, and only for columns still typed ``double precision`` —
+fresh DBs already get NUMERIC from ``v1_initial``'s ``create_all``, and
+SQLite's type affinity makes the change a no-op there.
+
+Revision ID: 20261015_p2_metal_numeric
+Revises: 20261015_p1_order_status_enum
+Create Date: 2026-10-15
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_p2_metal_numeric"
+down_revision: Union[str, None] = "20261015_p1_order_status_enum"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS: tuple[tuple[str, str, str], ...] = (
+    ("metal_purchases", "weight_g", "NUMERIC(10, 4)"),
+    ("metal_purchases", "remaining_weight_g", "NUMERIC(10, 4)"),
+    ("metal_purchases", "price_total", "NUMERIC(12, 2)"),
+    ("metal_purchases", "price_per_gram", "NUMERIC(12, 4)"),
+    ("material_usage", "weight_used_g", "NUMERIC(10, 4)"),
+    ("material_usage", "cost_at_time", "NUMERIC(12, 2)"),
+    ("material_usage", "price_per_gram_at_time", "NUMERIC(12, 4)"),
+)
+
+
+def _data_type(bind, table: str, column: str) -> str | None:
+    return bind.execute(
+        sa.text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = :table AND column_name = :column"
+        ),
+        {"table": table, "column": column},
+    ).scalar()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    for table, column, numeric_type in _COLUMNS:
+        if _data_type(bind, table, column) == "double precision":
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} "
+                f"TYPE {numeric_type} USING {column}::{numeric_type}"
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    for table, column, _numeric_type in _COLUMNS:
+        if _data_type(bind, table, column) == "numeric":
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} "
+                "TYPE DOUBLE PRECISION"
+            )
@@ -0,0 +1,64 @@
+"""metal_purchases: composite FIFO indexes
+
+Replaces the single-column ``metal_type`` / ``date_purchased`` indexes on
+``metal_purchases`` with a composite ``(metal_type, date_purchased)`` index
+plus a partial twin restricted to open batches
+(``remaining_weight_g > 0.01``, PostgreSQL only). The FIFO/LIFO allocation
+query filters on both columns and orders by the date, so the composite
+serves it with a single index range scan in either direction.
+
+All operations are guarded: on fresh DBs ``v1_initial``'s ``create_all``
+already produced the new shape and this migration is a no-op.
+
+Revision ID: 20261015_p3_metal_fifo_idx
+Revises: 20261015_p2_metal_numeric
+Create Date: 2026-10-15
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_p3_metal_fifo_idx"
+down_revision: Union[str, None] = "20261015_p2_metal_numeric"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        create_index_if_not_exists,
+        drop_index_if_exists,
+    )
+
+    create_index_if_not_exists(
+        "ix_metal_purchases_fifo",
+        "metal_purchases",
+        ["metal_type", "date_purchased"],
+    )
+    create_index_if_not_exists(
+        "ix_metal_purchases_open",
+        "metal_purchases",
+        ["metal_type", "date_purchased"],
+        postgresql_where=sa.text("remaining_weight_g > 0.01"),
+    )
+    drop_index_if_exists("ix_metal_purchases_metal_type", "metal_purchases")
+    drop_index_if_exists("ix_metal_purchases_date_purchased", "metal_purchases")
+
+
+def downgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        create_index_if_not_exists,
+        drop_index_if_exists,
+    )
+
+    create_index_if_not_exists(
+        "ix_metal_purchases_date_purchased", "metal_purchases", ["date_purchased"]
+    )
+    create_index_if_not_exists(
+        "ix_metal_purchases_metal_type", "metal_purchases", ["metal_type"]
+    )
+    drop_index_if_exists("ix_metal_purchases_open", "metal_purchases")
+    drop_index_if_exists("ix_metal_purchases_fifo", "metal_purchases")
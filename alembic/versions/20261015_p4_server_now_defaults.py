@@ -0,0 +1,76 @@
+"""server-side now() timestamps on ingest tables; time_entries metadata JSONB
+
+``time_entries.created_at``, ``interruptions.timestamp``,
+``location_history.timestamp`` and ``order_photos.timestamp`` are now
+stamped by the database (``server_default=now()``) instead of a Python
+``datetime.utcnow()`` shipped with every INSERT. The ORM fetches the value
+back via ``eager_defaults``. The async engine pins the PG session
+``timezone`` to UTC so the naive columns keep their UTC semantics.
+
+``time_entries.extra_metadata`` moves from ``json`` to ``jsonb`` so
+containment lookups can be indexed (GIN follows in a later revision).
+
+``ALTER COLUMN ... SET DEFAULT`` is idempotent by nature; the JSONB cast
+only runs while the column is still ``json``. PostgreSQL only — SQLite
+cannot alter column defaults in place, and fresh DBs get everything from
+``v1_initial``'s ``create_all``.
+
+Revision ID: 20261015_p4_server_now
+Revises: 20261015_p3_metal_fifo_idx
+Create Date: 2026-10-15
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_p4_server_now"
+down_revision: Union[str, None] = "20261015_p3_metal_fifo_idx"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TIMESTAMP_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("time_entries", "created_at"),
+    ("interruptions", "timestamp"),
+    ("location_history", "timestamp"),
+    ("order_photos", "timestamp"),
+)
+
+
+def _data_type(bind, table: str, column: str) -> str | None:
+    return bind.execute(
+        sa.text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = :table AND column_name = :column"
+        ),
+        {"table": table, "column": column},
+    ).scalar()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    for table, column in _TIMESTAMP_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT now()")
+    if _data_type(bind, "time_entries", "extra_metadata") == "json":
+        op.execute(
+            "ALTER TABLE time_entries ALTER COLUMN extra_metadata "
+            "TYPE jsonb USING extra_metadata::jsonb"
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    if _data_type(bind, "time_entries", "extra_metadata") == "jsonb":
+        op.execute(
+            "ALTER TABLE time_entries ALTER COLUMN extra_metadata "
+            "TYPE json USING extra_metadata::json"
+        )
+    for table, column in _TIMESTAMP_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
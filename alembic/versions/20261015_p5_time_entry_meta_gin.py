@@ -0,0 +1,49 @@
+"""time_entries.extra_metadata: GIN (jsonb_path_ops) index
+
+Makes ``extra_metadata @> '{"key": "value"}'`` containment filters index
+scans instead of sequential scans. ``jsonb_path_ops`` serves ``@>`` only;
+key-existence operators (``?``, ``?|``, ``?&``) cannot use it. Requires the JSONB conversion from
+20261015_p4_server_now. PostgreSQL only; guarded so fresh DBs (where
+``create_all`` already built the index) are a no-op.
+
+Revision ID: 20261015_p5_te_meta_gin
+Revises: 20261015_p4_server_now
+Create Date: 2026-10-15
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_p5_te_meta_gin"
+down_revision: Union[str, None] = "20261015_p4_server_now"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEX_NAME = "ix_time_entries_meta_gin"
+
+
+def upgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        create_index_if_not_exists,
+    )
+
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    create_index_if_not_exists(
+        _INDEX_NAME,
+        "time_entries",
+        ["extra_metadata"],
+        postgresql_using="gin",
+        postgresql_ops={"extra_metadata": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        drop_index_if_exists,
+    )
+
+    drop_index_if_exists(_INDEX_NAME, "time_entries")
@@ -0,0 +1,55 @@
+"""customers: partial index for the active (not soft-deleted) list
+
+``CustomerRepository`` appends ``is_deleted = false`` to every list query
+and pages newest-first by ``created_at``. A partial B-tree on
+``created_at`` restricted to live rows lets PostgreSQL serve that with one
+ordered index scan instead of combining the two single-column indexes and
+sorting.
+
+Name / email trigram indexes were deliberately NOT added: those columns
+hold Fernet ciphertext (``EncryptedString``), so neither ordering nor
+``pg_trgm`` similarity over them means anything. Exact email lookups
+already go through the unique ``email_hash`` blind index.
+
+The WHERE clause is emitted on PostgreSQL only (plain index elsewhere),
+matching the ORM declaration. Guarded: a no-op on fresh DBs built by
+``v1_initial``'s ``create_all``.
+
+Revision ID: 20261015_p6_customer_active
+Revises: 20261015_p5_te_meta_gin
+Create Date: 2026-10-15
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_p6_customer_active"
+down_revision: Union[str, None] = "20261015_p5_te_meta_gin"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEX_NAME = "ix_customers_active_created"
+
+
+def upgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        create_index_if_not_exists,
+    )
+
+    create_index_if_not_exists(
+        _INDEX_NAME,
+        "customers",
+        ["created_at"],
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+
+
+def downgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        drop_index_if_exists,
+    )
+
+    drop_index_if_exists(_INDEX_NAME, "customers")
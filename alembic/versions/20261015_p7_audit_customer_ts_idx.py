@@ -0,0 +1,47 @@
+"""customer_audit_logs: composite (customer_id, timestamp) index
+
+``CustomerRepository.get_audit_logs`` reads one customer's trail newest
+first (``WHERE customer_id = ? ORDER BY timestamp DESC LIMIT ?``). The
+existing single-column ``customer_id`` index still leaves PostgreSQL to
+fetch and sort every row of that customer; the composite index is scanned
+backwards and stops after ``LIMIT`` rows. Audit logs are the fastest-growing
+table, so this keeps the lookup flat as the trail grows.
+
+No BRIN on ``timestamp``: nothing sweeps the audit table by time range yet.
+
+Guarded: a no-op on fresh DBs built by ``v1_initial``'s ``create_all``.
+
+Revision ID: 20261015_p7_audit_customer_ts
+Revises: 20261015_p6_customer_active
+Create Date: 2026-10-15
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_p7_audit_customer_ts"
+down_revision: Union[str, None] = "20261015_p6_customer_active"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEX_NAME = "ix_customer_audit_logs_customer_ts"
+
+
+def upgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        create_index_if_not_exists,
+    )
+
+    create_index_if_not_exists(
+        _INDEX_NAME, "customer_audit_logs", ["customer_id", "timestamp"]
+    )
+
+
+def downgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        drop_index_if_exists,
+    )
+
+    drop_index_if_exists(_INDEX_NAME, "customer_audit_logs")
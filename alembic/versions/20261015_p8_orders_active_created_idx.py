@@ -0,0 +1,55 @@
+"""orders: partial (created_at, id) index for keyset pagination
+
+``OrderRepository.list_orders`` pages live orders newest first with an
+``id`` tiebreaker and, given a cursor, seeks with
+``(created_at, id) < (:created_at, :id)``. A partial B-tree on
+``(created_at, id)`` restricted to ``is_deleted = false`` serves both the
+order and the seek as one backward index range scan, so every page costs
+``LIMIT`` rows regardless of depth.
+
+Per-customer lists keep using ``ix_orders_customer_deleted``; no further
+per-filter partial indexes were added until a filter shows up hot.
+
+The WHERE clause is emitted on PostgreSQL only (plain index elsewhere),
+matching the ORM declaration. Guarded: a no-op on fresh DBs built by
+``v1_initial``'s ``create_all``.
+
+Revision ID: 20261015_p8_orders_active_created
+Revises: 20261015_p7_audit_customer_ts
+Create Date: 2026-10-15
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_p8_orders_active_created"
+down_revision: Union[str, None] = "20261015_p7_audit_customer_ts"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEX_NAME = "ix_orders_active_created_id"
+
+
+def upgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        create_index_if_not_exists,
+    )
+
+    create_index_if_not_exists(
+        _INDEX_NAME,
+        "orders",
+        ["created_at", "id"],
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+
+
+def downgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        drop_index_if_exists,
+    )
+
+    drop_index_if_exists(_INDEX_NAME, "orders")
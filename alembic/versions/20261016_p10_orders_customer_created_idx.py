@@ -0,0 +1,52 @@
+"""orders: partial (customer_id, created_at, id) index for per-customer pages
+
+``GET /orders/?customer_id=`` pages a customer's live orders newest first
+with an ``id`` tiebreaker and, given a cursor, seeks with
+``(created_at, id) < (:created_at, :id)``. ``ix_orders_customer_deleted``
+narrows to the customer but leaves a sort; a partial B-tree on
+``(customer_id, created_at, id)`` restricted to ``is_deleted = false``
+serves filter, order and seek as one index range scan.
+
+The WHERE clause is emitted on PostgreSQL only (plain index elsewhere),
+matching the ORM declaration. Guarded: a no-op on fresh DBs built by
+``v1_initial``'s ``create_all``.
+
+Revision ID: 20261016_p10_orders_customer_created
+Revises: 20261016_p9_orders_open_deadline
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_p10_orders_customer_created"
+down_revision: Union[str, None] = "20261016_p9_orders_open_deadline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEX_NAME = "ix_orders_customer_active_created_id"
+
+
+def upgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        create_index_if_not_exists,
+    )
+
+    create_index_if_not_exists(
+        _INDEX_NAME,
+        "orders",
+        ["customer_id", "created_at", "id"],
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+
+
+def downgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        drop_index_if_exists,
+    )
+
+    drop_index_if_exists(_INDEX_NAME, "orders")
@@ -0,0 +1,53 @@
+"""orders: partial (status, created_at, id) index for per-status pages
+
+Status-filtered order lists (board columns, ``GET /orders/?status=``) page
+live orders newest first with an ``id`` tiebreaker. ``ix_orders_status``
+narrows to the status but leaves a sort over every matching row; a partial
+B-tree on ``(status, created_at, id)`` restricted to ``is_deleted = false``
+serves filter, order and keyset seek as one backward index range scan, so
+``LIMIT`` stops the scan early. The per-customer twin is
+``ix_orders_customer_active_created_id`` (p10).
+
+The WHERE clause is emitted on PostgreSQL only (plain index elsewhere),
+matching the ORM declaration. Guarded: a no-op on fresh DBs built by
+``v1_initial``'s ``create_all``.
+
+Revision ID: 20261016_p11_orders_status_created
+Revises: 20261016_p10_orders_customer_created
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_p11_orders_status_created"
+down_revision: Union[str, None] = "20261016_p10_orders_customer_created"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEX_NAME = "ix_orders_status_active_created_id"
+
+
+def upgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        create_index_if_not_exists,
+    )
+
+    create_index_if_not_exists(
+        _INDEX_NAME,
+        "orders",
+        ["status", "created_at", "id"],
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+
+
+def downgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        drop_index_if_exists,
+    )
+
+    drop_index_if_exists(_INDEX_NAME, "orders")
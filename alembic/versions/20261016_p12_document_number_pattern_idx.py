@@ -0,0 +1,66 @@
+"""document numbers: text_pattern_ops indexes for yearly prefix lookups
+
+The invoice, quote, repair and valuation number generators read
+``MAX(number) WHERE number LIKE 'XX-2026-%'``. With a non-C database
+collation (the Debian ``postgres`` image initialises ``en_US.utf8``) the
+unique B-tree on each number column cannot serve a LIKE prefix, and a
+``>= prefix AND < prefix || '~'`` range is empty because ``~`` sorts before
+digits. A ``text_pattern_ops`` index compares bytewise and turns the LIKE
+prefix into an index range scan under any collation.
+
+PostgreSQL only; guarded so fresh DBs (where ``create_all`` already built
+the indexes) are a no-op.
+
+Revision ID: 20261016_p12_doc_number_pattern
+Revises: 20261016_p11_orders_status_created
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_p12_doc_number_pattern"
+down_revision: Union[str, None] = "20261016_p11_orders_status_created"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, column)
+_INDEXES = (
+    ("ix_invoices_number_pattern", "invoices", "invoice_number"),
+    ("ix_quotes_number_pattern", "quotes", "quote_number"),
+    ("ix_repair_jobs_number_pattern", "repair_jobs", "repair_number"),
+    (
+        "ix_valuation_certificates_number_pattern",
+        "valuation_certificates",
+        "certificate_number",
+    ),
+)
+
+
+def upgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        create_index_if_not_exists,
+    )
+
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for index_name, table, column in _INDEXES:
+        create_index_if_not_exists(
+            index_name,
+            table,
+            [column],
+            postgresql_ops={column: "text_pattern_ops"},
+        )
+
+
+def downgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        drop_index_if_exists,
+    )
+
+    for index_name, table, _column in _INDEXES:
+        drop_index_if_exists(index_name, table)
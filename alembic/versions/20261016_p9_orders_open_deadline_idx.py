@@ -0,0 +1,57 @@
+"""orders: partial deadline index over open orders
+
+Overdue and due-soon lookups — the deadline reminders in
+``NotificationService`` and the overdue figure on the dashboard — all
+filter ``is_deleted = false AND status NOT IN ('completed', 'delivered')``
+plus a range on ``deadline``. A B-tree on ``deadline`` restricted to
+exactly that predicate turns them into an index range scan bounded by the
+number of open orders in the window rather than by the size of the table.
+
+``get_order_statistics`` keeps computing its overdue counter inside its
+single aggregate pass; the index does not change that query.
+
+The WHERE clause is emitted on PostgreSQL only (plain index elsewhere),
+matching the ORM declaration. Guarded: a no-op on fresh DBs built by
+``v1_initial``'s ``create_all``.
+
+Revision ID: 20261016_p9_orders_open_deadline
+Revises: 20261015_p8_orders_active_created
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_p9_orders_open_deadline"
+down_revision: Union[str, None] = "20261015_p8_orders_active_created"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEX_NAME = "ix_orders_open_deadline"
+
+
+def upgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        create_index_if_not_exists,
+    )
+
+    create_index_if_not_exists(
+        _INDEX_NAME,
+        "orders",
+        ["deadline"],
+        postgresql_where=sa.text(
+            "is_deleted = false AND status NOT IN ('completed', 'delivered')"
+        ),
+    )
+
+
+def downgrade() -> None:
+    from goldsmith_erp.db.migration_helpers import (  # noqa: PLC0415
+        drop_index_if_exists,
+    )
+
+    drop_index_if_exists(_INDEX_NAME, "orders")
@@ -1,5 +1,5 @@
 # src/goldsmith_erp/api/routers/orders.py
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -94,16 +94,40 @@ async def list_orders(
     skip: int = 0,
     limit: int = 100,
     customer_id: Optional[int] = Query(None, description="Filter by customer ID"),
+    after_created_at: Optional[datetime] = Query(
+        None, description="Keyset cursor: created_at of the previous page's last order"
+    ),
+    after_id: Optional[int] = Query(
+        None, description="Keyset cursor: id of the previous page's last order"
+    ),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Liste aller Aufträge.
 
+    Pages newest first. Pass ``after_created_at`` + ``after_id`` from the
+    last order of the previous page to seek to the next one (``skip`` is
+    then ignored); ``skip`` alone keeps the OFFSET behaviour.
+
     VIEWER-role callers receive the list WITHOUT the seven financial fields
     (``price``, ``material_cost_*``, ``labor_cost``, ``hourly_rate``,
     ``profit_margin_percent``, ``calculated_price``). See C5 fix-plan.
     """
-    orders = await OrderService.get_orders(db, skip, limit, customer_id=customer_id)
+    if (after_created_at is None) != (after_id is None):
+        raise HTTPException(
+            status_code=422,
+            detail="after_created_at and after_id must be given together",
+        )
+    if after_created_at is not None and after_created_at.tzinfo is not None:
+        # orders.created_at is naive UTC; an offset-bearing cursor ("...Z")
+        # would fail to bind against it (asyncpg raises on aware values).
+        after_created_at = after_created_at.astimezone(timezone.utc).replace(
+            tzinfo=None
+        )
+    cursor = (after_created_at, after_id) if after_id is not None else None
+    orders = await OrderService.get_orders(
+        db, skip, limit, customer_id=customer_id, cursor=cursor
+    )
     # Finding 2.2: the seven financial fields (price / hourly_rate / margins /
     # calculated_price / material+labor cost) ride on OrderRead and are served
     # to ADMIN/GOLDSMITH here. CLAUDE.md requires every financial-data access to
@@ -13,6 +13,7 @@ Design rules:
 - Invalidation always happens AFTER a successful DB commit.
 """
 
+import asyncio
 import json
 import logging
 from collections.abc import Awaitable, Callable
@@ -27,6 +28,27 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 MATERIALS_TTL: int = 300  # 5 minutes
 ACTIVITIES_TTL: int = 600  # 10 minutes
+ORDER_STATISTICS_TTL: int = 60  # 1 minute
+ORDER_COUNT_TTL: int = 30
+
+# ---------------------------------------------------------------------------
+# Shared keys (written by one module, invalidated by others)
+# ---------------------------------------------------------------------------
+# OrderRepository.get_order_statistics; invalidated by the OrderRepository
+# write paths. Nothing serves the statistics yet, so OrderService writes do
+# not pay the DEL: wire them up together with a reader. Bump the version to
+# bust old copies.
+ORDER_STATISTICS_KEY = "orders:statistics:v1"
+# OrderRepository.count_by_status / count_by_customer. The key set is known
+# (one per status, one per customer), so writes delete exact keys, no SCAN.
+ORDER_COUNT_PREFIX = "orders:count:"
+
+# Single-flight: while one caller recomputes a missing entry, the others
+# poll for it instead of all hitting the database at once.
+_LOCK_SUFFIX = ":lock"
+_LOCK_TTL: int = 10  # seconds; bounds a crashed holder
+_LOCK_POLL_INTERVAL: float = 0.05
+_LOCK_POLLS: int = 20
 
 # ---------------------------------------------------------------------------
 # Key prefix
@@ -52,6 +74,7 @@ async def get_cached(
     fetch_fn: Callable[[], Awaitable[T]],
     serialise: Callable[[T], str] = json.dumps,
     deserialise: Callable[[str], T] = json.loads,
+    single_flight: bool = False,
 ) -> T:
     """
     Cache-aside read: return the cached value when present, otherwise call
@@ -66,6 +89,9 @@ async def get_cached(
                       Defaults to json.dumps.
         deserialise:  Convert the stored JSON string back to the value type.
                       Defaults to json.loads.
+        single_flight: On a miss, take a short ``SET NX`` lock so only one
+                      caller runs fetch_fn; the others poll for the value
+                      it stores and fall back to fetch_fn after ~1 second.
 
     Returns:
         The cached or freshly fetched value.
@@ -76,6 +102,8 @@ async def get_cached(
         fetch_fn transparently.
     """
     full_key = _full_key(key)
+    lock_key = full_key + _LOCK_SUFFIX
+    lock_held = False
 
     # --- Try cache read -------------------------------------------------------
     try:
@@ -85,6 +113,19 @@ async def get_cached(
                 logger.debug("Cache hit", extra={"cache_key": key})
                 return deserialise(raw)
             logger.debug("Cache miss", extra={"cache_key": key})
+
+            if single_flight:
+                lock_held = bool(await redis.set(lock_key, "1", nx=True, ex=_LOCK_TTL))
+                if not lock_held:
+                    for _ in range(_LOCK_POLLS):
+                        await asyncio.sleep(_LOCK_POLL_INTERVAL)
+                        raw = await redis.get(full_key)
+                        if raw is not None:
+                            logger.debug(
+                                "Cache filled by concurrent caller",
+                                extra={"cache_key": key},
+                            )
+                            return deserialise(raw)
     except Exception as exc:
         logger.warning(
             "Redis cache read failed, falling back to DB",
@@ -92,13 +133,20 @@ async def get_cached(
         )
 
     # --- Fetch from source ----------------------------------------------------
-    value = await fetch_fn()
+    try:
+        value = await fetch_fn()
+    except Exception:
+        if lock_held:
+            await invalidate(key + _LOCK_SUFFIX)
+        raise
 
     # --- Populate cache -------------------------------------------------------
     try:
         async with get_redis_client() as redis:
             await redis.setex(full_key, ttl, serialise(value))
             logger.debug("Cache populated", extra={"cache_key": key, "ttl": ttl})
+            if lock_held:
+                await redis.delete(lock_key)
     except Exception as exc:
         logger.warning(
             "Redis cache write failed, continuing without cache",
@@ -113,28 +161,27 @@ async def get_cached(
 # ---------------------------------------------------------------------------
 
 
-async def invalidate(key: str) -> None:
+async def invalidate(*keys: str) -> None:
     """
-    Delete a single cache entry.
+    Delete one or more cache entries (one ``DEL`` round-trip).
 
     Call this AFTER a successful DB commit so the cache is never cleared
     before the authoritative data is persisted.
 
     Args:
-        key: Logical cache key (without the "cache:" prefix).
+        keys: Logical cache keys (without the "cache:" prefix).
     """
-    full_key = _full_key(key)
     try:
         async with get_redis_client() as redis:
-            deleted = await redis.delete(full_key)
+            deleted = await redis.delete(*(_full_key(key) for key in keys))
             logger.debug(
                 "Cache invalidated",
-                extra={"cache_key": key, "deleted": deleted},
+                extra={"cache_key": ",".join(keys), "deleted": deleted},
             )
     except Exception as exc:
         logger.warning(
             "Redis cache invalidation failed",
-            extra={"cache_key": key, "error": str(exc)},
+            extra={"cache_key": ",".join(keys), "error": str(exc)},
         )
 
 
@@ -4,7 +4,7 @@ import json
 import logging
 import secrets
 from pathlib import Path
-from typing import Annotated, Any, Optional
+from typing import Annotated, Any, Literal, Optional
 
 from pydantic import Field, PostgresDsn, RedisDsn, field_validator, model_validator
 from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
@@ -141,10 +141,16 @@ class Settings(BaseSettings):
         )
 
     # ── Connection Pooling ───────────────────────────────────────────────────────
-    DB_POOL_SIZE: int = 5
-    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_RECYCLE: int = 1800  # 30 minutes — recycle stale connections
+    # asyncpg prepared statements kept per connection (SQLAlchemy's LRU).
+    # Repeated lookups skip PostgreSQL's parse/plan; 0 disables the cache.
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 1024
+    # Log every SQL statement. Separate from DEBUG: echo routes each
+    # statement through logging, a cost dev servers need not pay either.
+    DB_ECHO: bool = False
 
     # ── Workshop / Application identity ──────────────────────────────────────────
     WORKSHOP_NAME: str = "Goldschmiede"
@@ -201,6 +207,24 @@ class Settings(BaseSettings):
     # a one-off archive of the old salt. See V1.1-ANONYMIZE-USER-CONTRACT §4.
     ANONYMIZATION_SALT: Optional[str] = None
 
+    # ── Audit trail (GDPR Art. 30) ───────────────────────────────────────────────
+    # Buffered audit writes (db/audit_buffer.py): queued rows are bulk-inserted
+    # every FLUSH_INTERVAL seconds, or once MAX_SIZE rows are waiting. Beyond
+    # MAX_QUEUE queued rows callers write directly instead of buffering.
+    AUDIT_TRAIL_BUFFER_FLUSH_INTERVAL: float = 30.0
+    AUDIT_TRAIL_BUFFER_MAX_SIZE: int = 500
+    AUDIT_TRAIL_BUFFER_MAX_QUEUE: int = 10_000
+    # "all" records every access; "mutations_only" skips pure read ("accessed")
+    # rows, which make up the bulk of the table. Keep "all" unless the DPO has
+    # signed off on dropping read logging.
+    AUDIT_TRAIL_LEVEL: Literal["all", "mutations_only"] = "all"
+
+    # ── Request logging ──────────────────────────────────────────────────────────
+    # Fraction of requests whose start / completion RequestLoggingMiddleware
+    # logs. Health probes are never logged; 4xx / 5xx responses and failures
+    # are always logged, sampled or not.
+    LOG_SAMPLE_RATE: float = Field(default=1.0, ge=0.0, le=1.0)
+
     # ── Cookie security ──────────────────────────────────────────────────────────
     # Set True in production when TLS is terminated at the load balancer or
     # reverse proxy (HTTPS). Keep False for local network / dev environments.
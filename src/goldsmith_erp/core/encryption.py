@@ -33,7 +33,7 @@ import base64
 import hashlib
 import hmac
 import logging
-from typing import Optional
+from typing import List, Optional, Sequence
 
 from cryptography.fernet import Fernet, InvalidToken
 
@@ -316,6 +316,40 @@ class EncryptionService:
             logger.error(f"Decryption failed: {e}")
             raise EncryptionError(f"Failed to decrypt data: {e}")
 
+    def decrypt_many(self, encrypted: Sequence[Optional[str]]) -> List[Optional[str]]:
+        """
+        Decrypt a batch of encrypted strings in one call.
+
+        Reuses the service's single Fernet instance and skips the per-call
+        wrapper overhead of :meth:`decrypt`, which matters when a result
+        page carries several ciphertexts per row.
+
+        Args:
+            encrypted: Base64-encoded encrypted strings (``None`` / ``""``
+                entries map to ``None``)
+
+        Returns:
+            Decrypted plaintexts, positionally aligned with ``encrypted``
+
+        Raises:
+            EncryptionError: If any token fails to decrypt — callers that
+                want per-value fallback retry the batch via :meth:`decrypt`
+        """
+        decrypt = self._cipher.decrypt
+        try:
+            return [
+                decrypt(value.encode("utf-8")).decode("utf-8") if value else None
+                for value in encrypted
+            ]
+        except InvalidToken:
+            logger.error(
+                "Batch decryption failed: Invalid token (wrong key or tampered data)"
+            )
+            raise EncryptionError("Failed to decrypt data: Invalid encryption token")
+        except Exception as e:
+            logger.error(f"Batch decryption failed: {e}")
+            raise EncryptionError(f"Failed to decrypt data: {e}")
+
     def encrypt_multiple(self, data: dict) -> dict:
         """
         Encrypt multiple fields in a dictionary.
@@ -5,8 +5,9 @@ Provides JSON-formatted logs with request IDs for traceability.
 """
 
 import logging
+import re
+import secrets
 import sys
-import uuid
 from contextvars import ContextVar
 from typing import Optional
 
@@ -17,6 +18,10 @@ from goldsmith_erp.core.config import settings
 # Context variable to store request ID for the current request
 request_id_ctx: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
 
+# Inbound X-Request-ID values are kept only if they look like an id, so a
+# client cannot smuggle arbitrary text into every log line of its request.
+_INBOUND_REQUEST_ID = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
 
 class CustomJsonFormatter(jsonlogger.JsonFormatter):
     """
@@ -100,11 +105,26 @@ def get_request_id() -> str:
     """
     request_id = request_id_ctx.get()
     if not request_id:
-        request_id = str(uuid.uuid4())
+        request_id = new_request_id()
         request_id_ctx.set(request_id)
     return request_id
 
 
+def new_request_id(inbound: Optional[str] = None) -> str:
+    """
+    Return the caller's request ID if it is well-formed, else a fresh one.
+
+    Args:
+        inbound: ``X-Request-ID`` header sent by the client / proxy, if any
+
+    Returns:
+        str: ``inbound`` or 32 random hex characters
+    """
+    if inbound and _INBOUND_REQUEST_ID.fullmatch(inbound):
+        return inbound
+    return secrets.token_hex(16)
+
+
 def set_request_id(request_id: str) -> None:
     """
     Set the request ID for the current context.
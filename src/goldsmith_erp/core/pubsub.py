@@ -2,8 +2,17 @@
 
 import asyncio
 import logging
-from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from contextlib import aclosing, asynccontextmanager
+from typing import (
+    AsyncIterator,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 import redis.asyncio as redis
 from fastapi import WebSocket
@@ -59,13 +68,13 @@ async def publish_event(channel: str, message: str) -> None:
                 logger.error(f"Redis publish failed after 3 attempts: {e}")
 
 
-async def _subscribe(channel: str) -> AsyncIterator[dict]:
+async def _subscribe(*channels: str) -> AsyncIterator[dict]:
     """
     Internal helper to yield parsed Redis messages with proper cleanup.
     """
     async with get_redis_client() as client:
         pubsub = client.pubsub(ignore_subscribe_messages=True)
-        await pubsub.subscribe(channel)
+        await pubsub.subscribe(*channels)
 
         try:
             # Loop forever, yielding each message dict as it arrives
@@ -73,7 +82,7 @@ async def _subscribe(channel: str) -> AsyncIterator[dict]:
                 if msg.get("type") == "message":
                     yield msg
         finally:
-            await pubsub.unsubscribe(channel)
+            await pubsub.unsubscribe(*channels)
             await pubsub.close()
 
 
@@ -81,13 +90,24 @@ async def subscribe_and_forward(ws: WebSocket, channel: str) -> None:
     """
     Subscribe to Redis channel and forward each message to WebSocket.
     Cleans up on disconnect or error.
+
+    Every socket runs its own forwarding task, so a slow client only delays
+    its own messages. A failed send ends the task and releases the Redis
+    subscription immediately rather than when the generator is collected.
     """
     # Note: caller is responsible for ws.accept() before invoking this function
     try:
-        async for msg in _subscribe(channel):
-            data = msg["data"]
-            # forward only the data payload
-            await ws.send_text(data)
+        async with aclosing(_subscribe(channel)) as messages:
+            async for msg in messages:
+                try:
+                    # forward only the data payload
+                    await ws.send_text(msg["data"])
+                except Exception as exc:
+                    logger.info(
+                        "WebSocket send failed, dropping subscription",
+                        extra={"channel": channel, "error": str(exc)},
+                    )
+                    return
     except asyncio.CancelledError:
         # Subscription cancelled; let caller handle cleanup
         raise
@@ -100,3 +120,162 @@ async def subscribe_and_forward(ws: WebSocket, channel: str) -> None:
         )
     finally:
         logger.debug("Unsubscribed from Redis channel", extra={"channel": channel})
+
+
+class ChannelBroadcaster:
+    """
+    One Redis subscription to ``channels``, fanned out to local WebSockets.
+
+    For channels many clients listen to (the order events): N sockets
+    share a single subscription instead of opening N, and each socket only
+    receives the channels it registered for. Each socket gets a
+    bounded queue drained by its own sender task, so the Redis reader only
+    enqueues and never waits on a client. A socket whose queue overflows
+    (``queue_size`` undelivered messages) is dropped and closed with 1013
+    (try again later); one whose send fails or exceeds ``send_timeout`` is
+    dropped, as ``subscribe_and_forward`` does.
+
+    Usage:
+        >>> order_events_broadcaster.connect(websocket, ["events:orders:status"])
+        >>> ...
+        >>> order_events_broadcaster.disconnect(websocket)
+    """
+
+    def __init__(
+        self,
+        channels: Sequence[str],
+        send_timeout: float = 5.0,
+        max_retry_delay: float = 30.0,
+        queue_size: int = 1024,
+    ):
+        """
+        Args:
+            channels: Redis channels to subscribe to
+            send_timeout: Seconds a single socket send may take
+            max_retry_delay: Upper bound of the resubscribe backoff after a
+                Redis error
+            queue_size: Undelivered messages a socket may lag behind before
+                it is dropped
+        """
+        self.channels = tuple(channels)
+        self.send_timeout = send_timeout
+        self.max_retry_delay = max_retry_delay
+        self.queue_size = queue_size
+        self._sockets: Dict[
+            WebSocket, Tuple[asyncio.Queue, asyncio.Task, FrozenSet[str]]
+        ] = {}
+        self._closing: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._sockets)
+
+    def connect(self, ws: WebSocket, channels: Optional[Iterable[str]] = None) -> None:
+        """Register an accepted socket for ``channels`` (default: all)."""
+        if ws in self._sockets:
+            return
+        wanted = frozenset(self.channels if channels is None else channels)
+        unknown = wanted.difference(self.channels)
+        if unknown:
+            raise ValueError(f"Not broadcast here: {', '.join(sorted(unknown))}")
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        task = asyncio.create_task(self._pump(ws, queue))
+        self._sockets[ws] = (queue, task, wanted)
+
+    def disconnect(self, ws: WebSocket) -> None:
+        """Unregister a socket (no-op if already dropped)."""
+        entry = self._sockets.pop(ws, None)
+        if entry is not None:
+            entry[1].cancel()
+
+    def broadcast(self, data: str, channel: Optional[str] = None) -> None:
+        """Queue ``data`` for every socket registered for ``channel``."""
+        for ws, (queue, _, wanted) in list(self._sockets.items()):
+            if channel is not None and channel not in wanted:
+                continue
+            try:
+                queue.put_nowait(data)
+            except asyncio.QueueFull:
+                logger.warning(
+                    "WebSocket too slow, dropping socket",
+                    extra={"channel": channel, "queued": queue.qsize()},
+                )
+                self.disconnect(ws)
+                task = asyncio.create_task(self._close(ws, 1013))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+
+    async def _pump(self, ws: WebSocket, queue: asyncio.Queue) -> None:
+        """Send queued messages to one socket until it fails or is dropped."""
+        while True:
+            data = await queue.get()
+            try:
+                await asyncio.wait_for(ws.send_text(data), self.send_timeout)
+            except Exception as exc:
+                logger.info(
+                    "WebSocket send failed, dropping socket",
+                    extra={"channels": self.channels, "error": str(exc)},
+                )
+                self._sockets.pop(ws, None)
+                return
+
+    @staticmethod
+    async def _close(ws: WebSocket, code: int) -> None:
+        try:
+            await ws.close(code=code)
+        except Exception:
+            pass
+
+    def start(self) -> None:
+        """Start the subscriber task (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the subscriber and every sender task."""
+        tasks = [task for _, task, _ in self._sockets.values()]
+        self._sockets.clear()
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, *self._closing, return_exceptions=True)
+
+    async def _run(self) -> None:
+        """Forward messages; resubscribe with backoff if Redis fails."""
+        delay = 1.0
+        while True:
+            try:
+                async with aclosing(_subscribe(*self.channels)) as messages:
+                    async for msg in messages:
+                        delay = 1.0
+                        self.broadcast(msg["data"], msg.get("channel"))
+            except Exception as exc:
+                logger.error(
+                    "Redis subscription error",
+                    extra={"channels": self.channels, "error": str(exc)},
+                    exc_info=True,
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_retry_delay)
+
+
+# Order events are sharded by type so /ws/orders clients only receive the
+# kinds they ask for (``?types=created,status``). Keys are the public type
+# names, values the Redis channels.
+ORDER_EVENT_CHANNELS: Dict[str, str] = {
+    "created": "events:orders:created",
+    "updated": "events:orders:updated",
+    "status": "events:orders:status",
+}
+
+
+async def publish_order_event(event_type: str, message: str) -> None:
+    """Publish an order event on its type's channel (see ``publish_event``)."""
+    await publish_event(ORDER_EVENT_CHANNELS[event_type], message)
+
+
+# Shared subscriber for all order event channels; started / stopped by the
+# app's startup and shutdown hooks in ``goldsmith_erp.main``.
+order_events_broadcaster = ChannelBroadcaster(list(ORDER_EVENT_CHANNELS.values()))
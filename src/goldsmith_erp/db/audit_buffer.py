@@ -0,0 +1,260 @@
+"""
+Buffered writer for ``customer_audit_logs`` rows.
+
+Audit rows are enqueued as plain column dicts and written by a background
+task in one executemany Core ``INSERT`` per batch (no ORM objects or
+unit-of-work on the flush path) — every
+``AUDIT_TRAIL_BUFFER_FLUSH_INTERVAL`` seconds, or as soon as
+``AUDIT_TRAIL_BUFFER_MAX_SIZE`` rows are waiting. Request handlers no longer
+pay an INSERT round-trip per audit row.
+
+Trade-off: a buffered row is written in its own transaction, up to one
+flush interval after the change it describes. ``stop()`` (wired to app
+shutdown) drains whatever is still queued.
+
+Failure handling:
+- A batch rejected for its *content* (``IntegrityError`` / ``DataError``,
+  e.g. a dangling ``customer_id``) is bisected down to the offending rows,
+  which are logged in full at ERROR level and dropped; the rest is written.
+  One bad row never blocks the queue.
+- Any other failure (database unreachable, ...) re-queues the batch; a row
+  still failing after ``max_retries`` flushes is logged and dropped.
+- The queue is bounded by ``AUDIT_TRAIL_BUFFER_MAX_QUEUE``: ``enqueue``
+  returns False once it is full and the caller writes the row directly.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from goldsmith_erp.core.config import settings
+from goldsmith_erp.db.models import CustomerAuditLog
+from goldsmith_erp.db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Columns a buffered row may carry. ``id`` and ``created_at`` are left to
+# their defaults; every row is padded to the full set so one executemany
+# statement covers the whole batch.
+_ROW_KEYS = tuple(
+    column.key
+    for column in CustomerAuditLog.__table__.columns
+    if column.key not in ("id", "created_at")
+)
+
+# Table-level (Core) insert: the ORM entity form would route every batch
+# through the ORM bulk-insert path for no benefit.
+_INSERT_AUDIT_ROWS = insert(CustomerAuditLog.__table__)
+
+# Queue item: (failed flush attempts so far, padded row).
+_Pending = Tuple[int, Dict[str, Any]]
+
+
+class AuditLogBuffer:
+    """
+    In-process ``asyncio.Queue`` of pending audit rows plus its flusher task.
+
+    Usage:
+        >>> audit_log_buffer.enqueue({"customer_id": 1, "action": "updated"})
+        >>> await audit_log_buffer.flush()  # or let the background task do it
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        flush_interval: Optional[float] = None,
+        max_size: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        max_retries: int = 5,
+    ):
+        """
+        Args:
+            session_factory: Session factory for the writes (default:
+                ``AsyncSessionLocal``)
+            flush_interval: Seconds between background flushes (default:
+                ``settings.AUDIT_TRAIL_BUFFER_FLUSH_INTERVAL``)
+            max_size: Queue length that triggers an early flush, and the
+                batch size per INSERT (default:
+                ``settings.AUDIT_TRAIL_BUFFER_MAX_SIZE``)
+            max_queue: Hard cap on queued rows (default:
+                ``settings.AUDIT_TRAIL_BUFFER_MAX_QUEUE``)
+            max_retries: Failed flushes after which a row is dropped
+        """
+        self._session_factory = session_factory or AsyncSessionLocal
+        self.flush_interval = (
+            flush_interval
+            if flush_interval is not None
+            else settings.AUDIT_TRAIL_BUFFER_FLUSH_INTERVAL
+        )
+        self.max_size = (
+            max_size if max_size is not None else settings.AUDIT_TRAIL_BUFFER_MAX_SIZE
+        )
+        self.max_retries = max_retries
+        self._queue: "asyncio.Queue[_Pending]" = asyncio.Queue(
+            maxsize=(
+                max_queue
+                if max_queue is not None
+                else settings.AUDIT_TRAIL_BUFFER_MAX_QUEUE
+            )
+        )
+        self._full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def running(self) -> bool:
+        """True while the background flusher task is alive."""
+        return self._task is not None and not self._task.done()
+
+    def enqueue(self, row: Dict[str, Any]) -> bool:
+        """
+        Queue one audit row (``CustomerAuditLog`` column values).
+
+        ``timestamp`` defaults to now — the row may be written much later.
+
+        Returns:
+            False if the queue is full and the row was *not* queued; the
+            caller must then write it itself
+
+        Raises:
+            ValueError: If ``row`` names a column ``CustomerAuditLog`` lacks
+        """
+        unknown = set(row) - set(_ROW_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown audit log columns: {sorted(unknown)}")
+        padded = {key: row.get(key) for key in _ROW_KEYS}
+        if padded["timestamp"] is None:
+            padded["timestamp"] = datetime.utcnow()
+        try:
+            self._queue.put_nowait((0, padded))
+        except asyncio.QueueFull:
+            logger.warning(
+                "audit buffer full (%d rows), caller writes the row directly",
+                self._queue.qsize(),
+                extra={"audit": True},
+            )
+            self._full.set()
+            return False
+        if self._queue.qsize() >= self.max_size:
+            self._full.set()
+        return True
+
+    async def flush(self) -> int:
+        """
+        Write every queued row now, ``max_size`` rows per INSERT.
+
+        Each batch is its own transaction, so a failing batch does not roll
+        back the others.
+
+        Returns:
+            Number of rows written
+        """
+        async with self._flush_lock:
+            pending: List[_Pending] = []
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            self._full.clear()
+
+            written = 0
+            for start in range(0, len(pending), self.max_size):
+                batch = pending[start : start + self.max_size]
+                try:
+                    written += await self._write([row for _, row in batch])
+                except Exception as exc:
+                    logger.error(
+                        "audit buffer flush failed for %d rows: %s",
+                        len(batch),
+                        exc,
+                        extra={"audit": True},
+                        exc_info=True,
+                    )
+                    self._requeue(batch)
+            return written
+
+    async def _write(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert ``rows``; bisect on content errors and drop the bad rows.
+
+        Errors other than ``IntegrityError`` / ``DataError`` propagate.
+        """
+        try:
+            async with self._session_factory() as session:
+                await session.execute(_INSERT_AUDIT_ROWS, rows)
+                await session.commit()
+            return len(rows)
+        except (IntegrityError, DataError) as exc:
+            if len(rows) == 1:
+                self._drop(rows, f"rejected by the database: {exc.orig}")
+                return 0
+        middle = len(rows) // 2
+        return await self._write(rows[:middle]) + await self._write(rows[middle:])
+
+    def _requeue(self, batch: List[_Pending]) -> None:
+        """Put a failed batch back, dropping rows that ran out of retries."""
+        for attempts, row in batch:
+            if attempts + 1 >= self.max_retries:
+                self._drop([row], f"still failing after {attempts + 1} flushes")
+                continue
+            try:
+                self._queue.put_nowait((attempts + 1, row))
+            except asyncio.QueueFull:
+                self._drop([row], "queue full on re-queue")
+
+    @staticmethod
+    def _drop(rows: List[Dict[str, Any]], reason: str) -> None:
+        """Log dropped rows in full so they can be replayed from the log."""
+        for row in rows:
+            logger.error(
+                "audit row dropped (%s): %r",
+                reason,
+                row,
+                extra={"audit": True, "entity": row.get("entity")},
+            )
+
+    def start(self) -> None:
+        """Start the background flusher (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop the background flusher and drain the queue.
+
+        Rows that still cannot be written are logged in full (``_drop``)
+        rather than vanishing with the process.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        leftover: List[Dict[str, Any]] = []
+        while not self._queue.empty():
+            leftover.append(self._queue.get_nowait()[1])
+        if leftover:
+            self._drop(leftover, "unwritten at shutdown")
+
+    async def _run(self) -> None:
+        """Flush every ``flush_interval`` seconds or when the queue fills."""
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+
+# Application-wide buffer; started / drained by the app's startup and
+# shutdown hooks in ``goldsmith_erp.main``.
+audit_log_buffer = AuditLogBuffer()
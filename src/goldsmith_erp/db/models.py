@@ -16,8 +16,9 @@ from sqlalchemy import (
     func,
     text,
 )
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.dialects.postgresql import JSON, JSONB
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
 from goldsmith_erp.db.types import EncryptedString
@@ -29,9 +30,28 @@ def SAEnum(enum_class, **kwargs):
 
 
 import enum
+import os
+import time
 import uuid
 
 
+def uuid7_str() -> str:
+    """RFC 9562 UUIDv7 as a string: 48-bit Unix-ms timestamp + 74 random bits.
+
+    Used for the String(36) primary keys of the highest-insert-rate tables.
+    Unlike uuid4, successive ids sort by creation time, so inserts land on the
+    right-most B-tree page instead of a random leaf.
+    """
+    unix_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (unix_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76  # version
+    value |= (rand >> 62 & 0xFFF) << 64  # rand_a
+    value |= 0b10 << 62  # RFC 4122 variant
+    value |= rand & ((1 << 62) - 1)  # rand_b
+    return str(uuid.UUID(int=value))
+
+
 class CalendarEventType(str, enum.Enum):
     """Event types for the calendar/planning system."""
 
@@ -458,8 +478,18 @@ class Order(Base):
     title = Column(String)
     description = Column(String)
     price = Column(Float)  # Final customer price (can be manually set)
+    # Native PG enum (1-4 bytes) + CHECK on non-PG dialects; indexed because
+    # every list/board/statistics query filters on it.
     status = Column(
-        SAEnum(OrderStatusEnum), default=OrderStatusEnum.NEW, nullable=False
+        SAEnum(
+            OrderStatusEnum,
+            native_enum=True,
+            create_constraint=True,
+            validate_strings=True,
+        ),
+        default=OrderStatusEnum.NEW,
+        nullable=False,
+        index=True,
     )
     customer_id = Column(
         Integer,
@@ -495,6 +525,8 @@ class Order(Base):
     material_cost_override = Column(Float, nullable=True)  # Manual override if needed
     labor_hours = Column(Float, nullable=True)  # Estimated or actual work hours
     hourly_rate = Column(Float, default=75.00)  # Labor rate (EUR/hour)
+    # Stored, not GENERATED: CostCalculationService writes per-activity labor
+    # costs here, which no expression over this row can reproduce.
     labor_cost = Column(Float, nullable=True)  # labor_hours × hourly_rate
 
     # Pricing
@@ -611,6 +643,13 @@ class Order(Base):
         "OrderStatusHistory", back_populates="order", cascade="all, delete-orphan"
     )
 
+    @property
+    def order_number(self) -> str | None:
+        """Display number ORD-YYYYMM-XXXX, derived from created_at and the ID"""
+        if self.id is None or self.created_at is None:
+            return None
+        return f"ORD-{self.created_at:%Y%m}-{self.id:04d}"
+
 
 class OrderComment(Base):
     """Order-scoped comments (Digitale Post-its) for inter-team communication."""
@@ -697,7 +736,7 @@ class TimeEntry(Base):
 
     __tablename__ = "time_entries"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String(36), primary_key=True, default=uuid7_str)
     order_id = Column(
         Integer,
         ForeignKey("orders.id", ondelete="RESTRICT"),
@@ -721,8 +760,11 @@ class TimeEntry(Base):
     quality_rating = Column(Integer)  # 1-5
     rework_required = Column(Boolean, default=False)
     notes = Column(Text)
-    extra_metadata = Column(JSON)  # Flexible für zusätzliche Daten
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # Real JSONB on PostgreSQL so key lookups (@>) are indexable; JSON on SQLite.
+    extra_metadata = Column(
+        JSON().with_variant(JSONB(), "postgresql")
+    )  # Flexible für zusätzliche Daten
+    created_at = Column(DateTime, server_default=func.now())
 
     # ── Slice 2 — origin + correction tracking + retention ────────────
     # A2-origin — Lena §1 adoption metric. Values: 'manual' | 'scan' |
@@ -754,6 +796,11 @@ class TimeEntry(Base):
         default="financial_10y",
     )
 
+    # Ingest-heavy tables stamp created_at/timestamp on the DB clock
+    # (server_default=func.now()); eager_defaults fetches the value back in
+    # the INSERT's RETURNING so async callers never trigger a lazy refresh.
+    __mapper_args__ = {"eager_defaults": True}
+
     # Beziehungen
     order = relationship("Order", back_populates="time_entries")
     user = relationship("User")
@@ -829,7 +876,9 @@ class Interruption(Base):
     )
     reason = Column(String(100), nullable=False)  # customer_call, material_fetch, etc.
     duration_minutes = Column(Integer, nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, server_default=func.now())
+
+    __mapper_args__ = {"eager_defaults": True}
 
     # Beziehungen
     time_entry = relationship("TimeEntry", back_populates="interruptions")
@@ -843,11 +892,13 @@ class LocationHistory(Base):
     id = Column(Integer, primary_key=True, index=True)
     order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
     location = Column(String(50), nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    timestamp = Column(DateTime, server_default=func.now(), index=True)
     changed_by = Column(
         Integer, ForeignKey("users.id", ondelete="RESTRICT"), nullable=False
     )
 
+    __mapper_args__ = {"eager_defaults": True}
+
     # Beziehungen
     order = relationship("Order")
     user = relationship("User")
@@ -858,18 +909,20 @@ class OrderPhoto(Base):
 
     __tablename__ = "order_photos"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String(36), primary_key=True, default=uuid7_str)
     order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
     time_entry_id = Column(
         String(36), ForeignKey("time_entries.id", ondelete="SET NULL"), nullable=True
     )
     file_path = Column(String(500), nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    timestamp = Column(DateTime, server_default=func.now(), index=True)
     taken_by = Column(
         Integer, ForeignKey("users.id", ondelete="RESTRICT"), nullable=False
     )
     notes = Column(Text)
 
+    __mapper_args__ = {"eager_defaults": True}
+
     # Beziehungen
     order = relationship("Order")
     time_entry = relationship("TimeEntry", back_populates="photos")
@@ -934,16 +987,27 @@ class MetalPurchase(Base):
     id = Column(Integer, primary_key=True, index=True)
 
     # Purchase Details
-    date_purchased = Column(
-        DateTime, nullable=False, default=datetime.utcnow, index=True
-    )
-    metal_type = Column(SAEnum(MetalType), nullable=False, index=True)
+    # Indexed via the composite FIFO indexes at the bottom of this module.
+    date_purchased = Column(DateTime, nullable=False, default=datetime.utcnow)
+    metal_type = Column(SAEnum(MetalType), nullable=False)
 
     # Weight & Pricing
-    weight_g = Column(Float, nullable=False)  # Original purchase weight in grams
-    remaining_weight_g = Column(Float, nullable=False)  # Decreases as used
-    price_total = Column(Float, nullable=False)  # Total price paid (EUR)
-    price_per_gram = Column(Float, nullable=False)  # Calculated: price_total / weight_g
+    # Stored as exact NUMERIC so SUM()/FIFO aggregates in SQL carry no binary
+    # rounding drift. asdecimal=False keeps the Python side float — the
+    # inventory services, pydantic schemas and ML forecast all do float math
+    # on these attributes.
+    weight_g = Column(
+        Numeric(10, 4, asdecimal=False), nullable=False
+    )  # Original purchase weight in grams
+    remaining_weight_g = Column(
+        Numeric(10, 4, asdecimal=False), nullable=False
+    )  # Decreases as used
+    price_total = Column(
+        Numeric(12, 2, asdecimal=False), nullable=False
+    )  # Total price paid (EUR)
+    price_per_gram = Column(
+        Numeric(12, 4, asdecimal=False), nullable=False
+    )  # Calculated: price_total / weight_g
 
     # Supplier Information
     supplier = Column(String(200), nullable=True)
@@ -964,7 +1028,7 @@ class MetalPurchase(Base):
         "MaterialUsage", back_populates="metal_purchase", cascade="all, delete-orphan"
     )
 
-    @property
+    @hybrid_property
     def used_weight_g(self) -> float:
         """Calculate how much weight has been used from this purchase"""
         return self.weight_g - self.remaining_weight_g
@@ -976,12 +1040,12 @@ class MetalPurchase(Base):
             return 100.0
         return (self.used_weight_g / self.weight_g) * 100.0
 
-    @property
+    @hybrid_property
     def is_depleted(self) -> bool:
         """Check if this batch is fully consumed"""
         return self.remaining_weight_g <= 0.01  # Allow 0.01g tolerance
 
-    @property
+    @hybrid_property
     def remaining_value(self) -> float:
         """Calculate the value of remaining metal in this batch"""
         return self.remaining_weight_g * self.price_per_gram
@@ -1014,12 +1078,14 @@ class MaterialUsage(Base):
     )
 
     # Usage Details
-    weight_used_g = Column(Float, nullable=False)  # How much was consumed
+    weight_used_g = Column(
+        Numeric(10, 4, asdecimal=False), nullable=False
+    )  # How much was consumed
     cost_at_time = Column(
-        Float, nullable=False
+        Numeric(12, 2, asdecimal=False), nullable=False
     )  # Cost when used (weight * price_per_gram)
     price_per_gram_at_time = Column(
-        Float, nullable=False
+        Numeric(12, 4, asdecimal=False), nullable=False
     )  # Snapshot of price when used
 
     # Costing Method Used
@@ -3189,6 +3255,38 @@ class EstimateAccuracy(Base):
 Index("ix_time_entries_end_time", TimeEntry.end_time)
 Index("ix_notifications_user_read", Notification.user_id, Notification.is_read)
 Index("ix_orders_customer_deleted", Order.customer_id, Order.is_deleted)
+# Order list / keyset pagination: WHERE is_deleted = false
+# ORDER BY created_at DESC, id DESC [AND (created_at, id) < cursor].
+Index(
+    "ix_orders_active_created_id",
+    Order.created_at,
+    Order.id,
+    postgresql_where=Order.is_deleted.is_(False),
+)
+# Per-customer order list, same order / seek as above.
+Index(
+    "ix_orders_customer_active_created_id",
+    Order.customer_id,
+    Order.created_at,
+    Order.id,
+    postgresql_where=Order.is_deleted.is_(False),
+)
+# Per-status order list (board columns), same order / seek as above.
+Index(
+    "ix_orders_status_active_created_id",
+    Order.status,
+    Order.created_at,
+    Order.id,
+    postgresql_where=Order.is_deleted.is_(False),
+)
+# Overdue / due-soon lookups: open orders by deadline range.
+Index(
+    "ix_orders_open_deadline",
+    Order.deadline,
+    postgresql_where=text(
+        "is_deleted = false AND status NOT IN ('completed', 'delivered')"
+    ),
+)
 
 # Slice 1 — QR / barcode workflow indexes.
 # Named identically to the Alembic migration indexes so that CREATE INDEX
@@ -3243,3 +3341,75 @@ Index(
 Index("idx_orders_retention_class", Order.retention_class)
 Index("idx_material_usage_retention_class", MaterialUsage.retention_class)
 Index("idx_time_entries_retention_class", TimeEntry.retention_class)
+
+# Containment lookups on time-entry metadata (extra_metadata @> '{...}').
+# jsonb_path_ops is smaller and faster than the default GIN opclass but only
+# supports @>; metadata filters must be written as containment to use it
+# (key-existence ?, ?| and ?& would fall back to a sequential scan).
+Index(
+    "ix_time_entries_meta_gin",
+    TimeEntry.extra_metadata,
+    postgresql_using="gin",
+    postgresql_ops={"extra_metadata": "jsonb_path_ops"},
+)
+
+# Yearly document-number generators read MAX(number) WHERE number LIKE
+# 'RE-2026-%'. Under a non-C database collation (the Debian postgres image
+# initialises en_US.utf8) the unique b-tree cannot serve a LIKE prefix, and a
+# '>= prefix AND < prefix~' range is wrong there ('~' sorts before digits).
+# text_pattern_ops compares bytewise, so the LIKE prefix becomes a range scan.
+Index(
+    "ix_invoices_number_pattern",
+    Invoice.invoice_number,
+    postgresql_ops={"invoice_number": "text_pattern_ops"},
+)
+Index(
+    "ix_quotes_number_pattern",
+    Quote.quote_number,
+    postgresql_ops={"quote_number": "text_pattern_ops"},
+)
+Index(
+    "ix_repair_jobs_number_pattern",
+    RepairJob.repair_number,
+    postgresql_ops={"repair_number": "text_pattern_ops"},
+)
+Index(
+    "ix_valuation_certificates_number_pattern",
+    ValuationCertificate.certificate_number,
+    postgresql_ops={"certificate_number": "text_pattern_ops"},
+)
+
+# Metal inventory FIFO/LIFO batch selection:
+#   WHERE metal_type = ? AND remaining_weight_g > 0.01 ORDER BY date_purchased
+# One (metal_type, date_purchased) btree serves both directions (PG scans it
+# backwards for LIFO), replacing the old single-column indexes that forced a
+# bitmap-AND plus sort. The partial twin holds only open batches, which is
+# what allocate/consume actually read.
+Index(
+    "ix_metal_purchases_fifo",
+    MetalPurchase.metal_type,
+    MetalPurchase.date_purchased,
+)
+Index(
+    "ix_metal_purchases_open",
+    MetalPurchase.metal_type,
+    MetalPurchase.date_purchased,
+    postgresql_where=MetalPurchase.remaining_weight_g > 0.01,
+)
+
+# Active-customer list: WHERE is_deleted = false ORDER BY created_at DESC.
+# Names/emails are Fernet ciphertext, so they get no sort or trigram index;
+# exact email lookups use the unique email_hash blind index instead.
+Index(
+    "ix_customers_active_created",
+    Customer.created_at,
+    postgresql_where=Customer.is_deleted.is_(False),
+)
+
+# Per-customer audit trail: WHERE customer_id = ? ORDER BY timestamp DESC.
+# PG walks the btree backwards for DESC, so no sort and no descending key.
+Index(
+    "ix_customer_audit_logs_customer_ts",
+    CustomerAuditLog.customer_id,
+    CustomerAuditLog.timestamp,
+)
@@ -43,7 +43,7 @@ import logging
 import os
 from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from goldsmith_erp.db._seed_helpers import filter_model_fields
@@ -317,30 +317,30 @@ async def seed_reference_activities(
     """Insert the 15 standard activities that don't already exist.
 
     Natural key: (``name``, ``category``).  Returns ``(created, skipped)``.
-    Flushes so intra-session re-checks see the new rows; commits only when
-    asked (the demo seeder composes this inside its own transaction).
+    One SELECT for the existing keys, one bulk INSERT for the missing rows;
+    both run in the session's transaction, so intra-session re-checks see the
+    new rows.  Commits only when asked (the demo seeder composes this inside
+    its own transaction).
     """
-    created = 0
-    skipped = 0
-    for data in STANDARD_ACTIVITIES:
-        exists = await db.scalar(
-            select(Activity.id).where(
-                Activity.name == data["name"],
-                Activity.category == data["category"],
-            )
+    result = await db.execute(
+        select(Activity.name, Activity.category).where(
+            Activity.name.in_([data["name"] for data in STANDARD_ACTIVITIES])
         )
-        if exists is not None:
-            skipped += 1
-            continue
-
-        payload = filter_model_fields(
+    )
+    existing = set(result.tuples().all())
+    rows = [
+        filter_model_fields(
             Activity,
             {**data, "usage_count": 0, "is_custom": False, "created_by": None},
         )
-        db.add(Activity(**payload))
-        created += 1
-
-    await db.flush()
+        for data in STANDARD_ACTIVITIES
+        if (data["name"], data["category"]) not in existing
+    ]
+    created = len(rows)
+    skipped = len(STANDARD_ACTIVITIES) - created
+
+    if rows:
+        await db.execute(insert(Activity), rows)
     if commit:
         await db.commit()
     logger.info("Reference activities: %d created, %d skipped", created, skipped)
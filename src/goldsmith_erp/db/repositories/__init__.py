@@ -7,6 +7,7 @@ migration. They are imported lazily to avoid breaking the rest of the app.
 
 from goldsmith_erp.db.repositories.base import BaseRepository
 from goldsmith_erp.db.repositories.material import MaterialRepository
+from goldsmith_erp.db.repositories.metal_purchase import MetalPurchaseRepository
 
 try:
     from goldsmith_erp.db.repositories.customer import CustomerRepository
@@ -22,5 +23,6 @@ __all__ = [
     "BaseRepository",
     "CustomerRepository",
     "MaterialRepository",
+    "MetalPurchaseRepository",
     "OrderRepository",
 ]
@@ -1,27 +1,118 @@
 """Base repository with common database operations."""
 
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
-
-from sqlalchemy import delete, func, select, update
+from functools import lru_cache
+from types import MappingProxyType
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+)
+
+from sqlalchemy import (
+    Select,
+    StatementLambdaElement,
+    and_,
+    bindparam,
+    delete,
+    func,
+    inspect,
+    lambda_stmt,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import DeclarativeMeta
+from sqlalchemy.orm import (
+    DeclarativeMeta,
+    InstrumentedAttribute,
+    with_loader_criteria,
+)
+from sqlalchemy.sql.elements import ColumnElement
 
 ModelType = TypeVar("ModelType", bound=DeclarativeMeta)
 
+# Operators accepted in dict-valued ``filters`` entries (see _apply_filters).
+_FILTER_OPERATORS: Dict[str, Callable[[Any, Any], ColumnElement[bool]]] = {
+    "eq": lambda column, value: column == value,
+    "ne": lambda column, value: column != value,
+    "in": lambda column, value: column.in_(value),
+    "not_in": lambda column, value: column.not_in(value),
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+    "like": lambda column, value: column.like(value),
+    "ilike": lambda column, value: column.ilike(value),
+    "is_null": lambda column, value: column.is_(None) if value else column.isnot(None),
+}
+
+
+@lru_cache(maxsize=None)
+def _column_map(model: type) -> Mapping[str, InstrumentedAttribute]:
+    """
+    Mapped column attributes of *model*, keyed by attribute name.
+
+    Built once per model and shared by every repository instance, so
+    filter/order validation is a dict lookup rather than ``hasattr`` /
+    ``getattr`` reflection per request. Only column attributes qualify —
+    relationships, methods and other descriptors are never filterable.
+    """
+    return MappingProxyType(
+        {attr.key: getattr(model, attr.key) for attr in inspect(model).column_attrs}
+    )
+
 
 class BaseRepository(Generic[ModelType]):
     """Base repository providing common CRUD operations."""
 
-    def __init__(self, model: Type[ModelType], session: AsyncSession):
+    def __init__(
+        self,
+        model: Type[ModelType],
+        session: AsyncSession,
+        default_criteria: Optional[Sequence[ColumnElement[bool]]] = None,
+    ):
         """
         Initialize repository.
 
         Args:
             model: SQLAlchemy model class
             session: Async database session
+            default_criteria: Predicates applied to every ``get_all``/``count``
+                query (e.g. ``[MetalPurchase.remaining_weight_g > 0.01]``), so
+                subclasses declare soft filters once instead of per query
         """
         self.model = model
         self.session = session
+        self.default_criteria = list(default_criteria or ())
+        self._columns = _column_map(model)
+
+        # Hot single-row lookups as lambda statements: SQLAlchemy caches them
+        # by the lambda's code location, so repeat calls skip statement
+        # construction and cache-key generation, not just SQL compilation.
+        model = self.model
+        self._get_by_id_stmt: StatementLambdaElement = lambda_stmt(
+            lambda: select(model).where(model.id == bindparam("id"))
+        )
+        self._exists_stmt: StatementLambdaElement = lambda_stmt(
+            lambda: select(model.id).where(model.id == bindparam("id")).limit(1)
+        )
+
+    def _apply_default_criteria(self, query: Select) -> Select:
+        """Attach ``default_criteria`` to *query* as global loader criteria."""
+        if not self.default_criteria:
+            return query
+        return query.options(
+            with_loader_criteria(
+                self.model, and_(*self.default_criteria), include_aliases=True
+            )
+        )
 
     async def get_by_id(self, id: int) -> Optional[ModelType]:
         """
@@ -33,9 +124,7 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             Model instance or None if not found
         """
-        result = await self.session.execute(
-            select(self.model).where(self.model.id == id)
-        )
+        result = await self.session.execute(self._get_by_id_stmt, {"id": id})
         return result.scalar_one_or_none()
 
     async def get_all(
@@ -51,56 +140,129 @@ class BaseRepository(Generic[ModelType]):
         Args:
             skip: Number of records to skip
             limit: Maximum number of records to return
-            filters: Dictionary of field:value pairs for filtering
+            filters: field:value pairs; a dict value applies operators
+                (``in``, ``gte``, ``lt``, ``ilike``, ...) — see ``_apply_filters``
             order_by: Field name to order by (prefix with - for descending)
 
         Returns:
             List of model instances
         """
-        query = select(self.model)
+        query = self._select_all(filters, order_by).offset(skip).limit(limit)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def iter_all(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[ModelType]:
+        """
+        Stream all matching records without materialising them in a list.
+
+        Uses a server-side cursor fetched in batches of ``chunk_size``, so
+        memory stays O(chunk_size) regardless of table size. Meant for
+        exports and reports; ``get_all`` remains the paginated API path.
+
+        Args:
+            filters: field:value pairs; a dict value applies operators
+                (``in``, ``gte``, ``lt``, ``ilike``, ...) — see ``_apply_filters``
+            order_by: Field name to order by (prefix with - for descending)
+            chunk_size: Rows fetched per round-trip
+
+        Yields:
+            Model instances
+        """
+        query = self._select_all(filters, order_by).execution_options(
+            yield_per=chunk_size
+        )
+        result = await self.session.stream_scalars(query)
+        async for instance in result:
+            yield instance
+
+    def _apply_filters(
+        self, query: Select, filters: Optional[Dict[str, Any]]
+    ) -> Select:
+        """
+        Add a WHERE clause per filter entry.
+
+        Scalar values mean equality (``{"unit": "g"}``). A dict value maps
+        operators to operands, all pushed into SQL so callers never filter
+        fetched rows in Python::
+
+            {"status": {"in": ["new", "in_progress"]},
+             "date_purchased": {"gte": start, "lt": end},
+             "name": {"ilike": "%gold%"}}
+
+        Fields the model does not have are ignored, as before; an unknown
+        operator raises ``ValueError``.
+        """
+        if not filters:
+            return query
+        for field, value in filters.items():
+            column = self._columns.get(field)
+            if column is None:
+                continue
+            if not isinstance(value, dict):
+                query = query.where(column == value)
+                continue
+            for op, operand in value.items():
+                build = _FILTER_OPERATORS.get(op)
+                if build is None:
+                    raise ValueError(
+                        f"Unsupported filter operator {op!r} for {field!r}; "
+                        f"use one of {sorted(_FILTER_OPERATORS)}"
+                    )
+                query = query.where(build(column, operand))
+        return query
+
+    def _select_all(
+        self, filters: Optional[Dict[str, Any]], order_by: Optional[str]
+    ) -> Select:
+        """Filtered, ordered ``SELECT`` shared by ``get_all`` and ``iter_all``."""
+        query = self._apply_default_criteria(select(self.model))
 
         # Apply filters
-        if filters:
-            for field, value in filters.items():
-                if hasattr(self.model, field):
-                    query = query.where(getattr(self.model, field) == value)
+        query = self._apply_filters(query, filters)
 
         # Apply ordering
         if order_by:
-            if order_by.startswith("-"):
-                field_name = order_by[1:]
-                if hasattr(self.model, field_name):
-                    query = query.order_by(getattr(self.model, field_name).desc())
-            else:
-                if hasattr(self.model, order_by):
-                    query = query.order_by(getattr(self.model, order_by))
+            clause = self._order_clause(order_by)
+            if clause is not None:
+                query = query.order_by(clause)
         else:
             # Default: order by ID descending (newest first)
             query = query.order_by(self.model.id.desc())
 
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
+        return query
 
-        result = await self.session.execute(query)
-        return list(result.scalars().all())
+    def _order_clause(self, order_by: str) -> Optional[ColumnElement]:
+        """
+        ORDER BY clause for ``"field"`` / ``"-field"`` (descending).
+
+        Returns None when *field* is not a mapped column, as before.
+        """
+        descending = order_by.startswith("-")
+        column = self._columns.get(order_by[1:] if descending else order_by)
+        if column is None:
+            return None
+        return column.desc() if descending else column
 
     async def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
         """
         Count records matching filters.
 
         Args:
-            filters: Dictionary of field:value pairs for filtering
+            filters: field:value pairs; a dict value applies operators
+                (``in``, ``gte``, ``lt``, ``ilike``, ...) — see ``_apply_filters``
 
         Returns:
             Count of matching records
         """
-        query = select(func.count(self.model.id))
+        query = self._apply_default_criteria(select(func.count(self.model.id)))
 
         # Apply filters
-        if filters:
-            for field, value in filters.items():
-                if hasattr(self.model, field):
-                    query = query.where(getattr(self.model, field) == value)
+        query = self._apply_filters(query, filters)
 
         result = await self.session.execute(query)
         return result.scalar_one()
@@ -172,8 +334,5 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             True if exists, False otherwise
         """
-        result = await self.session.execute(
-            select(func.count(self.model.id)).where(self.model.id == id)
-        )
-        count = result.scalar_one()
-        return count > 0
+        result = await self.session.execute(self._exists_stmt, {"id": id})
+        return result.first() is not None
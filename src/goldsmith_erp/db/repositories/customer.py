@@ -20,19 +20,70 @@ Date: 2025-11-06
 """
 
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Optional
-
-from sqlalchemy import and_, func, or_, select, update
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import (
+    and_,
+    func,
+    insert,
+    lambda_stmt,
+    literal,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.elements import ColumnElement
 
-from goldsmith_erp.core.encryption import get_encryption_service
+from goldsmith_erp.core.config import settings
+from goldsmith_erp.core.encryption import get_encryption_service, hmac_blind_index
+from goldsmith_erp.db.audit_buffer import AuditLogBuffer
 from goldsmith_erp.db.models import Customer, CustomerAuditLog, GDPRRequest, Order
 from goldsmith_erp.db.repositories.base import BaseRepository
+from goldsmith_erp.db.types import EncryptedString
 
 logger = logging.getLogger(__name__)
 
+# Customer columns stored as Fernet ciphertext by this repository.
+_PII_FIELDS: Tuple[str, ...] = ("phone", "address_line1", "address_line2")
+
+# Never written to audit old/new values: the repository-encrypted fields
+# above plus every EncryptedString column (names, email, address, ...).
+_AUDIT_REDACTED_FIELDS = frozenset(_PII_FIELDS) | frozenset(
+    column.key
+    for column in Customer.__table__.columns
+    if isinstance(column.type, EncryptedString)
+)
+_REDACTED = "[REDACTED]"
+
+
+class CustomerSummary(NamedTuple):
+    """Column-only customer row for list views (see ``list_summary``)."""
+
+    id: int
+    first_name: str
+    last_name: str
+    company_name: Optional[str]
+    email: str
+    customer_type: Optional[str]
+    tags: Optional[List[str]]
+    is_active: bool
+
+
+# Decrypted and substring-matched by ``search`` (id first).
+_SEARCH_COLUMNS = (
+    Customer.id,
+    Customer.first_name,
+    Customer.last_name,
+    Customer.company_name,
+    Customer.email,
+)
+
+# Selected in CustomerSummary field order.
+_SUMMARY_COLUMNS = tuple(getattr(Customer, field) for field in CustomerSummary._fields)
+
 
 class CustomerRepository(BaseRepository[Customer]):
     """
@@ -50,17 +101,30 @@ class CustomerRepository(BaseRepository[Customer]):
         >>> customers = await repo.search("mustermann")
     """
 
-    def __init__(self, session: AsyncSession, current_user_id: Optional[int] = None):
+    # Accepted ``order_by`` fields. Names / email are Fernet ciphertext, so
+    # sorting on them is meaningless and they are deliberately not listed.
+    _SORTABLE = frozenset({"id", "created_at", "updated_at"})
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        current_user_id: Optional[int] = None,
+        audit_buffer: Optional[AuditLogBuffer] = None,
+    ):
         """
         Initialize customer repository.
 
         Args:
             session: Async database session
             current_user_id: ID of current user for audit logging
+            audit_buffer: If given, audit rows are queued on this buffer and
+                bulk-written in the background instead of joining the
+                session's transaction
         """
         super().__init__(Customer, session)
         self.current_user_id = current_user_id
         self.encryption = get_encryption_service()
+        self.audit_buffer = audit_buffer
 
     # ═══════════════════════════════════════════════════════════════════════
     # Enhanced CRUD Operations (with audit logging & soft delete)
@@ -83,13 +147,54 @@ class CustomerRepository(BaseRepository[Customer]):
         Returns:
             Customer instance or None if not found
         """
-        query = select(Customer).where(Customer.id == id)
+        return await self._get_by_id(id, include_deleted, log_access)
+
+    async def get_by_id_with_orders(
+        self,
+        id: int,
+        include_deleted: bool = False,
+        log_access: bool = True,
+    ) -> Optional[Customer]:
+        """
+        Get customer by ID with ``orders`` eager-loaded.
+
+        Use this whenever the caller touches ``customer.orders`` (detail
+        views, order counts, GDPR export): the orders come from one extra
+        ``WHERE customer_id IN (...)`` query instead of a lazy load, which
+        the async session cannot do implicitly anyway. Soft-deleted orders
+        are not loaded.
+
+        Args:
+            id: Customer ID
+            include_deleted: If True, include soft-deleted customers
+            log_access: If True, log this access in audit trail
+
+        Returns:
+            Customer instance with orders loaded, or None if not found
+        """
+        return await self._get_by_id(id, include_deleted, log_access, with_orders=True)
+
+    async def _get_by_id(
+        self,
+        id: int,
+        include_deleted: bool,
+        log_access: bool,
+        with_orders: bool = False,
+    ) -> Optional[Customer]:
+        """Shared body of ``get_by_id`` / ``get_by_id_with_orders``."""
+        # Lambda statements: built and cache-keyed once per code location,
+        # closure values (id) are bound as parameters on each call.
+        stmt = lambda_stmt(lambda: select(Customer).where(Customer.id == id))
 
         # Exclude soft-deleted by default
         if not include_deleted:
-            query = query.where(Customer.is_deleted == False)
+            stmt += lambda s: s.where(Customer.is_deleted == False)
+        if with_orders:
+            stmt += lambda s: s.options(
+                selectinload(Customer.orders.and_(Order.is_deleted == False))
+            )
 
-        result = await self.session.execute(query)
+        result = await self.session.execute(stmt)
         customer = result.scalar_one_or_none()
 
         # Log access for GDPR Article 30 (audit trail)
@@ -103,7 +208,7 @@ class CustomerRepository(BaseRepository[Customer]):
 
         # Decrypt PII fields
         if customer:
-            customer = self._decrypt_customer_pii(customer)
+            self._decrypt_customers_pii([customer])
 
         return customer
 
@@ -122,36 +227,70 @@ class CustomerRepository(BaseRepository[Customer]):
             skip: Number of records to skip
             limit: Maximum number of records to return
             filters: Dictionary of field:value pairs for filtering
-            order_by: Field name to order by (prefix with - for descending)
+            order_by: ``id``, ``created_at`` or ``updated_at`` (prefix with -
+                for descending); other fields raise ValueError
             include_deleted: If True, include soft-deleted customers
 
         Returns:
             List of customer instances
         """
+        return await self._get_all(skip, limit, filters, order_by, include_deleted)
+
+    async def get_all_with_orders(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        include_deleted: bool = False,
+    ) -> List[Customer]:
+        """
+        Get a page of customers with ``orders`` eager-loaded.
+
+        Same arguments as ``get_all``. The orders of the whole page are
+        fetched by a single ``selectinload`` query (no per-customer N+1 and
+        no JOIN row explosion); soft-deleted orders are not loaded. Use it
+        for list views that show order counts or totals — plain lists
+        should stay on ``get_all`` / ``list_summary``.
+
+        Returns:
+            List of customer instances with orders loaded
+        """
+        return await self._get_all(
+            skip, limit, filters, order_by, include_deleted, with_orders=True
+        )
+
+    async def _get_all(
+        self,
+        skip: int,
+        limit: int,
+        filters: Optional[Dict[str, Any]],
+        order_by: Optional[str],
+        include_deleted: bool,
+        with_orders: bool = False,
+    ) -> List[Customer]:
+        """Shared body of ``get_all`` / ``get_all_with_orders``."""
         query = select(Customer)
+        if with_orders:
+            query = query.options(
+                selectinload(Customer.orders.and_(Order.is_deleted == False))
+            )
 
         # Exclude soft-deleted by default
         if not include_deleted:
             query = query.where(Customer.is_deleted == False)
 
         # Apply filters
-        if filters:
-            for field, value in filters.items():
-                if hasattr(Customer, field):
-                    query = query.where(getattr(Customer, field) == value)
+        query = self._apply_filters(query, filters)
 
         # Apply ordering
         if order_by:
-            if order_by.startswith("-"):
-                field_name = order_by[1:]
-                if hasattr(Customer, field_name):
-                    query = query.order_by(getattr(Customer, field_name).desc())
-            else:
-                if hasattr(Customer, order_by):
-                    query = query.order_by(getattr(Customer, order_by))
+            clause = self._order_clause(order_by)
+            if clause is not None:
+                query = query.order_by(clause)
         else:
-            # Default: order by customer_number descending (newest first)
-            query = query.order_by(Customer.customer_number.desc())
+            # Default: newest first (served by ix_customers_active_created)
+            query = query.order_by(Customer.created_at.desc())
 
         # Apply pagination
         query = query.offset(skip).limit(limit)
@@ -159,10 +298,86 @@ class CustomerRepository(BaseRepository[Customer]):
         result = await self.session.execute(query)
         customers = list(result.scalars().all())
 
-        # Decrypt PII for all customers
-        customers = [self._decrypt_customer_pii(c) for c in customers]
+        # Decrypt PII for the whole page in one batch
+        return self._decrypt_customers_pii(customers)
 
-        return customers
+    async def list_after(
+        self,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        limit: int = 100,
+        include_deleted: bool = False,
+    ) -> List[Customer]:
+        """
+        Keyset-paginated customers, newest first.
+
+        Instead of ``OFFSET`` (which scans and discards every skipped row)
+        the next page starts strictly after ``cursor`` in
+        ``(created_at, id)`` order, so each page costs the same however deep
+        it is. Pass ``None`` for the first page, then
+        ``(last.created_at, last.id)`` of the previous page's last customer.
+
+        Args:
+            cursor: ``(created_at, id)`` of the last customer already seen
+            limit: Maximum number of records to return
+            include_deleted: If True, include soft-deleted customers
+
+        Returns:
+            List of customer instances (empty once exhausted)
+        """
+        query = select(Customer)
+        if not include_deleted:
+            query = query.where(Customer.is_deleted == False)
+        if cursor is not None:
+            query = query.where(tuple_(Customer.created_at, Customer.id) < cursor)
+        query = query.order_by(Customer.created_at.desc(), Customer.id.desc())
+
+        result = await self.session.execute(query.limit(limit))
+        customers = list(result.scalars().all())
+
+        # Decrypt PII for the whole page in one batch
+        return self._decrypt_customers_pii(customers)
+
+    async def list_summary(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        include_deleted: bool = False,
+    ) -> List[CustomerSummary]:
+        """
+        Get a page of customers as lightweight summary tuples.
+
+        Same filtering, ordering and pagination as ``get_all``, but only the
+        list columns are selected: no ORM instances, identity-map entries or
+        phone / address decryption. Not audited as an access, matching
+        ``get_all``.
+
+        Args:
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            filters: Dictionary of field:value pairs for filtering
+            order_by: ``id``, ``created_at`` or ``updated_at`` (prefix with -
+                for descending); other fields raise ValueError
+            include_deleted: If True, include soft-deleted customers
+
+        Returns:
+            List of CustomerSummary tuples
+        """
+        query = select(*_SUMMARY_COLUMNS)
+        if not include_deleted:
+            query = query.where(Customer.is_deleted == False)
+        query = self._apply_filters(query, filters)
+
+        if order_by:
+            clause = self._order_clause(order_by)
+            if clause is not None:
+                query = query.order_by(clause)
+        else:
+            query = query.order_by(Customer.created_at.desc())
+
+        result = await self.session.execute(query.offset(skip).limit(limit))
+        return [CustomerSummary(*row) for row in result.all()]
 
     async def create(
         self,
@@ -189,34 +404,43 @@ class CustomerRepository(BaseRepository[Customer]):
 
         Note:
             Automatically sets:
-            - created_at, created_by
+            - created_at, email_hash
             - is_active = True
             - is_deleted = False
             - Encrypts PII fields (phone, address)
         """
         # Encrypt PII fields if provided
-        pii_fields = ["phone", "address_line1", "address_line2"]
-        for field in pii_fields:
+        for field in _PII_FIELDS:
             if field in additional_data and additional_data[field]:
                 additional_data[field] = self.encryption.encrypt(additional_data[field])
 
-        # Create customer
+        # Create customer. Keys the model does not map (customer_number,
+        # legal_basis, created_by) are dropped; legal_basis goes to the audit
+        # row instead.
         customer_data = {
-            "customer_number": customer_number,
             "first_name": first_name,
             "last_name": last_name,
             "email": email,
-            "legal_basis": legal_basis,
+            # Set explicitly: INSERT ... RETURNING skips the ORM
+            # before_insert hook that would derive it from ``email``.
+            "email_hash": hmac_blind_index(email),
             "created_at": datetime.utcnow(),
-            "created_by": self.current_user_id,
             "is_active": True,
             "is_deleted": False,
             **additional_data,
         }
+        values = {
+            field: value
+            for field, value in customer_data.items()
+            if field in self._columns
+        }
 
-        customer = Customer(**customer_data)
-        self.session.add(customer)
-        await self.session.flush()  # Flush to get ID
+        # One round-trip: server/column defaults come back via RETURNING, so
+        # neither a flush for the ID nor a refresh after commit is needed.
+        result = await self.session.execute(
+            insert(Customer).values(values).returning(Customer)
+        )
+        customer = result.scalar_one()
 
         # Log creation
         await self._log_audit(
@@ -224,81 +448,109 @@ class CustomerRepository(BaseRepository[Customer]):
             action="created",
             entity="customer",
             entity_id=customer.id,
+            legal_basis=legal_basis,
         )
 
         await self.session.commit()
-        await self.session.refresh(customer)
 
         # Decrypt PII before returning
-        customer = self._decrypt_customer_pii(customer)
+        self._decrypt_customers_pii([customer])
 
         return customer
 
     async def update(
         self,
         id: int,
+        track_changes: bool = True,
         **data,
     ) -> Optional[Customer]:
         """
         Update customer with change tracking and audit logging.
 
+        Writes go out as one ``UPDATE ... RETURNING`` — the row is never
+        loaded (or PII-decrypted) just to be mutated in Python.
+
         Args:
             id: Customer ID
-            **data: Fields to update
+            track_changes: If True, first read only the columns being
+                changed so the audit log records old → new per field. If
+                False, skip that read; audit rows carry the new value only.
+            **data: Fields to update (unknown keys are ignored)
 
         Returns:
             Updated customer or None if not found
 
         Note:
             - Logs all field changes in audit log
-            - Automatically updates updated_at, updated_by
+            - Automatically updates updated_at
             - Encrypts PII fields before storing
         """
-        customer = await self.get_by_id(id, include_deleted=False, log_access=False)
-        if not customer:
-            return None
-
-        # Track changes for audit log
-        changes = {}
-
         # Encrypt PII fields if being updated
-        pii_fields = ["phone", "address_line1", "address_line2"]
-
+        values = {}
         for field, new_value in data.items():
-            if hasattr(customer, field):
-                old_value = getattr(customer, field)
-
-                # Encrypt PII fields
-                if field in pii_fields and new_value:
-                    new_value = self.encryption.encrypt(new_value)
-
-                # Track change
-                if old_value != new_value:
-                    changes[field] = {"old": str(old_value), "new": str(new_value)}
+            if field not in self._columns:
+                continue
+            if field in _PII_FIELDS and new_value:
+                new_value = self.encryption.encrypt(new_value)
+            values[field] = new_value
 
-                setattr(customer, field, new_value)
+        # Track changes for audit log
+        if track_changes and values:
+            result = await self.session.execute(
+                select(*(self._columns[field] for field in values)).where(
+                    *self._active(id)
+                )
+            )
+            row = result.one_or_none()
+            if row is None:
+                return None
+            old_values = row._asdict()
+            changes = {
+                field: {
+                    "old": self._audit_value(field, old_values[field]),
+                    "new": self._audit_value(field, new_value),
+                }
+                for field, new_value in values.items()
+                if old_values[field] != new_value
+            }
+        else:
+            changes = {
+                field: {"old": None, "new": self._audit_value(field, new_value)}
+                for field, new_value in values.items()
+            }
 
-        # Update audit fields
-        customer.updated_at = datetime.utcnow()
-        customer.updated_by = self.current_user_id
+        result = await self.session.execute(
+            update(Customer)
+            .where(*self._active(id))
+            .values({**values, "updated_at": datetime.utcnow()})
+            .returning(Customer)
+            .execution_options(populate_existing=True)
+        )
+        customer = result.scalar_one_or_none()
+        if not customer:
+            return None
 
-        # Log each field change
-        for field, change in changes.items():
-            await self._log_audit(
-                customer_id=customer.id,
-                action="updated",
-                entity="customer",
-                entity_id=customer.id,
-                field_name=field,
-                old_value=change["old"],
-                new_value=change["new"],
-            )
+        # One audit row per changed field, written in a single executemany
+        # INSERT (no per-field round-trip, no ORM objects)
+        await self._insert_audit_rows(
+            [
+                self._audit_row(
+                    customer_id=customer.id,
+                    action="updated",
+                    entity="customer",
+                    entity_id=customer.id,
+                    field_name=field,
+                    old_value=change["old"],
+                    new_value=change["new"],
+                )
+                for field, change in changes.items()
+            ]
+        )
 
         await self.session.commit()
-        await self.session.refresh(customer)
 
         # Decrypt PII before returning
-        customer = self._decrypt_customer_pii(customer)
+        self._decrypt_customers_pii([customer])
 
         return customer
 
@@ -320,14 +572,14 @@ class CustomerRepository(BaseRepository[Customer]):
             True if deleted, False if not found
 
         Note:
-            - Soft delete: Sets is_deleted=True, preserves data
+            - Soft delete: Sets is_deleted=True in a single UPDATE, preserves data
             - Hard delete: Permanently removes from database (use with caution)
         """
-        customer = await self.get_by_id(id, include_deleted=False, log_access=False)
-        if not customer:
-            return False
-
         if hard_delete:
+            customer = await self.get_by_id(id, include_deleted=False, log_access=False)
+            if not customer:
+                return False
+
             # GDPR Article 17: Right to Erasure
             await self._log_audit(
                 customer_id=customer.id,
@@ -340,23 +592,32 @@ class CustomerRepository(BaseRepository[Customer]):
             await self.session.delete(customer)
             await self.session.commit()
             return True
-        else:
-            # Soft delete
-            customer.is_deleted = True
-            customer.deleted_at = datetime.utcnow()
-            customer.deleted_by = self.current_user_id
-            customer.deletion_reason = deletion_reason
 
-            await self._log_audit(
-                customer_id=customer.id,
-                action="soft_deleted",
-                entity="customer",
-                entity_id=customer.id,
-                purpose=deletion_reason or "Soft delete",
+        # Soft delete
+        result = await self.session.execute(
+            update(Customer)
+            .where(*self._active(id))
+            .values(
+                is_deleted=True,
+                deleted_at=datetime.utcnow(),
+                deleted_by=self.current_user_id,
+                deletion_reason=deletion_reason,
             )
+            .returning(Customer.id)
+        )
+        if result.scalar_one_or_none() is None:
+            return False
 
-            await self.session.commit()
-            return True
+        await self._log_audit(
+            customer_id=id,
+            action="soft_deleted",
+            entity="customer",
+            entity_id=id,
+            purpose=deletion_reason or "Soft delete",
+        )
+
+        await self.session.commit()
+        return True
 
     # ═══════════════════════════════════════════════════════════════════════
     # Search & Filtering
@@ -370,7 +631,7 @@ class CustomerRepository(BaseRepository[Customer]):
         include_deleted: bool = False,
     ) -> List[Customer]:
         """
-        Search customers by name, email, or customer number.
+        Search customers by name, company or email (substring, any case).
 
         Args:
             query: Search query string
@@ -381,45 +642,69 @@ class CustomerRepository(BaseRepository[Customer]):
         Returns:
             List of matching customers
         """
-        search_term = f"%{query}%"
-        stmt = select(Customer).where(
-            or_(
-                Customer.first_name.ilike(search_term),
-                Customer.last_name.ilike(search_term),
-                Customer.email.ilike(search_term),
-                Customer.customer_number.ilike(search_term),
+        # Fast path: a full email address is an exact blind-index lookup
+        if "@" in query and " " not in query.strip():
+            stmt = select(Customer).where(
+                Customer.email_hash == hmac_blind_index(query)
             )
-        )
-
-        # Exclude soft-deleted by default
+            if not include_deleted:
+                stmt = stmt.where(Customer.is_deleted == False)
+            result = await self.session.execute(stmt.offset(skip).limit(limit))
+            customers = list(result.scalars().all())
+            if customers:
+                return self._decrypt_customers_pii(customers)
+
+        # Names and email are Fernet ciphertext, so SQL ILIKE / full-text
+        # indexes cannot match them. Scan only the searchable columns (no
+        # ORM instances), match on the decrypted values, then load the full
+        # rows for the requested page alone.
+        stmt = select(*_SEARCH_COLUMNS)
         if not include_deleted:
             stmt = stmt.where(Customer.is_deleted == False)
 
-        stmt = stmt.order_by(Customer.last_name, Customer.first_name)
-        stmt = stmt.offset(skip).limit(limit)
-
-        result = await self.session.execute(stmt)
-        customers = list(result.scalars().all())
+        needle = query.strip().lower()
+        matches = []
+        result = await self.session.stream(stmt.execution_options(yield_per=1000))
+        async for id, first_name, last_name, company_name, email in result:
+            if any(
+                value and needle in value.lower()
+                for value in (first_name, last_name, company_name, email)
+            ):
+                matches.append(
+                    ((last_name or "").lower(), (first_name or "").lower(), id)
+                )
+        matches.sort()
+        page_ids = [id for _, _, id in matches[skip : skip + limit]]
+        if not page_ids:
+            return []
 
-        # Decrypt PII
-        customers = [self._decrypt_customer_pii(c) for c in customers]
+        result = await self.session.execute(
+            select(Customer).where(Customer.id.in_(page_ids))
+        )
+        by_id = {customer.id: customer for customer in result.scalars()}
+        customers = [by_id[id] for id in page_ids if id in by_id]
 
-        return customers
+        # Decrypt PII for the whole page in one batch
+        return self._decrypt_customers_pii(customers)
 
     async def get_by_email(self, email: str) -> Optional[Customer]:
         """
         Get customer by email address.
 
+        Matches on the ``email_hash`` blind index — ``email`` itself is
+        non-deterministic ciphertext and cannot be compared in SQL.
+
         Args:
             email: Customer email
 
         Returns:
             Customer instance or None
         """
+        email_hash = hmac_blind_index(email)
         result = await self.session.execute(
-            select(Customer).where(
-                and_(
-                    Customer.email == email,
+            lambda_stmt(
+                lambda: select(Customer).where(
+                    Customer.email_hash == email_hash,
                     Customer.is_deleted == False,
                 )
             )
@@ -427,10 +712,33 @@ class CustomerRepository(BaseRepository[Customer]):
         customer = result.scalar_one_or_none()
 
         if customer:
-            customer = self._decrypt_customer_pii(customer)
+            self._decrypt_customers_pii([customer])
 
         return customer
 
+    async def email_exists(self, email: str) -> bool:
+        """
+        Check whether a non-deleted customer uses this email address.
+
+        Looks up the ``email_hash`` blind index and selects a constant with
+        ``LIMIT 1`` — no row is loaded or decrypted.
+
+        Args:
+            email: Customer email
+
+        Returns:
+            True if the email is taken
+        """
+        result = await self.session.execute(
+            select(literal(1))
+            .where(
+                Customer.email_hash == hmac_blind_index(email),
+                Customer.is_deleted == False,
+            )
+            .limit(1)
+        )
+        return result.first() is not None
+
     async def get_by_customer_number(self, customer_number: str) -> Optional[Customer]:
         """
         Get customer by customer number.
@@ -452,7 +760,7 @@ class CustomerRepository(BaseRepository[Customer]):
         customer = result.scalar_one_or_none()
 
         if customer:
-            customer = self._decrypt_customer_pii(customer)
+            self._decrypt_customers_pii([customer])
 
         return customer
 
@@ -486,10 +794,6 @@ class CustomerRepository(BaseRepository[Customer]):
         Note:
             Automatically updates consent_date when consent changes
         """
-        customer = await self.get_by_id(customer_id, log_access=False)
-        if not customer:
-            return None
-
         # Map consent type to field
         consent_fields = {
             "marketing": "consent_marketing",
@@ -503,17 +807,36 @@ class CustomerRepository(BaseRepository[Customer]):
         if not field_name:
             raise ValueError(f"Invalid consent type: {consent_type}")
 
-        # Update consent
-        old_value = getattr(customer, field_name)
-        setattr(customer, field_name, consent_value)
+        # Only the consent column itself is read (for the audit diff)
+        result = await self.session.execute(
+            select(getattr(Customer, field_name)).where(*self._active(customer_id))
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        old_value = row[0]
 
-        # Update consent metadata
-        customer.consent_date = datetime.utcnow()
-        customer.consent_version = consent_version
+        # Update consent + consent metadata in one UPDATE ... RETURNING
+        values = {
+            field_name: consent_value,
+            "consent_date": datetime.utcnow(),
+            "consent_version": consent_version,
+        }
         if ip_address:
-            customer.consent_ip_address = ip_address
+            values["consent_ip_address"] = ip_address
         if consent_method:
-            customer.consent_method = consent_method
+            values["consent_method"] = consent_method
+
+        result = await self.session.execute(
+            update(Customer)
+            .where(*self._active(customer_id))
+            .values(values)
+            .returning(Customer)
+            .execution_options(populate_existing=True)
+        )
+        customer = result.scalar_one_or_none()
+        if not customer:
+            return None
 
         # Log consent change
         await self._log_audit(
@@ -528,9 +851,8 @@ class CustomerRepository(BaseRepository[Customer]):
         )
 
         await self.session.commit()
-        await self.session.refresh(customer)
 
-        customer = self._decrypt_customer_pii(customer)
+        self._decrypt_customers_pii([customer])
         return customer
 
     # ═══════════════════════════════════════════════════════════════════════
@@ -550,6 +872,41 @@ class CustomerRepository(BaseRepository[Customer]):
     # `customers` table. Do not re-introduce columns on `customers` without a
     # migration and explicit buy-in from Anna + Henrik.
 
+    async def iter_scheduled_for_deletion(
+        self,
+        now: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[Customer]:
+        """
+        Stream customers whose Art. 17 grace period has elapsed.
+
+        Selects on the existing ``deletion_scheduled_at`` column (set when an
+        erasure request is accepted). Rows come from a server-side cursor and
+        are decrypted one ``chunk_size`` partition at a time, so memory stays
+        bounded however many customers are due.
+
+        Args:
+            now: Cut-off time (default: ``datetime.utcnow()``)
+            chunk_size: Rows fetched and decrypted per round-trip
+
+        Yields:
+            Customer instances, ordered by ID
+        """
+        now = now or datetime.utcnow()
+        query = (
+            select(Customer)
+            .where(
+                Customer.deletion_scheduled_at.isnot(None),
+                Customer.deletion_scheduled_at <= now,
+            )
+            .order_by(Customer.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream_scalars(query)
+        async for partition in result.partitions(chunk_size):
+            for customer in self._decrypt_customers_pii(list(partition)):
+                yield customer
+
     # ═══════════════════════════════════════════════════════════════════════
     # GDPR Audit Logging (Article 30)
     # ═══════════════════════════════════════════════════════════════════════
@@ -572,15 +929,60 @@ class CustomerRepository(BaseRepository[Customer]):
             List of audit log entries
         """
         result = await self.session.execute(
-            select(CustomerAuditLog)
-            .where(CustomerAuditLog.customer_id == customer_id)
-            .order_by(CustomerAuditLog.timestamp.desc())
-            .offset(skip)
-            .limit(limit)
+            lambda_stmt(
+                lambda: select(CustomerAuditLog)
+                .where(CustomerAuditLog.customer_id == customer_id)
+                .order_by(CustomerAuditLog.timestamp.desc())
+                .offset(skip)
+                .limit(limit)
+            )
         )
         return list(result.scalars().all())
 
-    async def _log_audit(
+    async def _log_audit(self, flush: bool = False, **fields: Any) -> None:
+        """
+        Internal method to log customer data access/modification.
+
+        Adds a single audit row (see ``_audit_row`` for the accepted
+        fields) to the session. The row is written by the caller's closing
+        ``commit()`` (or the next autoflush); pass ``flush=True`` only when
+        the audit row's primary key is needed straight away.
+
+        With ``AUDIT_TRAIL_LEVEL="mutations_only"`` pure reads
+        (``action="accessed"``) are not logged.
+        """
+        if (
+            settings.AUDIT_TRAIL_LEVEL == "mutations_only"
+            and fields.get("action") == "accessed"
+        ):
+            return
+        self._add_audit_rows([self._audit_row(**fields)])
+        if flush and self.audit_buffer is None:
+            await self.session.flush()
+
+    def _add_audit_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Queue audit rows on the buffer, or add them to the session."""
+        if self.audit_buffer is not None:
+            # A full buffer refuses the row; write it with this session.
+            rows = [row for row in rows if not self.audit_buffer.enqueue(row)]
+        self.session.add_all([CustomerAuditLog(**row) for row in rows])
+
+    async def _insert_audit_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Write a batch of audit rows with one Core ``INSERT`` (executemany).
+
+        Skips the unit of work: no ``CustomerAuditLog`` instances are built
+        and ORM events on the model do not fire, which audit rows never
+        rely on. With an ``audit_buffer`` the rows are queued instead.
+        """
+        if not rows:
+            return
+        if self.audit_buffer is not None:
+            self._add_audit_rows(rows)
+        else:
+            await self.session.execute(insert(CustomerAuditLog), rows)
+
+    def _audit_row(
         self,
         customer_id: int,
         action: str,
@@ -593,9 +995,9 @@ class CustomerRepository(BaseRepository[Customer]):
         purpose: Optional[str] = None,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
-    ):
+    ) -> Dict[str, Any]:
         """
-        Internal method to log customer data access/modification.
+        Column values of an audit row for customer data access/modification.
 
         Args:
             customer_id: Customer ID
@@ -609,13 +1011,16 @@ class CustomerRepository(BaseRepository[Customer]):
             purpose: Purpose of data processing
             ip_address: IP address of request
             user_agent: User agent string
+
+        Returns:
+            ``CustomerAuditLog`` column values
         """
         # Get current user info (would come from request context in real app)
         user_id = self.current_user_id or 1
         user_email = None  # Would fetch from User model
         user_role = None  # Would fetch from User model
 
-        audit_log = CustomerAuditLog(
+        return dict(
             customer_id=customer_id,
             action=action,
             entity=entity,
@@ -629,58 +1034,103 @@ class CustomerRepository(BaseRepository[Customer]):
             timestamp=datetime.utcnow(),
             ip_address=ip_address,
             user_agent=user_agent,
-            legal_basis=legal_basis,
-            purpose=purpose,
+            # CustomerAuditLog has no dedicated columns for these; they go
+            # into ``details`` like the audit middleware's context does.
+            details=(
+                {"legal_basis": legal_basis, "purpose": purpose}
+                if legal_basis or purpose
+                else None
+            ),
         )
 
-        self.session.add(audit_log)
-        await self.session.flush()
+    def _order_clause(self, order_by: str) -> Optional[ColumnElement]:
+        """
+        ORDER BY clause for a whitelisted ``"field"`` / ``"-field"``.
+
+        Raises:
+            ValueError: If the field is not in ``_SORTABLE``
+        """
+        field = order_by[1:] if order_by.startswith("-") else order_by
+        if field not in self._SORTABLE:
+            raise ValueError(f"Unsupported order_by field: {field!r}")
+        return super()._order_clause(order_by)
+
+    @staticmethod
+    def _audit_value(field: str, value: Any) -> Optional[str]:
+        """
+        Text stored as an audit row's old/new value for ``field``.
+
+        PII fields are stored as ``[REDACTED]`` — the trail records *that*
+        they changed, never the plaintext or a (large) ciphertext token.
+        Dates use ISO format; other scalars their ``str()``.
+        """
+        if value is None:
+            return None
+        if field in _AUDIT_REDACTED_FIELDS:
+            return _REDACTED
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        return str(value)
+
+    @staticmethod
+    def _active(id: int) -> tuple:
+        """WHERE criteria matching a customer by ID that is not soft-deleted."""
+        return (Customer.id == id, Customer.is_deleted == False)
 
     # ═══════════════════════════════════════════════════════════════════════
     # PII Encryption/Decryption Helpers
     # ═══════════════════════════════════════════════════════════════════════
 
-    def _decrypt_customer_pii(self, customer: Customer) -> Customer:
+    def _decrypt_customers_pii(self, customers: List[Customer]) -> List[Customer]:
         """
-        Decrypt PII fields for a customer instance.
+        Decrypt PII fields for a batch of customer instances.
+
+        Every non-empty phone / address_line1 / address_line2 ciphertext in
+        ``customers`` goes through a single ``encryption.decrypt_many`` call
+        and the plaintexts are scattered back. If the batch fails (corrupt
+        ciphertext or wrong key), each slot is retried on its own so one bad
+        row cannot blank out the rest of the page.
 
         Args:
-            customer: Customer instance with encrypted PII
+            customers: Customer instances with encrypted PII
 
         Returns:
-            Customer instance with decrypted PII
+            The same instances, with decrypted PII
         """
-        if customer.phone:
+        # One getattr per candidate slot; rows without PII add nothing.
+        slots = []
+        ciphertexts = []
+        for customer in customers:
+            for attr in _PII_FIELDS:
+                value = getattr(customer, attr, None)
+                if value:
+                    slots.append((customer, attr))
+                    ciphertexts.append(value)
+        if not slots:
+            return customers
+
+        try:
+            plaintexts = self.encryption.decrypt_many(ciphertexts)
+        except Exception:
+            pass  # retried slot by slot below
+        else:
+            for (customer, attr), value in zip(slots, plaintexts):
+                setattr(customer, attr, value)
+            return customers
+
+        # Batch failed: isolate the bad ciphertext(s).
+        for (customer, attr), ciphertext in zip(slots, ciphertexts):
             try:
-                customer.phone = self.encryption.decrypt(customer.phone)
+                setattr(customer, attr, self.encryption.decrypt(ciphertext))
             except Exception:
                 # Keep the encrypted value rather than failing the whole read,
                 # but surface the corruption — a silent pass here masks a wrong
                 # ENCRYPTION_KEY or corrupt ciphertext (CLAUDE.md: fail loudly).
                 logger.warning(
-                    "PII decrypt failed for customer %s field=phone — serving "
+                    "PII decrypt failed for customer %s field=%s — serving "
                     "ciphertext; check ENCRYPTION_KEY / data integrity",
                     customer.id,
+                    attr,
                 )
 
-        if customer.address_line1:
-            try:
-                customer.address_line1 = self.encryption.decrypt(customer.address_line1)
-            except Exception:
-                logger.warning(
-                    "PII decrypt failed for customer %s field=address_line1 — "
-                    "serving ciphertext; check ENCRYPTION_KEY / data integrity",
-                    customer.id,
-                )
-
-        if customer.address_line2:
-            try:
-                customer.address_line2 = self.encryption.decrypt(customer.address_line2)
-            except Exception:
-                logger.warning(
-                    "PII decrypt failed for customer %s field=address_line2 — "
-                    "serving ciphertext; check ENCRYPTION_KEY / data integrity",
-                    customer.id,
-                )
-
-        return customer
+        return customers
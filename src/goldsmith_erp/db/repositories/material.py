@@ -2,7 +2,7 @@
 
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import or_, select
+from sqlalchemy import func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from goldsmith_erp.db.models import Material
@@ -96,30 +96,46 @@ class MaterialRepository(BaseRepository[Material]):
             operation: "add" to increase stock, "subtract" to decrease
 
         Returns:
-            Updated material or None if not found or invalid operation
+            Updated material or None if not found
 
         Raises:
-            ValueError: If operation would result in negative stock
+            ValueError: If operation would result in negative stock, or the
+                operation is invalid
+
+        Note:
+            Runs as one ``UPDATE ... SET stock = stock ± :q WHERE stock ± :q
+            >= 0 RETURNING``: the database applies the delta and the
+            non-negative guard under the row lock, so concurrent adjustments
+            cannot overwrite each other.
         """
-        material = await self.get_by_id(id)
-        if not material:
-            return None
-
         if operation == "add":
-            new_stock = material.stock + quantity
+            delta = quantity
         elif operation == "subtract":
-            new_stock = material.stock - quantity
-            if new_stock < 0:
-                raise ValueError(
-                    f"Insufficient stock. Available: {material.stock}, "
-                    f"Requested: {quantity}"
-                )
+            delta = -quantity
         else:
             raise ValueError(f"Invalid operation: {operation}. Use 'add' or 'subtract'")
 
-        material.stock = new_stock
+        new_stock = Material.stock + delta
+        result = await self.session.execute(
+            update(Material)
+            .where(Material.id == id, new_stock >= 0)
+            .values(stock=new_stock)
+            .returning(Material)
+            .execution_options(populate_existing=True)
+        )
+        material = result.scalar_one_or_none()
+        if material is None:
+            # Guard failed: distinguish "no such material" from "not enough"
+            available = await self.session.scalar(
+                select(Material.stock).where(Material.id == id)
+            )
+            if available is None:
+                return None
+            raise ValueError(
+                f"Insufficient stock. Available: {available}, " f"Requested: {quantity}"
+            )
+
         await self.session.commit()
-        await self.session.refresh(material)
         return material
 
     async def set_stock(self, id: int, quantity: float) -> Optional[Material]:
@@ -145,7 +161,6 @@ class MaterialRepository(BaseRepository[Material]):
 
         material.stock = quantity
         await self.session.commit()
-        await self.session.refresh(material)
         return material
 
     async def get_total_value(self, filters: Optional[Dict[str, Any]] = None) -> float:
@@ -158,19 +173,14 @@ class MaterialRepository(BaseRepository[Material]):
         Returns:
             Total value (sum of stock * unit_price)
         """
-        query = select(Material)
-
-        # Apply filters
-        if filters:
-            for field, value in filters.items():
-                if hasattr(Material, field):
-                    query = query.where(getattr(Material, field) == value)
+        # Aggregate in SQL: one scalar row instead of every Material instance
+        query = self._apply_default_criteria(
+            select(func.coalesce(func.sum(Material.stock * Material.unit_price), 0.0))
+        )
+        query = self._apply_filters(query, filters)
 
         result = await self.session.execute(query)
-        materials = result.scalars().all()
-
-        total_value = sum(m.stock * m.unit_price for m in materials)
-        return total_value
+        return float(result.scalar_one())
 
     async def get_by_properties(
         self, properties_filters: Dict[str, Any], skip: int = 0, limit: int = 100
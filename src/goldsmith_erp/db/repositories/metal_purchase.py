@@ -0,0 +1,163 @@
+"""Metal purchase repository: SQL-side FIFO/LIFO batch selection."""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from goldsmith_erp.db.models import MetalPurchase, MetalType
+from goldsmith_erp.db.repositories.base import BaseRepository
+
+# Batches at or below this weight count as depleted (matches
+# MetalPurchase.is_depleted and the ix_metal_purchases_open partial index).
+DEPLETED_THRESHOLD_G = 0.01
+
+
+class BatchSlice(NamedTuple):
+    """An open batch selected for consumption, in costing order."""
+
+    id: int
+    metal_type: MetalType
+    date_purchased: object
+    remaining_weight_g: float
+    price_per_gram: float
+    cumulative_weight_g: float
+    total_available_g: float
+
+
+class MetalPurchaseRepository(BaseRepository[MetalPurchase]):
+    """
+    Repository for MetalPurchase with costing-method helpers.
+
+    ``get_all``/``count`` only see open batches (``remaining_weight_g >
+    0.01``) via ``default_criteria``.
+    """
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(
+            MetalPurchase,
+            session,
+            default_criteria=[MetalPurchase.remaining_weight_g > DEPLETED_THRESHOLD_G],
+        )
+
+    async def select_batches_for_consumption(
+        self, metal_type: MetalType, needed_g: float, lifo: bool = False
+    ) -> List[BatchSlice]:
+        """
+        Return the open batches a FIFO/LIFO consumption of ``needed_g`` draws from.
+
+        A running ``SUM() OVER (ORDER BY date_purchased)`` is computed in SQL
+        and only rows whose preceding cumulative weight is still below
+        ``needed_g`` are returned — the planner never loads the rest of the
+        inventory. Every row also carries ``total_available_g`` (the sum over
+        all open batches) so callers can report a shortfall.
+
+        Args:
+            metal_type: Metal to draw from
+            needed_g: Weight required in grams
+            lifo: Newest batch first instead of oldest
+
+        Returns:
+            Batches in consumption order (empty if no open batch exists)
+        """
+        date_order = (
+            MetalPurchase.date_purchased.desc()
+            if lifo
+            else MetalPurchase.date_purchased.asc()
+        )
+        id_order = MetalPurchase.id.desc() if lifo else MetalPurchase.id.asc()
+        ranked = (
+            select(
+                MetalPurchase.id,
+                MetalPurchase.metal_type,
+                MetalPurchase.date_purchased,
+                MetalPurchase.remaining_weight_g,
+                MetalPurchase.price_per_gram,
+                func.sum(MetalPurchase.remaining_weight_g)
+                .over(order_by=(date_order, id_order), rows=(None, 0))
+                .label("cumulative_weight_g"),
+                func.sum(MetalPurchase.remaining_weight_g)
+                .over()
+                .label("total_available_g"),
+            )
+            .where(
+                MetalPurchase.metal_type == metal_type,
+                MetalPurchase.remaining_weight_g > DEPLETED_THRESHOLD_G,
+            )
+            .subquery()
+        )
+        query = (
+            select(ranked)
+            .where(
+                ranked.c.cumulative_weight_g - ranked.c.remaining_weight_g < needed_g
+            )
+            .order_by(ranked.c.cumulative_weight_g)
+        )
+        result = await self.session.execute(query)
+        return [BatchSlice(*row) for row in result.all()]
+
+    async def get_weighted_average(
+        self, metal_type: MetalType
+    ) -> Tuple[float, Optional[float]]:
+        """
+        Weighted average price over all open batches of ``metal_type``.
+
+        Returns:
+            ``(total_available_g, avg_price_per_gram)``; the average is
+            ``None`` when nothing is in stock
+        """
+        result = await self.session.execute(
+            select(
+                func.coalesce(func.sum(MetalPurchase.remaining_weight_g), 0.0),
+                func.sum(
+                    MetalPurchase.remaining_weight_g * MetalPurchase.price_per_gram
+                ),
+            ).where(
+                MetalPurchase.metal_type == metal_type,
+                MetalPurchase.remaining_weight_g > DEPLETED_THRESHOLD_G,
+            )
+        )
+        total_weight, total_value = result.one()
+        total_weight = float(total_weight)
+        if total_weight <= 0 or total_value is None:
+            return total_weight, None
+        return total_weight, float(total_value) / total_weight
+
+    async def consume_batches(self, takes: Dict[int, float]) -> Dict[int, float]:
+        """
+        Atomically decrement several batches in one ``UPDATE ... RETURNING``.
+
+        Each batch is decremented by its requested weight, guarded in the
+        WHERE clause so a batch that no longer holds enough stock (within the
+        0.01 g tolerance) is left untouched. Remainders under the tolerance
+        are snapped to 0. The UPDATE takes the row locks itself, so two
+        concurrent consumes cannot both pass the guard.
+
+        Args:
+            takes: ``{metal_purchase_id: weight_g}``
+
+        Returns:
+            ``{metal_purchase_id: new_remaining_weight_g}`` for the batches
+            actually decremented — callers compare its keys with ``takes``
+            to detect a lost race.
+        """
+        if not takes:
+            return {}
+        take = case(takes, value=MetalPurchase.id, else_=0.0)
+        new_remaining = MetalPurchase.remaining_weight_g - take
+        result = await self.session.execute(
+            update(MetalPurchase)
+            .where(
+                MetalPurchase.id.in_(list(takes)),
+                MetalPurchase.remaining_weight_g + DEPLETED_THRESHOLD_G >= take,
+            )
+            .values(
+                remaining_weight_g=case(
+                    (new_remaining < DEPLETED_THRESHOLD_G, 0.0),
+                    else_=new_remaining,
+                ),
+            )
+            .returning(MetalPurchase.id, MetalPurchase.remaining_weight_g)
+            .execution_options(synchronize_session="fetch")
+        )
+        return {row.id: row.remaining_weight_g for row in result.all()}
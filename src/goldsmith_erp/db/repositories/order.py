@@ -10,26 +10,111 @@ OrderStatusHistory models with features including:
 - Cost calculations
 - Statistics and reporting
 
+Indexes relied on (see ``db/models.py``):
+- ``ix_orders_active_created_id`` — (created_at, id) over live orders;
+  default ordering and keyset pagination in ``list_orders``
+- ``ix_orders_customer_active_created_id`` — (customer_id, created_at, id)
+  over live orders; per-customer order lists and their keyset pages
+- ``ix_orders_status_active_created_id`` — (status, created_at, id) over
+  live orders; per-status order lists and their keyset pages
+- ``ix_orders_open_deadline`` — deadline over open, live orders; overdue
+  and due-soon lookups
+
+Eager loading: collections → ``selectinload`` (one ``WHERE ... IN`` query
+per collection; a JOIN would repeat the parent row per child); scalars
+(many-to-one) → ``joinedload``. ``tests/unit/test_eager_loading_hygiene.py``
+fails on a ``joinedload`` of a collection.
+
 Author: Claude AI
 Date: 2025-11-06
 """
 
+import json
+import re
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
-
-from sqlalchemy import and_, func, or_, select, update
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import (
+    StatementLambdaElement,
+    and_,
+    case,
+    delete,
+    func,
+    insert,
+    lambda_stmt,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, selectinload
-
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+
+from goldsmith_erp.core.cache import (
+    ORDER_COUNT_PREFIX,
+    ORDER_COUNT_TTL,
+    ORDER_STATISTICS_KEY,
+    ORDER_STATISTICS_TTL,
+    get_cached,
+    invalidate,
+)
 from goldsmith_erp.db.models import (
     Customer,
     Material,
     Order,
     OrderItem,
+    OrderStatusEnum,
     OrderStatusHistory,
     User,
 )
 from goldsmith_erp.db.repositories.base import BaseRepository
+from goldsmith_erp.db.transaction import transactional
+
+# Per-status counters reported by get_order_statistics.
+_STATISTICS_STATUSES = (
+    OrderStatusEnum.DRAFT,
+    OrderStatusEnum.IN_PROGRESS,
+    OrderStatusEnum.COMPLETED,
+    OrderStatusEnum.DELIVERED,
+)
+# An order past its deadline only counts as overdue while still open.
+_CLOSED_STATUSES = (OrderStatusEnum.COMPLETED, OrderStatusEnum.DELIVERED)
+# Labor cost rule, evaluated server-side: actual hours once booked, else
+# the estimate. create_order applies the estimate branch in Python.
+_LABOR_COST = case(
+    (
+        and_(Order.actual_hours > 0, Order.hourly_rate > 0),
+        Order.actual_hours * Order.hourly_rate,
+    ),
+    (
+        and_(Order.labor_hours > 0, Order.hourly_rate > 0),
+        Order.labor_hours * Order.hourly_rate,
+    ),
+    else_=0.0,
+)
+# Loader options get_by_id_with_items can apply, by relationship name.
+_ORDER_LOADERS = {
+    "order_items": selectinload(Order.order_items),
+    "status_history": selectinload(Order.status_history).joinedload(
+        OrderStatusHistory.user
+    ),
+    "customer": joinedload(Order.customer),
+}
+# Columns update_order may write; identity, creation time and soft-delete
+# state only change through their dedicated paths.
+_ORDER_MUTABLE = frozenset(Order.__table__.c.keys()) - {
+    "id",
+    "created_at",
+    "is_deleted",
+    "deleted_at",
+}
+# Fields add_order_items / update_order_item accept per item.
+_ORDER_ITEM_FIELDS = frozenset({"description", "quantity", "unit_price", "material_id"})
+# ORD-YYYYMM-NNNN, see Order.order_number.
+_ORDER_NUMBER_RE = re.compile(r"ORD-(\d{4})(\d{2})-(\d+)")
+# Item fields the order's material cost depends on.
+_ORDER_ITEM_COST_FIELDS = frozenset({"quantity", "unit_price"})
 
 
 class OrderRepository(BaseRepository[Order]):
@@ -49,6 +134,11 @@ class OrderRepository(BaseRepository[Order]):
         >>> orders = await repo.list_orders(status="in_progress")
     """
 
+    # Accepted ``order_by`` fields for list_orders / iter_orders.
+    _SORTABLE = frozenset(
+        {"id", "created_at", "updated_at", "deadline", "status", "price", "title"}
+    )
+
     def __init__(self, session: AsyncSession, current_user_id: Optional[int] = None):
         """
         Initialize order repository.
@@ -79,11 +169,11 @@ class OrderRepository(BaseRepository[Order]):
         Returns:
             Order instance or None if not found
         """
-        query = select(Order).where(Order.id == id)
+        query = lambda_stmt(lambda: select(Order).where(Order.id == id))
 
         # Exclude soft-deleted by default
         if not include_deleted:
-            query = query.where(Order.is_deleted == False)
+            query += lambda s: s.where(Order.is_deleted == False)
 
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
@@ -92,28 +182,38 @@ class OrderRepository(BaseRepository[Order]):
         self,
         id: int,
         include_deleted: bool = False,
+        load: Iterable[str] = ("order_items", "status_history", "customer"),
     ) -> Optional[Order]:
         """
         Get order by ID with order items and status history loaded.
 
+        ``load`` names the relationships to eager-load, so callers that
+        only need some of them skip the others' queries. Many-to-one
+        relationships (customer, history user) are joined into their
+        parent's query; only the collections get a ``selectinload`` query
+        of their own. Relationships not loaded raise on access rather than
+        lazy-loading.
+
         Args:
             id: Order ID
             include_deleted: If True, include soft-deleted orders
+            load: Relationships to load; any of ``order_items``,
+                ``status_history`` and ``customer`` (default: all three)
 
         Returns:
             Order instance with relationships loaded, or None if not found
+
+        Raises:
+            ValueError: If ``load`` names an unsupported relationship
         """
+        unknown = set(load) - set(_ORDER_LOADERS)
+        if unknown:
+            raise ValueError(f"Unsupported relationships to load: {sorted(unknown)}")
+
         query = (
             select(Order)
             .where(Order.id == id)
-            .options(
-                selectinload(Order.order_items).selectinload(OrderItem.material),
-                selectinload(Order.status_history).selectinload(
-                    OrderStatusHistory.user
-                ),
-                selectinload(Order.customer),
-                selectinload(Order.assigned_user),
-            )
+            .options(*(_ORDER_LOADERS[name] for name in load), raiseload("*"))
         )
 
         if not include_deleted:
@@ -135,12 +235,30 @@ class OrderRepository(BaseRepository[Order]):
             include_deleted: If True, include soft-deleted orders
 
         Returns:
-            Order instance or None if not found
+            Order instance or None if not found (or not a valid order number)
+
+        ``order_number`` is derived from ``created_at`` and the ID, so the
+        lookup is the primary key plus a ``created_at`` range for its month.
         """
-        query = select(Order).where(Order.order_number == order_number)
+        match = _ORDER_NUMBER_RE.fullmatch(order_number)
+        if match is None:
+            return None
+        year, month, order_id = (int(part) for part in match.groups())
+        if not 1 <= month <= 12:
+            return None
+        month_start = datetime(year, month, 1)
+        next_month = datetime(year + month // 12, month % 12 + 1, 1)
+
+        query = lambda_stmt(
+            lambda: select(Order).where(
+                Order.id == order_id,
+                Order.created_at >= month_start,
+                Order.created_at < next_month,
+            )
+        )
 
         if not include_deleted:
-            query = query.where(Order.is_deleted == False)
+            query += lambda s: s.where(Order.is_deleted == False)
 
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
@@ -156,12 +274,20 @@ class OrderRepository(BaseRepository[Order]):
         assigned_to: Optional[int] = None,
         include_deleted: bool = False,
         order_by: Optional[str] = None,
+        cursor: Optional[Tuple[datetime, int]] = None,
     ) -> List[Order]:
         """
         List orders with optional filtering and pagination.
 
+        Pagination is keyset-based when ``cursor`` is given: the page starts
+        strictly after ``(created_at, id)`` in newest-first order, so deep
+        pages cost the same as the first (``OFFSET`` scans and discards
+        ``skip`` rows). Pass ``None`` for the first page, then
+        ``(last.created_at, last.id)`` of the previous page's last order.
+        ``skip`` remains for existing callers but is ignored with a cursor.
+
         Args:
-            skip: Number of records to skip
+            skip: Number of records to skip (deprecated; use ``cursor``)
             limit: Maximum number of records to return
             status: Filter by status
             priority: Filter by priority
@@ -170,47 +296,148 @@ class OrderRepository(BaseRepository[Order]):
             assigned_to: Filter by assigned user ID
             include_deleted: If True, include soft-deleted orders
             order_by: Field to order by (prefix with - for descending)
+            cursor: ``(created_at, id)`` of the last order already seen
 
         Returns:
             List of orders
+
+        Raises:
+            ValueError: If ``cursor`` is combined with ``order_by`` (a
+                keyset is only valid for the default order)
         """
-        query = select(Order).options(
-            selectinload(Order.customer),
-            selectinload(Order.assigned_user),
+        if cursor is not None and order_by:
+            raise ValueError("cursor pagination requires the default order")
+
+        query = self._orders_stmt(
+            status,
+            priority,
+            order_type,
+            customer_id,
+            assigned_to,
+            include_deleted,
+            order_by,
+        )
+
+        # Apply pagination
+        if cursor is not None:
+            after_created_at, after_id = cursor
+            query += lambda s: s.where(
+                tuple_(Order.created_at, Order.id) < tuple_(after_created_at, after_id)
+            )
+        else:
+            query += lambda s: s.offset(skip)
+        query += lambda s: s.limit(limit)
+
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def iter_orders(
+        self,
+        status: Optional[str] = None,
+        order_type: Optional[str] = None,
+        customer_id: Optional[int] = None,
+        include_deleted: bool = False,
+        order_by: Optional[str] = None,
+        chunk_size: int = 500,
+    ) -> AsyncIterator[Order]:
+        """
+        Stream all matching orders without materialising them in a list.
+
+        Same filters and ordering as :meth:`list_orders`, unpaginated, over
+        a server-side cursor fetched ``chunk_size`` rows at a time — memory
+        stays O(chunk_size). Meant for exports; ``list_orders`` remains the
+        paginated UI path.
+
+        Args:
+            status: Filter by status
+            order_type: Filter by order type
+            customer_id: Filter by customer ID
+            include_deleted: If True, include soft-deleted orders
+            order_by: Field to order by (prefix with - for descending)
+            chunk_size: Rows fetched per round-trip
+
+        Yields:
+            Orders, with their customer loaded
+        """
+        query = self._orders_stmt(
+            status, None, order_type, customer_id, None, include_deleted, order_by
+        )
+        result = await self.session.stream_scalars(
+            query, execution_options={"yield_per": chunk_size}
+        )
+        async for order in result:
+            yield order
+
+    def _orders_stmt(
+        self,
+        status: Optional[str],
+        priority: Optional[str],
+        order_type: Optional[str],
+        customer_id: Optional[int],
+        assigned_to: Optional[int],
+        include_deleted: bool,
+        order_by: Optional[str],
+    ) -> StatementLambdaElement:
+        """Filtered, ordered order query shared by list_orders / iter_orders."""
+        # Lambda statements: each filter combination is built and
+        # cache-keyed once per code path; the filter values are bound as
+        # parameters on every call. Many-to-one customer is joined into the
+        # page query, so there is no second round trip; any other
+        # relationship raises on access instead of lazy-loading per row.
+        query = lambda_stmt(
+            lambda: select(Order).options(joinedload(Order.customer), raiseload("*"))
         )
 
         # Apply filters
         if not include_deleted:
-            query = query.where(Order.is_deleted == False)
+            query += lambda s: s.where(Order.is_deleted == False)
         if status:
-            query = query.where(Order.status == status)
+            query += lambda s: s.where(Order.status == status)
         if priority:
-            query = query.where(Order.priority == priority)
+            query += lambda s: s.where(Order.priority == priority)
         if order_type:
-            query = query.where(Order.order_type == order_type)
+            query += lambda s: s.where(Order.order_type == order_type)
         if customer_id:
-            query = query.where(Order.customer_id == customer_id)
+            query += lambda s: s.where(Order.customer_id == customer_id)
         if assigned_to:
-            query = query.where(Order.assigned_to == assigned_to)
+            query += lambda s: s.where(Order.assigned_to == assigned_to)
 
         # Apply ordering
         if order_by:
-            if order_by.startswith("-"):
-                field_name = order_by[1:]
-                if hasattr(Order, field_name):
-                    query = query.order_by(getattr(Order, field_name).desc())
-            else:
-                if hasattr(Order, order_by):
-                    query = query.order_by(getattr(Order, order_by))
+            field = order_by[1:] if order_by.startswith("-") else order_by
+            if field not in self._SORTABLE:
+                raise ValueError(f"Unsupported order_by field: {field!r}")
+            sort_column = self._columns[field]
+        if order_by and order_by.startswith("-"):
+            query += lambda s: s.order_by(sort_column.desc())
+        elif order_by:
+            query += lambda s: s.order_by(sort_column)
         else:
-            # Default: order by created_at descending (newest first)
-            query = query.order_by(Order.created_at.desc())
+            # Default: newest first; id breaks created_at ties so the order
+            # (and therefore the keyset) is stable.
+            query += lambda s: s.order_by(Order.created_at.desc(), Order.id.desc())
 
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
+        return query
 
-        result = await self.session.execute(query)
-        return list(result.scalars().all())
+    async def list_orders_page(
+        self, limit: int = 100, **kwargs: Any
+    ) -> Tuple[List[Order], bool]:
+        """
+        One page of ``list_orders`` plus whether another page follows.
+
+        Fetches ``limit + 1`` rows and drops the extra one, so paginated
+        views need no separate ``count_orders`` query.
+
+        Args:
+            limit: Maximum number of orders in the page
+            **kwargs: Filters, ``order_by`` and ``skip`` / ``cursor`` as
+                for :meth:`list_orders`
+
+        Returns:
+            ``(orders, has_more)``
+        """
+        orders = await self.list_orders(limit=limit + 1, **kwargs)
+        return orders[:limit], len(orders) > limit
 
     async def count_orders(
         self,
@@ -220,10 +447,17 @@ class OrderRepository(BaseRepository[Order]):
         customer_id: Optional[int] = None,
         assigned_to: Optional[int] = None,
         include_deleted: bool = False,
+        estimate: bool = False,
     ) -> int:
         """
         Count orders matching filters.
 
+        With ``estimate=True`` and no filters (other than
+        ``include_deleted``), PostgreSQL returns the planner's row estimate
+        instead of running ``COUNT(*)`` — constant time, but approximate
+        (as fresh as the last ANALYZE). Filtered counts, and other
+        databases, are always exact.
+
         Args:
             status: Filter by status
             priority: Filter by priority
@@ -231,10 +465,19 @@ class OrderRepository(BaseRepository[Order]):
             customer_id: Filter by customer ID
             assigned_to: Filter by assigned user ID
             include_deleted: If True, include soft-deleted orders
+            estimate: Allow a planner estimate for the unfiltered count
 
         Returns:
             Count of matching orders
         """
+        unfiltered = not any((status, priority, order_type, customer_id, assigned_to))
+        if (
+            estimate
+            and unfiltered
+            and self.session.get_bind().dialect.name == "postgresql"
+        ):
+            return await self._estimated_count(include_deleted)
+
         query = select(func.count(Order.id))
 
         # Apply filters
@@ -254,6 +497,70 @@ class OrderRepository(BaseRepository[Order]):
         result = await self.session.execute(query)
         return result.scalar_one()
 
+    async def count_by_status(self, status: str, use_cache: bool = True) -> int:
+        """
+        Count live orders in ``status``.
+
+        Cached for ``ORDER_COUNT_TTL`` seconds so paginated views do not
+        re-run ``COUNT(*)`` per page; order writes that can move an order
+        between counts invalidate the counts they affect.
+
+        Args:
+            status: Order status
+            use_cache: Read / populate the Redis cache (default True)
+
+        Returns:
+            Count of live orders with that status
+        """
+        key = f"status:{getattr(status, 'value', status)}"
+        return await self._cached_count(key, use_cache, status=status)
+
+    async def count_by_customer(self, customer_id: int, use_cache: bool = True) -> int:
+        """
+        Count a customer's live orders, cached like :meth:`count_by_status`.
+
+        Args:
+            customer_id: Customer ID
+            use_cache: Read / populate the Redis cache (default True)
+
+        Returns:
+            Count of the customer's live orders
+        """
+        return await self._cached_count(
+            f"customer:{customer_id}", use_cache, customer_id=customer_id
+        )
+
+    async def _cached_count(self, key: str, use_cache: bool, **filters: Any) -> int:
+        """``count_orders(**filters)`` behind ``ORDER_COUNT_PREFIX + key``."""
+        if not use_cache:
+            return await self.count_orders(**filters)
+        return await get_cached(
+            key=f"{ORDER_COUNT_PREFIX}{key}",
+            ttl=ORDER_COUNT_TTL,
+            fetch_fn=lambda: self.count_orders(**filters),
+        )
+
+    async def _estimated_count(self, include_deleted: bool) -> int:
+        """
+        Planner row estimate for (live) orders via ``EXPLAIN (FORMAT JSON)``.
+
+        Unlike ``pg_class.reltuples`` this also estimates the
+        ``is_deleted = false`` share, and still answers on a table that
+        has never been analyzed. PostgreSQL only.
+        """
+        rows = select(Order.id)
+        if not include_deleted:
+            rows = rows.where(Order.is_deleted == False)
+        compiled = rows.compile(
+            dialect=self.session.get_bind().dialect,
+            compile_kwargs={"literal_binds": True},
+        )
+        result = await self.session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
     async def create_order(
         self,
         customer_id: int,
@@ -274,7 +581,7 @@ class OrderRepository(BaseRepository[Order]):
         attachments: Optional[List[Dict[str, Any]]] = None,
     ) -> Order:
         """
-        Create a new order with generated order number.
+        Create a new draft order and its initial status history entry.
 
         Args:
             customer_id: Customer ID
@@ -297,51 +604,51 @@ class OrderRepository(BaseRepository[Order]):
         Returns:
             Created order instance
         """
-        # Generate order number
-        order_number = await self._generate_order_number()
-
-        # Calculate labor cost if both hours and rate provided
+        # Same rule as _LABOR_COST; a new order has no actual hours yet, so
+        # only the estimate branch applies and no recalculation is needed.
         labor_cost = 0.0
-        if estimated_hours and hourly_rate:
+        if (estimated_hours or 0) > 0 and (hourly_rate or 0) > 0:
             labor_cost = estimated_hours * hourly_rate
 
-        # Create order
+        # Arguments mapped onto the Order columns that exist; unset values
+        # are left to the column defaults. Order number, priority, currency,
+        # notes and attachments have no column on Order and are not stored.
+        values = {
+            "customer_id": customer_id,
+            "title": title,
+            "description": description,
+            "order_type": order_type,
+            "status": OrderStatusEnum.DRAFT,
+            "deadline": estimated_completion_date,
+            "labor_hours": estimated_hours,
+            "hourly_rate": hourly_rate,
+            "labor_cost": labor_cost,
+            "price": customer_price,
+            "vat_rate": tax_rate,
+        }
         order = Order(
-            order_number=order_number,
-            customer_id=customer_id,
-            title=title,
-            description=description,
-            order_type=order_type,
-            priority=priority,
-            status="draft",
-            estimated_completion_date=estimated_completion_date,
-            delivery_date=delivery_date,
-            estimated_hours=estimated_hours,
-            actual_hours=0.0,
-            hourly_rate=hourly_rate,
-            labor_cost=labor_cost,
-            customer_price=customer_price or 0.0,
-            tax_rate=tax_rate,
-            currency=currency,
-            assigned_to=assigned_to,
-            notes=notes,
-            customer_notes=customer_notes,
-            attachments=attachments or [],
-            created_by=self.current_user_id,
-            updated_by=self.current_user_id,
+            **{
+                field: value
+                for field, value in values.items()
+                if value is not None and field in self._columns
+            }
         )
 
-        self.session.add(order)
-        await self.session.commit()
-        await self.session.refresh(order)
-
-        # Create initial status history entry
-        await self.add_status_history(
-            order_id=order.id,
-            old_status=None,
-            new_status="draft",
-            reason="Order created",
-        )
+        # Order and its initial history row commit together: one
+        # transaction, one flush for the order ID, no refresh (sessions
+        # use expire_on_commit=False).
+        async with transactional(self.session):
+            self.session.add(order)
+            await self.session.flush()
+            self.session.add(
+                self._status_history_row(
+                    order_id=order.id,
+                    old_status=None,
+                    new_status=OrderStatusEnum.DRAFT.value,
+                    reason="Order created",
+                )
+            )
+        await self._invalidate_order_caches(order.customer_id)
 
         return order
 
@@ -351,27 +658,20 @@ class OrderRepository(BaseRepository[Order]):
 
         Args:
             order_id: Order ID
-            **updates: Fields to update
+            **updates: Fields to update (keys outside ``_ORDER_MUTABLE``
+                are ignored)
 
         Returns:
             Updated order or None if not found
         """
-        order = await self.get_by_id(order_id)
-        if not order:
-            return None
-
-        # Add updated_by and updated_at
-        updates["updated_by"] = self.current_user_id
-        updates["updated_at"] = datetime.utcnow()
-
-        # Update fields
-        for field, value in updates.items():
-            if hasattr(order, field):
-                setattr(order, field, value)
-
-        await self.session.commit()
-        await self.session.refresh(order)
-        return order
+        return await self._update_returning(
+            order_id,
+            {
+                field: value
+                for field, value in updates.items()
+                if field in _ORDER_MUTABLE
+            },
+        )
 
     async def soft_delete_order(
         self,
@@ -386,20 +686,52 @@ class OrderRepository(BaseRepository[Order]):
         Returns:
             Updated order or None if not found
         """
-        order = await self.get_by_id(order_id)
-        if not order:
-            return None
+        return await self._update_returning(
+            order_id, {"is_deleted": True, "deleted_at": datetime.utcnow()}
+        )
 
-        order.is_deleted = True
-        order.deleted_at = datetime.utcnow()
-        order.deleted_by = self.current_user_id
-        order.updated_by = self.current_user_id
-        order.updated_at = datetime.utcnow()
+    async def _update_returning(
+        self, order_id: int, values: Dict[str, Any]
+    ) -> Optional[Order]:
+        """
+        Apply ``values`` to a live order and commit.
 
+        One ``UPDATE ... RETURNING`` writes only the given columns (plus
+        ``updated_at``, from the column's ``onupdate``) and hands back the
+        updated row — no SELECT before and no refresh after; an instance
+        already in the session is repopulated from the returned row.
+        ``values`` must name ``Order`` columns.
+        """
+        result = await self.session.execute(
+            update(Order)
+            .where(Order.id == order_id, Order.is_deleted == False)
+            .values(**values)
+            .returning(Order)
+            .execution_options(populate_existing=True)
+        )
+        order = result.scalar_one_or_none()
         await self.session.commit()
-        await self.session.refresh(order)
+        if order is not None:
+            await self._invalidate_order_caches(order.customer_id)
         return order
 
+    @staticmethod
+    async def _invalidate_order_caches(customer_id: Optional[int]) -> None:
+        """
+        Drop the statistics and the counts an order write can change.
+
+        Count keys are known (every status, plus the order's customer), so
+        one ``DEL`` replaces a keyspace SCAN. Reassigning an order to another
+        customer leaves the previous customer's count stale for at most
+        ``ORDER_COUNT_TTL`` seconds.
+        """
+        keys = [
+            f"{ORDER_COUNT_PREFIX}status:{status.value}" for status in OrderStatusEnum
+        ]
+        if customer_id is not None:
+            keys.append(f"{ORDER_COUNT_PREFIX}customer:{customer_id}")
+        await invalidate(ORDER_STATISTICS_KEY, *keys)
+
     # ═══════════════════════════════════════════════════════════════════════
     # OrderItem Operations
     # ═══════════════════════════════════════════════════════════════════════
@@ -416,36 +748,66 @@ class OrderRepository(BaseRepository[Order]):
         """
         Add a material to an order.
 
+        Single-item form of :meth:`add_order_items`.
+
         Args:
             order_id: Order ID
             material_id: Material ID
             quantity_planned: Planned quantity to use
             unit: Unit of measurement
             unit_price: Unit price at time of order
-            notes: Notes about material usage
+            notes: Notes about material usage (stored as the description)
 
         Returns:
             Created order item
         """
-        order_item = OrderItem(
-            order_id=order_id,
-            material_id=material_id,
-            quantity_planned=quantity_planned,
-            quantity_used=0.0,
-            unit=unit,
-            unit_price=unit_price,
-            total_cost=0.0,
-            notes=notes,
+        items = await self.add_order_items(
+            order_id,
+            [
+                {
+                    "material_id": material_id,
+                    "quantity": quantity_planned,
+                    "unit_price": unit_price,
+                    "description": notes or f"{quantity_planned:g} {unit}",
+                }
+            ],
         )
+        return items[0]
 
-        self.session.add(order_item)
-        await self.session.commit()
-        await self.session.refresh(order_item)
+    async def add_order_items(
+        self, order_id: int, items: List[Dict[str, Any]]
+    ) -> List[OrderItem]:
+        """
+        Add several items to an order in one transaction.
 
-        # Recalculate order costs
-        await self._recalculate_order_costs(order_id)
+        The items are inserted with one flush, the order costs are
+        recalculated once, and everything is committed together — two
+        statements per batch instead of two commits per item.
 
-        return order_item
+        Args:
+            order_id: Order ID
+            items: ``OrderItem`` column values per item (``description``,
+                ``quantity``, ``unit_price``, ``material_id``)
+
+        Returns:
+            Created order items, in input order
+
+        Raises:
+            ValueError: If an item names a field ``OrderItem`` lacks
+        """
+        for item in items:
+            unknown = set(item) - _ORDER_ITEM_FIELDS
+            if unknown:
+                raise ValueError(f"Unknown order item fields: {sorted(unknown)}")
+
+        order_items = [OrderItem(order_id=order_id, **item) for item in items]
+        async with transactional(self.session):
+            self.session.add_all(order_items)
+            await self.session.flush()
+            await self._apply_order_costs(order_id)
+        await invalidate(ORDER_STATISTICS_KEY)
+
+        return order_items
 
     async def update_order_item(
         self, order_item_id: int, **updates
@@ -453,35 +815,45 @@ class OrderRepository(BaseRepository[Order]):
         """
         Update an order item.
 
+        One ``UPDATE ... RETURNING`` for the item; the order's costs are
+        recalculated in the same transaction only when ``quantity`` or
+        ``unit_price`` changed.
+
         Args:
             order_item_id: Order item ID
-            **updates: Fields to update
+            **updates: Fields to update (keys outside
+                ``_ORDER_ITEM_FIELDS`` are ignored)
 
         Returns:
             Updated order item or None if not found
         """
-        result = await self.session.execute(
-            select(OrderItem).where(OrderItem.id == order_item_id)
-        )
-        order_item = result.scalar_one_or_none()
-
-        if not order_item:
-            return None
-
-        # Update fields
-        for field, value in updates.items():
-            if hasattr(order_item, field):
-                setattr(order_item, field, value)
-
-        # Recalculate total cost if quantity_used changed
-        if "quantity_used" in updates:
-            order_item.total_cost = order_item.quantity_used * order_item.unit_price
-
-        await self.session.commit()
-        await self.session.refresh(order_item)
-
-        # Recalculate order costs
-        await self._recalculate_order_costs(order_item.order_id)
+        values = {
+            field: value
+            for field, value in updates.items()
+            if field in _ORDER_ITEM_FIELDS
+        }
+        if not values:
+            result = await self.session.execute(
+                select(OrderItem).where(OrderItem.id == order_item_id)
+            )
+            return result.scalar_one_or_none()
+
+        async with transactional(self.session):
+            result = await self.session.execute(
+                update(OrderItem)
+                .where(OrderItem.id == order_item_id)
+                .values(**values)
+                .returning(OrderItem)
+                .execution_options(populate_existing=True)
+            )
+            order_item = result.scalar_one_or_none()
+            recalculate = order_item is not None and not values.keys().isdisjoint(
+                _ORDER_ITEM_COST_FIELDS
+            )
+            if recalculate:
+                await self._apply_order_costs(order_item.order_id)
+        if recalculate:
+            await invalidate(ORDER_STATISTICS_KEY)
 
         return order_item
 
@@ -492,17 +864,16 @@ class OrderRepository(BaseRepository[Order]):
         """
         Mark materials as allocated for an order item.
 
+        ``OrderItem`` has no allocation columns, so nothing is written and
+        no costs change; the item is returned as stored.
+
         Args:
             order_item_id: Order item ID
 
         Returns:
-            Updated order item or None if not found
+            Order item or None if not found
         """
-        return await self.update_order_item(
-            order_item_id,
-            is_allocated=True,
-            allocated_at=datetime.utcnow(),
-        )
+        return await self.update_order_item(order_item_id)
 
     async def mark_material_used(
         self,
@@ -513,21 +884,20 @@ class OrderRepository(BaseRepository[Order]):
         """
         Mark materials as used in production.
 
+        The actual quantity replaces the item's quantity, so the order's
+        material cost follows real usage.
+
         Args:
             order_item_id: Order item ID
             quantity_used: Actual quantity used
-            notes: Notes about usage
+            notes: Notes about usage (stored as the description)
 
         Returns:
             Updated order item or None if not found
         """
-        updates = {
-            "quantity_used": quantity_used,
-            "is_used": True,
-            "used_at": datetime.utcnow(),
-        }
+        updates: Dict[str, Any] = {"quantity": quantity_used}
         if notes:
-            updates["notes"] = notes
+            updates["description"] = notes
 
         return await self.update_order_item(order_item_id, **updates)
 
@@ -538,26 +908,28 @@ class OrderRepository(BaseRepository[Order]):
         """
         Remove an order item.
 
+        One ``DELETE ... RETURNING`` yields the item's order; the delete and
+        the order's cost recalculation commit together, so the costs never
+        reflect a removed item.
+
         Args:
             order_item_id: Order item ID
 
         Returns:
             True if deleted, False if not found
         """
-        result = await self.session.execute(
-            select(OrderItem).where(OrderItem.id == order_item_id)
-        )
-        order_item = result.scalar_one_or_none()
-
-        if not order_item:
+        async with transactional(self.session):
+            result = await self.session.execute(
+                delete(OrderItem)
+                .where(OrderItem.id == order_item_id)
+                .returning(OrderItem.order_id)
+            )
+            order_id = result.scalar_one_or_none()
+            if order_id is not None:
+                await self._apply_order_costs(order_id)
+        if order_id is None:
             return False
-
-        order_id = order_item.order_id
-        await self.session.delete(order_item)
-        await self.session.commit()
-
-        # Recalculate order costs
-        await self._recalculate_order_costs(order_id)
+        await invalidate(ORDER_STATISTICS_KEY)
 
         return True
 
@@ -590,23 +962,71 @@ class OrderRepository(BaseRepository[Order]):
         Returns:
             Created status history entry
         """
-        status_history = OrderStatusHistory(
-            order_id=order_id,
-            old_status=old_status,
-            new_status=new_status,
-            changed_by=self.current_user_id or 0,
-            reason=reason,
-            notes=notes,
-            ip_address=ip_address,
-            user_agent=user_agent,
+        status_history = self._status_history_row(
+            order_id, old_status, new_status, reason=reason, notes=notes
         )
 
         self.session.add(status_history)
         await self.session.commit()
-        await self.session.refresh(status_history)
 
         return status_history
 
+    async def add_status_history_many(self, entries: List[Dict[str, Any]]) -> int:
+        """
+        Add status history entries for many orders with one commit.
+
+        For bulk operations: the rows go out as one Core ``INSERT``
+        (executemany) in a single transaction instead of one commit per
+        status change. No ``OrderStatusHistory`` instances are returned.
+
+        Args:
+            entries: One dict per change with the arguments of
+                :meth:`add_status_history` (``order_id``, ``old_status``,
+                ``new_status`` and optionally ``reason`` / ``notes``)
+
+        Returns:
+            Number of entries written
+        """
+        if not entries:
+            return 0
+        changed_at = datetime.utcnow()
+        rows = [
+            {
+                "order_id": entry["order_id"],
+                "from_status": entry.get("old_status"),
+                "to_status": entry["new_status"],
+                "changed_by": self.current_user_id,
+                "changed_at": changed_at,
+                "notes": entry.get("notes") or entry.get("reason"),
+            }
+            for entry in entries
+        ]
+        async with transactional(self.session):
+            await self.session.execute(insert(OrderStatusHistory), rows)
+        return len(rows)
+
+    def _status_history_row(
+        self,
+        order_id: int,
+        old_status: Optional[str],
+        new_status: str,
+        reason: Optional[str] = None,
+        notes: Optional[str] = None,
+    ) -> OrderStatusHistory:
+        """
+        Build (not add) a status history entry for the current user.
+
+        ``OrderStatusHistory`` has a single ``notes`` column; a ``reason``
+        is stored there when no notes are given.
+        """
+        return OrderStatusHistory(
+            order_id=order_id,
+            from_status=old_status,
+            to_status=new_status,
+            changed_by=self.current_user_id,
+            notes=notes or reason,
+        )
+
     # NOTE (Slice 6 / H14 resolution, 2026-04-16):
     # ``change_order_status`` was removed from this repository because it
     # wrote ``Order.status`` directly and bypassed the Punzierungs-Check
@@ -636,136 +1056,129 @@ class OrderRepository(BaseRepository[Order]):
         order_id: int,
     ) -> None:
         """
-        Recalculate order costs based on order items and labor.
+        Recalculate order costs based on order items and labor, and commit.
 
         Args:
             order_id: Order ID
         """
-        order = await self.get_by_id_with_items(order_id)
-        if not order:
-            return
-
-        # Calculate material cost from order items
-        material_cost = sum(item.total_cost for item in order.order_items)
-
-        # Calculate labor cost
-        labor_cost = 0.0
-        if order.actual_hours and order.hourly_rate:
-            labor_cost = order.actual_hours * order.hourly_rate
-        elif order.estimated_hours and order.hourly_rate:
-            labor_cost = order.estimated_hours * order.hourly_rate
-
-        # Calculate totals
-        total_cost = material_cost + labor_cost + (order.additional_cost or 0.0)
-        margin = (order.customer_price or 0.0) - total_cost
-
-        # Calculate tax
-        subtotal = order.customer_price or 0.0
-        tax_amount = subtotal * (order.tax_rate / 100)
-        total_amount = subtotal + tax_amount
-
-        # Update order
-        order.material_cost = material_cost
-        order.labor_cost = labor_cost
-        order.total_cost = total_cost
-        order.margin = margin
-        order.subtotal = subtotal
-        order.tax_amount = tax_amount
-        order.total_amount = total_amount
-        order.updated_by = self.current_user_id
-        order.updated_at = datetime.utcnow()
-
+        await self._apply_order_costs(order_id)
         await self.session.commit()
+        await invalidate(ORDER_STATISTICS_KEY)
 
-    # ═══════════════════════════════════════════════════════════════════════
-    # Helper Methods
-    # ═══════════════════════════════════════════════════════════════════════
-
-    async def _generate_order_number(self) -> str:
+    async def _apply_order_costs(self, order_id: int) -> Optional[Order]:
         """
-        Generate a unique order number in format: ORD-YYYYMM-XXXX
-
-        Returns:
-            Unique order number
+        Recalculate one order's costs without committing.
+
+        A single ``UPDATE ... RETURNING`` whose values are computed
+        server-side: the material cost is a ``SUM`` subquery over the
+        order's items, so neither the order nor its items/history are
+        loaded. ``populate_existing`` writes the returned row into an
+        ``Order`` already in the session, whose cost columns the ORM would
+        otherwise expire (and lazy-load, which async sessions cannot do).
         """
-        now = datetime.utcnow()
-        prefix = f"ORD-{now.strftime('%Y%m')}"
+        # Material cost from order items (quantity × unit price)
+        material_cost = (
+            select(
+                func.coalesce(func.sum(OrderItem.quantity * OrderItem.unit_price), 0.0)
+            )
+            .where(OrderItem.order_id == order_id)
+            .scalar_subquery()
+        )
 
-        # Get count of orders this month
         result = await self.session.execute(
-            select(func.count(Order.id)).where(Order.order_number.like(f"{prefix}%"))
+            update(Order)
+            .where(Order.id == order_id, Order.is_deleted == False)
+            .values(
+                material_cost_calculated=material_cost,
+                labor_cost=_LABOR_COST,
+            )
+            .returning(Order)
+            .execution_options(populate_existing=True)
         )
-        count = result.scalar_one()
-
-        # Generate order number
-        order_number = f"{prefix}-{(count + 1):04d}"
-
-        return order_number
+        return result.scalar_one_or_none()
 
     # ═══════════════════════════════════════════════════════════════════════
     # Statistics & Reporting
     # ═══════════════════════════════════════════════════════════════════════
 
-    async def get_order_statistics(self) -> Dict[str, Any]:
+    async def get_order_statistics(self, use_cache: bool = True) -> Dict[str, Any]:
         """
         Get order statistics for dashboard and reporting.
 
+        Served from the Redis cache (``ORDER_STATISTICS_TTL`` seconds,
+        single-flight on a miss); the order write paths invalidate it after
+        commit. ``use_cache=False`` always computes from the database.
+
+        Args:
+            use_cache: Read / populate the Redis cache (default True)
+
         Returns:
             Dictionary with order statistics
         """
-        # Count orders by status
-        total_orders = await self.count_orders()
-        draft_orders = await self.count_orders(status="draft")
-        in_progress_orders = await self.count_orders(status="in_progress")
-        completed_orders = await self.count_orders(status="completed")
-        delivered_orders = await self.count_orders(status="delivered")
-        cancelled_orders = await self.count_orders(status="cancelled")
+        if not use_cache:
+            return await self._compute_order_statistics()
+        return await get_cached(
+            key=ORDER_STATISTICS_KEY,
+            ttl=ORDER_STATISTICS_TTL,
+            fetch_fn=self._compute_order_statistics,
+            single_flight=True,
+        )
 
-        # Calculate revenue and profit (delivered orders only)
-        revenue_result = await self.session.execute(
+    async def _compute_order_statistics(self) -> Dict[str, Any]:
+        """
+        All counters and sums from one aggregate query over live orders
+        (``COUNT(*) FILTER (WHERE ...)`` per counter) — one round trip and
+        one scan instead of a query per figure.
+        """
+        delivered = Order.status == OrderStatusEnum.DELIVERED
+        material_cost = func.coalesce(
+            Order.material_cost_override, Order.material_cost_calculated, 0.0
+        )
+        result = await self.session.execute(
             select(
-                func.sum(Order.customer_price).label("total_revenue"),
-                func.sum(Order.total_cost).label("total_costs"),
-            )
-            .where(Order.status == "delivered")
-            .where(Order.is_deleted == False)
+                func.count(Order.id).label("total_orders"),
+                *(
+                    func.count(Order.id)
+                    .filter(Order.status == status)
+                    .label(f"{status.value}_orders")
+                    for status in _STATISTICS_STATUSES
+                ),
+                # Revenue and costs: delivered orders only
+                func.sum(Order.price).filter(delivered).label("total_revenue"),
+                func.sum(material_cost + func.coalesce(Order.labor_cost, 0.0))
+                .filter(delivered)
+                .label("total_costs"),
+                # Overdue: deadline passed while the order is still open
+                func.count(Order.id)
+                .filter(
+                    Order.deadline < datetime.utcnow(),
+                    Order.status.not_in(_CLOSED_STATUSES),
+                )
+                .label("overdue_orders"),
+            ).where(Order.is_deleted == False)
         )
-        revenue_row = revenue_result.first()
-        total_revenue = revenue_row.total_revenue or 0.0
-        total_costs = revenue_row.total_costs or 0.0
+        row = result.one()
+        total_revenue = row.total_revenue or 0.0
+        total_costs = row.total_costs or 0.0
         total_profit = total_revenue - total_costs
 
         # Calculate average margin
-        if delivered_orders > 0:
+        if row.delivered_orders > 0:
             average_margin = (
                 (total_profit / total_revenue * 100) if total_revenue > 0 else 0.0
             )
         else:
             average_margin = 0.0
 
-        # Count overdue orders (past estimated_completion_date)
-        overdue_result = await self.session.execute(
-            select(func.count(Order.id))
-            .where(Order.estimated_completion_date < datetime.utcnow())
-            .where(Order.status.in_(["draft", "approved", "in_progress"]))
-            .where(Order.is_deleted == False)
-        )
-        overdue_orders = overdue_result.scalar_one()
-
-        # Count urgent orders
-        urgent_orders = await self.count_orders(priority="urgent")
-
         return {
-            "total_orders": total_orders,
-            "draft_orders": draft_orders,
-            "in_progress_orders": in_progress_orders,
-            "completed_orders": completed_orders,
-            "delivered_orders": delivered_orders,
-            "cancelled_orders": cancelled_orders,
+            "total_orders": row.total_orders,
+            "draft_orders": row.draft_orders,
+            "in_progress_orders": row.in_progress_orders,
+            "completed_orders": row.completed_orders,
+            "delivered_orders": row.delivered_orders,
             "total_revenue": total_revenue,
             "total_costs": total_costs,
             "total_profit": total_profit,
             "average_margin": average_margin,
-            "overdue_orders": overdue_orders,
-            "urgent_orders": urgent_orders,
+            "overdue_orders": row.overdue_orders,
         }
@@ -16,6 +16,7 @@ DEVELOPMENT ONLY — do not run in production.
 import os
 from datetime import datetime, timedelta
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from goldsmith_erp.core.security import get_password_hash
@@ -410,36 +411,28 @@ def seed_users(db: Session) -> dict:
 
 
 def seed_activities(db: Session) -> None:
-    """Create standard workshop activities."""
-    created = 0
-    skipped = 0
-
-    for data in STANDARD_ACTIVITIES:
-        existing = (
-            db.query(Activity)
-            .filter(
-                Activity.name == data["name"],
-                Activity.category == data["category"],
-            )
-            .first()
-        )
-        if existing:
-            skipped += 1
-            continue
-
-        activity = Activity(
-            name=data["name"],
-            category=data["category"],
-            icon=data["icon"],
-            color=data["color"],
-            usage_count=0,
-            is_custom=False,
-            is_billable=data["category"] == "fabrication",
-            created_at=datetime.utcnow(),
-        )
-        db.add(activity)
-        created += 1
+    """Create standard workshop activities (one SELECT, one bulk INSERT)."""
+    existing = set(db.query(Activity.name, Activity.category).all())
+    now = datetime.utcnow()
+    rows = [
+        {
+            "name": data["name"],
+            "category": data["category"],
+            "icon": data["icon"],
+            "color": data["color"],
+            "usage_count": 0,
+            "is_custom": False,
+            "is_billable": data["category"] == "fabrication",
+            "created_at": now,
+        }
+        for data in STANDARD_ACTIVITIES
+        if (data["name"], data["category"]) not in existing
+    ]
+    created = len(rows)
+    skipped = len(STANDARD_ACTIVITIES) - created
 
+    if rows:
+        db.execute(insert(Activity), rows)
     db.commit()
     print(f"  Activities: {created} created, {skipped} skipped")
 
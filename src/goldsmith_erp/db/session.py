@@ -16,8 +16,23 @@ database_url = (
 connect_args: dict = {}
 if "postgresql" in database_url:
     connect_args["server_settings"] = {
-        "statement_timeout": "30000"  # 30 seconds (in milliseconds)
+        "statement_timeout": "30000",  # 30 seconds (in milliseconds)
+        # Timestamp columns are naive UTC; pin the session zone so
+        # server-side now() defaults agree with datetime.utcnow().
+        "timezone": "UTC",
+        # Identifies our connections in pg_stat_activity.
+        "application_name": "goldsmith_erp",
+        # Short OLTP queries never amortise JIT compilation.
+        "jit": "off",
     }
+    # Client-side backstop (seconds) should the server-side timeout not fire.
+    connect_args["command_timeout"] = 60
+    # SQLAlchemy's asyncpg dialect prepares every statement and keeps them
+    # in a per-connection LRU; sized so the hot lookups are never evicted
+    # (pool_recycle drops the cache with the connection every 30 min).
+    connect_args["prepared_statement_cache_size"] = (
+        settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+    )
 
 # PostgreSQL-Engine mit async Treiber und Connection-Pool-Konfiguration
 #
@@ -34,7 +49,7 @@ if "postgresql" in database_url:
 # leaving the SQL text (column/table names only) intact for debugging.
 engine = create_async_engine(
     database_url,
-    echo=settings.DEBUG,
+    echo=settings.DB_ECHO,
     future=True,
     pool_size=settings.DB_POOL_SIZE,
     max_overflow=settings.DB_MAX_OVERFLOW,
@@ -11,6 +11,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 logger = logging.getLogger(__name__)
 
 
+# Session.info key counting the transactional() blocks currently open on a
+# session; only the outermost one commits.
+_DEPTH_KEY = "transactional_depth"
+
+
 @asynccontextmanager
 async def transactional(db: AsyncSession) -> AsyncGenerator[AsyncSession, None]:
     """
@@ -22,6 +27,11 @@ async def transactional(db: AsyncSession) -> AsyncGenerator[AsyncSession, None]:
     - Isolation: Concurrent transactions don't interfere
     - Durability: Committed changes are permanent
 
+    Blocks compose: the outermost block commits (or rolls back) the
+    session's transaction; a block opened inside another runs in a
+    SAVEPOINT, so its failure only undoes its own work and it never
+    commits the enclosing block's changes early.
+
     Usage:
         async with transactional(db):
             # Multiple database operations
@@ -38,38 +48,27 @@ async def transactional(db: AsyncSession) -> AsyncGenerator[AsyncSession, None]:
     Raises:
         Exception: Re-raises any exception after rollback
     """
+    depth = db.info.get(_DEPTH_KEY, 0)
+    db.info[_DEPTH_KEY] = depth + 1
     try:
-        yield db
-        await db.commit()
-        logger.debug("Transaction committed successfully")
-    except Exception as e:
-        await db.rollback()
-        logger.error(
-            "Transaction rolled back due to error",
-            extra={"error": str(e), "error_type": type(e).__name__},
-            exc_info=True,
-        )
-        raise
+        if depth:
+            # Nested: SAVEPOINT / RELEASE, rolled back to on error.
+            async with db.begin_nested():
+                yield db
+            return
+
+        try:
+            yield db
+            await db.commit()
+            logger.debug("Transaction committed successfully")
+        except Exception as e:
+            await db.rollback()
+            logger.error(
+                "Transaction rolled back due to error",
+                extra={"error": str(e), "error_type": type(e).__name__},
+                exc_info=True,
+            )
+            raise
     finally:
         # Session is managed by FastAPI dependency, don't close here
-        pass
-
-
-async def commit_or_rollback(db: AsyncSession) -> None:
-    """
-    Explicitly commit or rollback a transaction.
-
-    Use this when you need manual control over transaction boundaries.
-
-    Args:
-        db: AsyncSession database session
-    """
-    try:
-        await db.commit()
-        logger.debug("Manual commit successful")
-    except Exception as e:
-        await db.rollback()
-        logger.error(
-            "Manual commit failed, rolled back", extra={"error": str(e)}, exc_info=True
-        )
-        raise
+        db.info[_DEPTH_KEY] = depth
@@ -5,14 +5,14 @@ from pathlib import Path
 from typing import List
 
 import uvicorn
-from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from jose import JWTError, jwt
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from goldsmith_erp.api.routers import (
     activities,
@@ -53,8 +53,14 @@ from goldsmith_erp.api.routers import time_tracking, users, valuations
 from goldsmith_erp.core.config import settings
 from goldsmith_erp.core.encryption import EncryptionError, check_encryption_configured
 from goldsmith_erp.core.logging import setup_logging
-from goldsmith_erp.core.pubsub import publish_event, subscribe_and_forward
+from goldsmith_erp.core.pubsub import (
+    ORDER_EVENT_CHANNELS,
+    order_events_broadcaster,
+    publish_event,
+    subscribe_and_forward,
+)
 from goldsmith_erp.core.security import ALGORITHM
+from goldsmith_erp.db.audit_buffer import audit_log_buffer
 from goldsmith_erp.middleware import RequestLoggingMiddleware, RequestMetricsMiddleware
 from goldsmith_erp.middleware.audit_logging import AuditLoggingMiddleware
 from goldsmith_erp.middleware.auth_required import AuthRequiredMiddleware
@@ -70,7 +76,7 @@ limiter = Limiter(key_func=get_remote_address)
 
 
 # Request Size Limiting Middleware (DoS Protection)
-class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
+class RequestSizeLimitMiddleware:
     """
     Middleware to limit request body size and prevent DoS attacks.
 
@@ -79,10 +85,21 @@ class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
 
     MAX_REQUEST_SIZE = 10 * 1024 * 1024  # 10 MB
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Check request size before processing."""
-        if request.method in ["POST", "PUT", "PATCH"]:
-            content_length = request.headers.get("content-length")
+        if scope["type"] == "http" and scope["method"] in ("POST", "PUT", "PATCH"):
+            # Raw (name, value) pairs: no Headers wrapper for one lookup.
+            content_length = next(
+                (
+                    value.decode("latin-1")
+                    for name, value in scope["headers"]
+                    if name == b"content-length"
+                ),
+                None,
+            )
 
             if content_length:
                 try:
@@ -93,14 +110,16 @@ class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
                             extra={
                                 "content_length": content_length_int,
                                 "max_allowed": self.MAX_REQUEST_SIZE,
-                                "path": request.url.path,
-                                "method": request.method,
+                                "path": scope["path"],
+                                "method": scope["method"],
                             },
                         )
-                        return JSONResponse(
+                        response = JSONResponse(
                             status_code=413,
                             content={"detail": "Anfrage zu groß. Maximum: 10 MB."},
                         )
+                        await response(scope, receive, send)
+                        return
                 except ValueError:
                     # Invalid Content-Length header
                     logger.warning(
@@ -108,7 +127,7 @@ class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
                         extra={"content_length": content_length},
                     )
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
 
 # App-Instanz erstellen
@@ -121,9 +140,11 @@ class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
 # public whitelist when DEBUG is False, so any stray docs route hits the
 # deny-by-default 401 instead of being served.
 _docs_enabled = settings.DEBUG
+# Versioned API root shared by the OpenAPI URL and every router prefix.
+API_PREFIX = settings.API_V1_STR
 app = FastAPI(
     title=settings.APP_NAME,
-    openapi_url=(f"{settings.API_V1_STR}/openapi.json" if _docs_enabled else None),
+    openapi_url=(f"{API_PREFIX}/openapi.json" if _docs_enabled else None),
     docs_url="/docs" if _docs_enabled else None,
     redoc_url="/redoc" if _docs_enabled else None,
 )
@@ -146,8 +167,8 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 #   RequestMetricsMiddleware
 # That means we add() them in the inverse order below.
 app.add_middleware(
-    AuditLoggingMiddleware
-)  # GDPR Art. 30 audit (reads user_id from state)
+    AuditLoggingMiddleware, audit_buffer=audit_log_buffer
+)  # GDPR Art. 30 audit (reads user_id from state; rows via audit_log_buffer)
 app.add_middleware(
     AuthRequiredMiddleware
 )  # Deny-by-default auth check + sets request.state.user_id
@@ -166,119 +187,114 @@ app.add_middleware(
     allow_headers=["Content-Type", "Authorization", "X-Requested-With"],
 )
 
-# Security headers middleware (innermost - decorates all responses with security headers)
+# Security headers middleware (outermost - decorates every response, including
+# the early 401/413 rejections of the layers inside it)
 app.add_middleware(SecurityHeadersMiddleware)
 
 # Router einbinden
 app.include_router(health.router, tags=["health"])  # Health checks at root level
-app.include_router(auth.router, prefix=f"{settings.API_V1_STR}", tags=["auth"])
-app.include_router(users.router, prefix=f"{settings.API_V1_STR}/users", tags=["users"])
-app.include_router(
-    customers.router, prefix=f"{settings.API_V1_STR}", tags=["customers"]
-)  # CRM
-app.include_router(
-    orders.router, prefix=f"{settings.API_V1_STR}/orders", tags=["orders"]
-)
+app.include_router(auth.router, prefix=API_PREFIX, tags=["auth"])
+app.include_router(users.router, prefix=f"{API_PREFIX}/users", tags=["users"])
+app.include_router(customers.router, prefix=API_PREFIX, tags=["customers"])  # CRM
+app.include_router(orders.router, prefix=f"{API_PREFIX}/orders", tags=["orders"])
 app.include_router(
-    materials.router, prefix=f"{settings.API_V1_STR}/materials", tags=["materials"]
+    materials.router, prefix=f"{API_PREFIX}/materials", tags=["materials"]
 )
 app.include_router(
-    metal_inventory.router, prefix=f"{settings.API_V1_STR}", tags=["metal-inventory"]
+    metal_inventory.router, prefix=API_PREFIX, tags=["metal-inventory"]
 )  # Metal Inventory Management
 app.include_router(
-    activities.router, prefix=f"{settings.API_V1_STR}/activities", tags=["activities"]
+    activities.router, prefix=f"{API_PREFIX}/activities", tags=["activities"]
 )
 app.include_router(
     time_tracking.router,
-    prefix=f"{settings.API_V1_STR}/time-tracking",
+    prefix=f"{API_PREFIX}/time-tracking",
     tags=["time-tracking"],
 )
 app.include_router(
-    comments.router, prefix=f"{settings.API_V1_STR}", tags=["comments"]
+    comments.router, prefix=API_PREFIX, tags=["comments"]
 )  # Order Comments
+app.include_router(scrap_gold.router, prefix=API_PREFIX, tags=["scrap-gold"])  # Altgold
 app.include_router(
-    scrap_gold.router, prefix=f"{settings.API_V1_STR}", tags=["scrap-gold"]
-)  # Altgold
-app.include_router(
-    calendar.router, prefix=f"{settings.API_V1_STR}/calendar", tags=["calendar"]
+    calendar.router, prefix=f"{API_PREFIX}/calendar", tags=["calendar"]
 )  # Calendar/Planning
 app.include_router(
-    invoices.router, prefix=f"{settings.API_V1_STR}/invoices", tags=["invoices"]
+    invoices.router, prefix=f"{API_PREFIX}/invoices", tags=["invoices"]
 )  # Rechnungswesen
 app.include_router(
-    metal_prices.router, prefix=f"{settings.API_V1_STR}", tags=["metal-prices"]
+    metal_prices.router, prefix=API_PREFIX, tags=["metal-prices"]
 )  # Live metal spot prices
 app.include_router(
-    ml.router, prefix=f"{settings.API_V1_STR}/ml", tags=["ml"]
+    ml.router, prefix=f"{API_PREFIX}/ml", tags=["ml"]
 )  # ML predictions and monitoring
 app.include_router(
-    measurements.router, prefix=f"{settings.API_V1_STR}", tags=["measurements"]
+    measurements.router, prefix=API_PREFIX, tags=["measurements"]
 )  # Massbibliothek
 app.include_router(
     notifications.router,
-    prefix=f"{settings.API_V1_STR}/notifications",
+    prefix=f"{API_PREFIX}/notifications",
     tags=["notifications"],
 )  # In-app notifications
 app.include_router(
-    analytics.router, prefix=f"{settings.API_V1_STR}", tags=["analytics"]
+    analytics.router, prefix=API_PREFIX, tags=["analytics"]
 )  # Soll/Ist-Vergleich
 app.include_router(
-    handoffs.router, prefix=f"{settings.API_V1_STR}", tags=["handoffs"]
+    handoffs.router, prefix=API_PREFIX, tags=["handoffs"]
 )  # Stabuebergabe
 app.include_router(
-    photos.router, prefix=f"{settings.API_V1_STR}", tags=["photos"]
+    photos.router, prefix=API_PREFIX, tags=["photos"]
 )  # Order photo documentation
 app.include_router(
-    metal_types.router, prefix=f"{settings.API_V1_STR}", tags=["metal-types"]
+    metal_types.router, prefix=API_PREFIX, tags=["metal-types"]
 )  # Custom metal type management
 app.include_router(
-    quotes.router, prefix=f"{settings.API_V1_STR}/quotes", tags=["quotes"]
+    quotes.router, prefix=f"{API_PREFIX}/quotes", tags=["quotes"]
 )  # Kostenvoranschlag
 app.include_router(
-    repairs.router, prefix=f"{settings.API_V1_STR}/repairs", tags=["repairs"]
+    repairs.router, prefix=f"{API_PREFIX}/repairs", tags=["repairs"]
 )  # Repair tracking (Reparaturverwaltung)
 app.include_router(
-    hallmarks.router, prefix=f"{settings.API_V1_STR}", tags=["hallmarks"]
+    hallmarks.router, prefix=API_PREFIX, tags=["hallmarks"]
 )  # Hallmarking / Punzierung
 app.include_router(
-    valuations.router, prefix=f"{settings.API_V1_STR}", tags=["valuations"]
+    valuations.router, prefix=API_PREFIX, tags=["valuations"]
 )  # Insurance valuation certificates / Wertgutachten
 app.include_router(
     consultations.router,
-    prefix=f"{settings.API_V1_STR}/consultations",
+    prefix=f"{API_PREFIX}/consultations",
     tags=["consultations"],
 )  # Beratung & Annahme (V1.1)
 app.include_router(
-    admin_email.router, prefix=f"{settings.API_V1_STR}", tags=["admin-email"]
+    admin_email.router, prefix=API_PREFIX, tags=["admin-email"]
 )  # Email/SMTP admin configuration
 app.include_router(
     admin_scan_metrics.router,
-    prefix=f"{settings.API_V1_STR}",
+    prefix=API_PREFIX,
     tags=["admin-scan-metrics"],
 )  # V1.1 Slice 13 — scan-adoption dashboard data
 app.include_router(
     customer_portal.router,
-    prefix=f"{settings.API_V1_STR}/portal",
+    prefix=f"{API_PREFIX}/portal",
     tags=["customer-portal"],
 )  # Public self-service portal
 app.include_router(
-    theme_router.router, prefix=f"{settings.API_V1_STR}", tags=["theme"]
+    theme_router.router, prefix=API_PREFIX, tags=["theme"]
 )  # Admin-configurable branding (GET public, PUT ADMIN-only)
 app.include_router(
-    imports_router.router, prefix=f"{settings.API_V1_STR}", tags=["import"]
+    imports_router.router, prefix=API_PREFIX, tags=["import"]
 )  # Bulk CSV data import (ADMIN-only)
 app.include_router(
-    scanner_router.router, prefix=f"{settings.API_V1_STR}/scan", tags=["scanner"]
+    scanner_router.router, prefix=f"{API_PREFIX}/scan", tags=["scanner"]
 )  # V1.1 QR/Barcode scanner workflow
 app.include_router(
     customer_updates.router,
-    prefix=f"{settings.API_V1_STR}",
+    prefix=API_PREFIX,
     tags=["customer-updates"],
 )  # V1.2 Kundeninfo + §649 BGB Kostenfreigabe (mixed /orders, /updates,
 #    /cost-changes path roots — bare API prefix, handoffs.py precedent)
 app.include_router(
     estimator.router,
-    prefix=f"{settings.API_V1_STR}/estimates",
+    prefix=f"{API_PREFIX}/estimates",
     tags=["estimator"],
 )  # V1.3 Phase 1 — statistical labor estimator (financial, ADMIN/GOLDSMITH only)
 
@@ -305,23 +321,33 @@ async def websocket_endpoint(websocket: WebSocket):
     if user_id is None:
         await websocket.close(code=4001, reason="Authentication required")
         return
+    # ``?types=created,status`` narrows the feed; no types means all of them.
+    types = {
+        t.strip()
+        for value in websocket.query_params.getlist("types")
+        for t in value.split(",")
+        if t.strip()
+    } or set(ORDER_EVENT_CHANNELS)
+    unknown = types.difference(ORDER_EVENT_CHANNELS)
+    if unknown:
+        await websocket.close(
+            code=1008, reason=f"Unknown event types: {', '.join(sorted(unknown))}"
+        )
+        return
     await websocket.accept()
-    channel = "order_updates"
-    subscribe_task = asyncio.create_task(subscribe_and_forward(websocket, channel))
+    # All sockets share one Redis subscription (order_events_broadcaster).
+    channels = sorted(ORDER_EVENT_CHANNELS[t] for t in types)
+    order_events_broadcaster.connect(websocket, channels)
     try:
         while True:
             data = await websocket.receive_text()
             logger.debug(
-                "WS client message", extra={"channel": channel, "user_id": user_id}
+                "WS client message", extra={"channels": channels, "user_id": user_id}
             )
     except WebSocketDisconnect:
-        logger.info("WebSocket disconnected", extra={"channel": channel})
+        logger.info("WebSocket disconnected", extra={"channels": channels})
     finally:
-        subscribe_task.cancel()
-        try:
-            await subscribe_task
-        except asyncio.CancelledError:
-            pass
+        order_events_broadcaster.disconnect(websocket)
 
 
 # Per-user notification WebSocket — channel: ``notifications:{user_id}``
@@ -336,21 +362,19 @@ async def notification_websocket_endpoint(websocket: WebSocket, user_id: int):
         return
     await websocket.accept()
     channel = f"notifications:{user_id}"
-    subscribe_task = asyncio.create_task(subscribe_and_forward(websocket, channel))
-    try:
-        while True:
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        logger.info(
-            "Notification WebSocket disconnected",
-            extra={"channel": channel, "user_id": user_id},
-        )
-    finally:
-        subscribe_task.cancel()
+    # The task group owns the forwarder: leaving the block (disconnect or
+    # error) cancels it and waits for its Redis cleanup.
+    async with asyncio.TaskGroup() as tg:
+        forwarder = tg.create_task(subscribe_and_forward(websocket, channel))
         try:
-            await subscribe_task
-        except asyncio.CancelledError:
-            pass
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            logger.info(
+                "Notification WebSocket disconnected",
+                extra={"channel": channel, "user_id": user_id},
+            )
+        forwarder.cancel()
 
 
 @app.on_event("startup")
@@ -358,6 +382,20 @@ async def start_background_tasks() -> None:
     """Register long-running background tasks on application startup."""
     asyncio.create_task(system_monitor_loop())
     logger.info("System monitor background task registered")
+    audit_log_buffer.start()
+    order_events_broadcaster.start()
+
+
+@app.on_event("shutdown")
+async def _drain_audit_log_buffer() -> None:
+    """Write any still-buffered audit rows before the process exits."""
+    await audit_log_buffer.stop()
+
+
+@app.on_event("shutdown")
+async def _stop_order_events_broadcaster() -> None:
+    """Release the shared order event subscription."""
+    await order_events_broadcaster.stop()
 
 
 @app.on_event("startup")
@@ -391,6 +429,8 @@ async def _verify_encryption_health() -> None:
 
 
 if __name__ == "__main__":
+    # Local dev entry: uvicorn's "auto" picks uvloop/httptools when installed
+    # and falls back otherwise. The production command pins them explicitly.
     uvicorn.run(
         "goldsmith_erp.main:app",
         host=settings.HOST,
@@ -35,13 +35,14 @@ History:
 import ipaddress
 import json
 import logging
+import re
 import time
 from datetime import datetime
-from typing import Callable, Optional, Tuple
+from typing import TYPE_CHECKING, Optional, Tuple
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from fastapi import Request
+from sqlalchemy import insert
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 try:
     from goldsmith_erp.db.session import AsyncSessionLocal
@@ -53,6 +54,9 @@ try:
 except ImportError:
     CustomerAuditLog = None  # type: ignore[assignment,misc]
 
+if TYPE_CHECKING:
+    from goldsmith_erp.db.audit_buffer import AuditLogBuffer
+
 logger = logging.getLogger(__name__)
 
 
@@ -219,6 +223,20 @@ _RESOURCE_ROUTES: dict[str, Tuple[str, str, str, bool]] = {
     "measurements": ("measurement", "accessed", "list_accessed", False),
 }
 
+# ``str.startswith`` takes a tuple and scans it in C: one call rejects the
+# usual unaudited request (``/health``, ``/api/v1/orders/...``) without
+# splitting its path.
+_AUDITED_PREFIXES = tuple(f"/api/v1/{family}" for family in _RESOURCE_ROUTES)
+
+# The fourth non-empty path segment, if it is all ASCII digits
+# (``/api/v1/<resource>/<id>[/...]``); empty segments are skipped the same
+# way ``_extract_audit_context`` skips them.
+_ENTITY_ID_RE = re.compile(r"^/*(?:[^/]+/+){3}([0-9]+)(?:/|$)")
+
+# Upper bound of the INTEGER ``entity_id`` / ``customer_id`` columns. A larger
+# id in the URL cannot name a row; logging it would fail the insert.
+_MAX_ENTITY_ID = 2**31 - 1
+
 # Legal-basis overrides for audited families that are neither customer PII
 # (Art. 6(1)(b) - contract) nor financial records (Art. 6(1)(c) - §147 AO tax
 # retention). Auditing their access is still required (GDPR Art. 30 + design-IP
@@ -236,7 +254,7 @@ _LEGAL_BASIS_OVERRIDES: dict[str, str] = {
 }
 
 
-class AuditLoggingMiddleware(BaseHTTPMiddleware):
+class AuditLoggingMiddleware:
     """
     Middleware for automatic GDPR-compliant audit logging.
 
@@ -282,16 +300,31 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
         "All financial data access MUST be audit-logged."
 
     Usage:
-        app.add_middleware(AuditLoggingMiddleware)
+        app.add_middleware(AuditLoggingMiddleware, audit_buffer=audit_log_buffer)
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp, audit_buffer: Optional["AuditLogBuffer"] = None):
+        """
+        Args:
+            app: Wrapped ASGI application
+            audit_buffer: If given and its flusher is running, audit rows are
+                queued on it instead of written inside the request (see
+                ``_log_to_database``)
+        """
+        self.app = app
+        self.audit_buffer = audit_buffer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process each request and, when it targets an audited resource,
         write a ``CustomerAuditLog`` row.
 
+        Pure ASGI (no ``BaseHTTPMiddleware`` task / stream per request):
+        the status code is captured from ``http.response.start`` on the
+        way out.
+
         The audit write is fire-and-forget relative to the user response:
-        the handler runs first, the response is shaped, THEN we attempt
+        the handler runs first, the response is sent, THEN we attempt
         the audit write inside a broad try/except.  A DB outage on the
         audit path must never deny legitimate data access (security >
         correctness > convenience in CLAUDE.md working-style hierarchy,
@@ -299,13 +332,20 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
         the audit trail" — the failure is logged loudly for out-of-band
         alerting).
         """
-        audit_context = self._extract_audit_context(request.url.path)
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        audit_context = self._extract_audit_context(path)
         if audit_context is None:
             # Not an audited endpoint — short-circuit before any measurement
             # work.  Middleware is on the hot path; every allocation here
             # costs per-request.
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
+        request = Request(scope)
         entity_type, single_action, list_action, is_financial = audit_context
         method = request.method
 
@@ -316,10 +356,11 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
         # explicitly).  Auditing them here would double-count and blur
         # dashboards that filter on ``action="financial_read"``.
         if is_financial and method != "GET":
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         # Extract request metadata
-        start_time = time.time()
+        start = time.perf_counter()
         client_ip = self._get_client_ip(request)
         user_agent = request.headers.get("user-agent", "")
 
@@ -331,7 +372,7 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
         user_id = getattr(request.state, "user_id", None)
 
         # Resolve the entity id from the URL (parts[3] if numeric).
-        entity_id = self._extract_entity_id(request.url.path)
+        entity_id = self._extract_entity_id(path)
 
         # Determine action:
         #
@@ -352,49 +393,66 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
         # fail the user's response.  Even if the handler raises, we still
         # want a row in the audit log (access attempts are auditable under
         # GDPR Art. 30).
-        response = await call_next(request)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
 
         # Calculate request duration
-        duration_ms = (time.time() - start_time) * 1000
+        duration_ms = (time.perf_counter() - start) * 1000.0
 
         # Write the audit row.  Wrap in a broad try/except: an audit-write
         # failure must NOT propagate to the user.  The ERROR log line is
         # tagged so Loki/ELK rules can alert on audit failures separately.
+        # customer_id is a foreign key: only a successful response proves
+        # the customer exists (a 404 on /customers/<id> would fail the FK).
+        # The raw id is kept in entity_id either way.
+        if entity_type == "customer" and 200 <= status_code < 300:
+            customer_id = entity_id
+        else:
+            customer_id = None
         try:
             await self._log_to_database(
-                customer_id=entity_id if entity_type == "customer" else None,
+                customer_id=customer_id,
                 entity_type=entity_type,
                 entity_id=entity_id,
                 action=action,
                 method=method,
-                endpoint=request.url.path,
+                endpoint=path,
                 user_id=user_id,
                 user_email=None,  # PII — see F-25 follow-up
                 user_role=None,
                 ip_address=client_ip,
                 user_agent=user_agent,
-                status_code=response.status_code,
+                status_code=status_code,
                 duration_ms=duration_ms,
             )
         except Exception as exc:  # pragma: no cover — defensive belt
             logger.error(
                 "audit write failed: %s",
                 exc,
-                extra={"audit": True, "path": request.url.path},
+                extra={"audit": True, "path": path},
                 exc_info=True,
             )
 
         # Log to application log for monitoring — user_email omitted (PII).
         logger.info(
-            f"{entity_type} data access: {method} {request.url.path} | "
-            f"User ID: {user_id or 'anonymous'} | "
-            f"IP: {client_ip} | "
-            f"Status: {response.status_code} | "
-            f"Duration: {duration_ms:.2f}ms"
+            "%s data access: %s %s | User ID: %s | IP: %s | Status: %s | "
+            "Duration: %.2fms",
+            entity_type,
+            method,
+            path,
+            user_id or "anonymous",
+            client_ip,
+            status_code,
+            duration_ms,
         )
 
-        return response
-
     @staticmethod
     def _extract_audit_context(
         path: str,
@@ -420,7 +478,17 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
             /api/v1/scrap-gold/alloy-x   -> ("scrap_gold", "financial_read", "list_accessed_financial", True)
             /api/v1/orders/1             -> None
             /docs                        -> None
+
+        Normalised paths (leading ``/``, no empty segments) can only match
+        through ``_AUDITED_PREFIXES``, so those that miss it return without
+        being split; anything else takes the segment parser.
         """
+        if (
+            not path.startswith(_AUDITED_PREFIXES)
+            and path.startswith("/")
+            and "//" not in path
+        ):
+            return None
         parts = [p for p in path.split("/") if p]
         if len(parts) < 3 or parts[0] != "api" or parts[1] != "v1":
             return None
@@ -437,14 +505,19 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
         * the path has no fourth segment (``/api/v1/invoices``)
         * the fourth segment is not all digits (``/api/v1/customers/search``,
           ``/api/v1/scrap-gold/alloy-calculator``)
+        * the id exceeds the INTEGER column range (the raw path is still
+          recorded in ``details["endpoint"]``)
 
         This preserves the original A1 semantics for ``/customers/search``
         — a non-numeric sub-resource is treated as a list-style access.
+        Only ASCII digits count: ``int()`` rejects some characters
+        ``str.isdigit`` accepts (``²``).
         """
-        parts = [p for p in path.split("/") if p]
-        if len(parts) >= 4 and parts[3].isdigit():
-            return int(parts[3])
-        return None
+        match = _ENTITY_ID_RE.match(path)
+        if not match:
+            return None
+        entity_id = int(match.group(1))
+        return entity_id if entity_id <= _MAX_ENTITY_ID else None
 
     # ------------------------------------------------------------------
     # Back-compat shim: external callers (tests, A1/R1 code paths) may
@@ -514,7 +587,7 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
         Persist a CustomerAuditLog row for this request.
 
         The write opens its own `AsyncSessionLocal()` because
-        ``BaseHTTPMiddleware`` cannot use FastAPI's ``Depends(get_db)``.
+        middleware cannot use FastAPI's ``Depends(get_db)``.
         This matches the pattern already used by the system monitor
         background loop (see ``services/system_monitor.py``).
 
@@ -540,6 +613,13 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
         writing a non-customer integer there would violate referential
         integrity.  The ``entity_id`` column is the generic pointer used
         for non-customer entities.
+
+        With an ``audit_buffer`` whose flusher is running (app startup
+        starts it), the row is queued and bulk-inserted by the buffer
+        instead — no session or commit on the request path. Without a
+        running flusher (scripts, tests without lifespan) the row is
+        written directly as before, so nothing waits on a flush that
+        never comes.
         """
         if AsyncSessionLocal is None or CustomerAuditLog is None:
             # Import-time failure — audit is not available in this env.
@@ -577,22 +657,29 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
             "purpose": purpose,
         }
 
+        row = {
+            "customer_id": customer_id,
+            "action": action,
+            "entity": entity_type,
+            "entity_id": entity_id,
+            "user_id": user_id,
+            "user_email": user_email,
+            "user_role": user_role,
+            "timestamp": datetime.utcnow(),
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "details": details,
+        }
+
         try:
+            if (
+                self.audit_buffer is not None
+                and self.audit_buffer.running
+                and self.audit_buffer.enqueue(row)
+            ):
+                return
             async with AsyncSessionLocal() as session:
-                audit_log = CustomerAuditLog(
-                    customer_id=customer_id,
-                    action=action,
-                    entity=entity_type,
-                    entity_id=entity_id,
-                    user_id=user_id,
-                    user_email=user_email,
-                    user_role=user_role,
-                    timestamp=datetime.utcnow(),
-                    ip_address=ip_address,
-                    user_agent=user_agent,
-                    details=details,
-                )
-                session.add(audit_log)
+                await session.execute(insert(CustomerAuditLog.__table__), row)
                 await session.commit()
         except Exception as exc:
             # Fail loudly in the log but never propagate — a DB outage on
@@ -607,96 +694,3 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
                 },
                 exc_info=True,
             )
-
-
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """
-    General request logging middleware for all API endpoints.
-
-    Logs all incoming requests for security monitoring and debugging.
-
-    Usage:
-        app.add_middleware(RequestLoggingMiddleware)
-    """
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """
-        Log incoming requests.
-
-        Args:
-            request: Incoming HTTP request
-            call_next: Next middleware/route handler
-
-        Returns:
-            HTTP response
-        """
-        start_time = time.time()
-
-        # Log request
-        logger.info(
-            f"→ {request.method} {request.url.path} | "
-            f"IP: {self._get_client_ip(request)}"
-        )
-
-        # Process request
-        response = await call_next(request)
-
-        # Log response
-        duration_ms = (time.time() - start_time) * 1000
-        logger.info(
-            f"← {request.method} {request.url.path} | "
-            f"Status: {response.status_code} | "
-            f"Duration: {duration_ms:.2f}ms"
-        )
-
-        return response
-
-    def _get_client_ip(self, request: Request) -> str:
-        """Get client IP address, validating proxy headers against the direct peer."""
-        return get_real_ip(request)
-
-
-# ═══════════════════════════════════════════════════════════════════════════
-# Request ID Middleware (for correlation)
-# ═══════════════════════════════════════════════════════════════════════════
-
-import uuid
-
-
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """
-    Add unique request ID to each request for correlation.
-
-    Useful for:
-    - Tracking requests across services
-    - Correlating logs
-    - Debugging issues
-
-    Usage:
-        app.add_middleware(RequestIDMiddleware)
-    """
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """
-        Add request ID to request and response.
-
-        Args:
-            request: Incoming HTTP request
-            call_next: Next middleware/route handler
-
-        Returns:
-            HTTP response with X-Request-ID header
-        """
-        # Generate or extract request ID
-        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
-
-        # Store in request state for access in route handlers
-        request.state.request_id = request_id
-
-        # Process request
-        response = await call_next(request)
-
-        # Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
-
-        return response
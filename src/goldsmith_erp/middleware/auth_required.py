@@ -5,10 +5,10 @@ Requires valid JWT for all endpoints except whitelisted paths.
 
 import logging
 
-from fastapi import Request, Response
+from fastapi import Request
 from jose import JWTError, jwt
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from goldsmith_erp.core.config import settings
 from goldsmith_erp.core.security import ALGORITHM
@@ -63,30 +63,44 @@ PUBLIC_PREFIXES = [
 ]
 
 
-class AuthRequiredMiddleware(BaseHTTPMiddleware):
+class AuthRequiredMiddleware:
     """
-    Global authentication middleware.
+    Global authentication middleware (pure ASGI).
     Denies access by default — only whitelisted paths are public.
+
+    Only HTTP requests are checked; WebSocket endpoints authenticate
+    themselves (``_authenticate_websocket`` in main.py).
     """
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        path = request.url.path
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._public_paths = frozenset(PUBLIC_PATHS)
+        self._public_prefixes = tuple(PUBLIC_PREFIXES)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Allow public paths
-        if self._is_public(path):
-            return await call_next(request)
+        # Read path / method off the scope: request.url would build and
+        # re-parse a full URL on every request.
+        path = scope["path"]
 
-        # Allow OPTIONS (CORS preflight)
-        if request.method == "OPTIONS":
-            return await call_next(request)
+        # Allow public paths and OPTIONS (CORS preflight)
+        if self._is_public(path) or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
 
         # Check for JWT token
+        request = Request(scope)
         token = self._extract_token(request)
         if not token:
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=401,
                 content={"detail": "Authentication required"},
             )
+            await response(scope, receive, send)
+            return
 
         # Validate token
         try:
@@ -96,10 +110,12 @@ class AuthRequiredMiddleware(BaseHTTPMiddleware):
                 "Invalid JWT token",
                 extra={"path": path, "error": str(e)},
             )
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=401,
                 content={"detail": "Invalid or expired token"},
             )
+            await response(scope, receive, send)
+            return
 
         # Populate request.state so downstream middleware (audit logging,
         # rate limiting) can attribute the request to a user without
@@ -127,16 +143,11 @@ class AuthRequiredMiddleware(BaseHTTPMiddleware):
                     extra={"path": path},
                 )
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
     def _is_public(self, path: str) -> bool:
         """Check if path is whitelisted as public."""
-        if path in PUBLIC_PATHS:
-            return True
-        for prefix in PUBLIC_PREFIXES:
-            if path.startswith(prefix):
-                return True
-        return False
+        return path in self._public_paths or path.startswith(self._public_prefixes)
 
     def _extract_token(self, request: Request) -> str | None:
         """Extract JWT from Authorization header or cookie."""
@@ -3,83 +3,127 @@ Logging middleware for request tracking.
 """
 
 import logging
+import random
 import time
-import uuid
-from typing import Callable
+from typing import Optional
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from goldsmith_erp.core.logging import clear_request_id, set_request_id
+from goldsmith_erp.core.config import settings
+from goldsmith_erp.core.logging import (
+    clear_request_id,
+    new_request_id,
+    set_request_id,
+)
 
 logger = logging.getLogger(__name__)
 
+# Orchestrator probes: polled every few seconds, never worth a log line.
+_PROBE_PATHS = frozenset(
+    {"/health", "/health/liveness", "/health/readiness", "/health/startup"}
+)
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+
+class RequestLoggingMiddleware:
     """
     Middleware that logs all HTTP requests with timing and request IDs.
+
+    The app's single request logger: it owns the request-ID context var
+    and the X-Request-ID / X-Process-Time headers.
+
+    Pure ASGI: the response headers are amended on the way out instead of
+    wrapping the response in ``BaseHTTPMiddleware``'s extra task and stream.
+
+    Only ``sample_rate`` of requests are logged; health probes never are,
+    and error responses (>= 400) and failures always are.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp, sample_rate: Optional[float] = None) -> None:
+        """
+        Args:
+            app: Wrapped ASGI application
+            sample_rate: Share of requests to log (default:
+                ``settings.LOG_SAMPLE_RATE``)
+        """
+        self.app = app
+        self.sample_rate = (
+            sample_rate if sample_rate is not None else settings.LOG_SAMPLE_RATE
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process request and add logging.
 
         Args:
-            request: The incoming HTTP request
-            call_next: The next middleware/handler
-
-        Returns:
-            Response: The HTTP response
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
-        # Generate unique request ID
-        request_id = str(uuid.uuid4())
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+
+        # Reuse the proxy's / client's request ID, else generate one
+        request_id = new_request_id(request.headers.get("X-Request-ID"))
         set_request_id(request_id)
 
         # Add request ID to response headers for debugging
-        start_time = time.time()
-
-        # Log incoming request
-        logger.info(
-            "Incoming request",
-            extra={
-                "method": request.method,
-                "url": str(request.url),
-                "client_host": request.client.host if request.client else None,
-                "user_agent": request.headers.get("user-agent"),
-            },
+        start = time.perf_counter()
+        method = scope["method"]
+        sampled = scope["path"] not in _PROBE_PATHS and (
+            self.sample_rate >= 1.0 or random.random() < self.sample_rate
         )
 
-        try:
-            # Process request
-            response = await call_next(request)
-
-            # Calculate processing time
-            process_time = time.time() - start_time
-
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
-            response.headers["X-Process-Time"] = str(process_time)
-
-            # Log response
+        # Log incoming request
+        if sampled:
             logger.info(
-                "Request completed",
+                "Incoming request",
                 extra={
-                    "method": request.method,
+                    "method": method,
                     "url": str(request.url),
-                    "status_code": response.status_code,
-                    "process_time_ms": round(process_time * 1000, 2),
+                    "client_host": request.client.host if request.client else None,
+                    "user_agent": request.headers.get("user-agent"),
                 },
             )
 
-            return response
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Calculate processing time
+                process_time = time.perf_counter() - start
+
+                # Add request ID to response headers
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["X-Process-Time"] = str(process_time)
+
+                # Log response (errors even if the request was not sampled)
+                if sampled or message["status"] >= 400:
+                    logger.info(
+                        "Request completed",
+                        extra={
+                            "method": method,
+                            "url": str(request.url),
+                            "status_code": message["status"],
+                            "process_time_ms": round(process_time * 1000, 2),
+                        },
+                    )
+            await send(message)
+
+        try:
+            # Process request
+            await self.app(scope, receive, send_wrapper)
 
         except Exception as exc:
             # Log error
-            process_time = time.time() - start_time
+            process_time = time.perf_counter() - start
             logger.error(
                 "Request failed",
                 extra={
-                    "method": request.method,
+                    "method": method,
                     "url": str(request.url),
                     "error": str(exc),
                     "error_type": type(exc).__name__,
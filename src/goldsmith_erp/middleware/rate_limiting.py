@@ -16,11 +16,13 @@ Date: 2025-11-06
 import ipaddress
 import logging
 import time
+import uuid
 from datetime import datetime, timedelta
 from typing import Any, Callable, Dict, Optional
 
 import redis.asyncio as redis
 from fastapi import HTTPException, Request, Response, status
+from redis.commands.core import AsyncScript
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
@@ -28,6 +30,29 @@ from goldsmith_erp.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Sliding-window log in one atomic round-trip: trim the window, count, and
+# either record this request or report when the oldest entry expires.
+# KEYS[1] = zset key; ARGV = now, window_seconds, max_requests, member.
+# Returns {allowed (0/1), remaining, reset_seconds}.
+_SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count >= limit then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    local reset = window
+    if oldest[2] then
+        reset = math.floor(tonumber(oldest[2]) + window - now)
+    end
+    return {0, 0, reset}
+end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('EXPIRE', KEYS[1], window * 2)
+return {1, limit - count - 1, window}
+"""
+
 
 def _is_trusted_proxy_ip(ip: str) -> bool:
     """Return True if *ip* is a loopback or RFC-1918 private address."""
@@ -82,6 +107,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     def __init__(self, app: ASGIApp):
         super().__init__(app)
         self.redis_client: Optional[redis.Redis] = None
+        self._sliding_window: Optional[AsyncScript] = None
         self.fallback_storage: Dict[str, Dict[str, Any]] = {}  # In-memory fallback
 
         # Rate limit configurations (requests per window)
@@ -165,6 +191,11 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             )
             # Test connection
             await self.redis_client.ping()
+            # EVALSHA wrapper; re-loads the script itself on NOSCRIPT
+            # (e.g. after a Redis restart or SCRIPT FLUSH).
+            self._sliding_window = self.redis_client.register_script(
+                _SLIDING_WINDOW_LUA
+            )
             logger.info("Rate limiter connected to Redis")
         except Exception as e:
             logger.warning(f"Failed to connect to Redis, using in-memory fallback: {e}")
@@ -240,6 +271,10 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         """
         Check rate limit using Redis (distributed).
 
+        One EVALSHA of ``_SLIDING_WINDOW_LUA``: a single round-trip, and
+        atomic, so concurrent requests cannot all pass on the same stale
+        count.
+
         Args:
             key: Rate limit key
             max_requests: Maximum requests allowed
@@ -250,39 +285,17 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         """
         try:
             current_time = time.time()
-            window_start = current_time - window_seconds
-
-            # Redis key for this rate limit
-            redis_key = f"ratelimit:{key}"
-
-            # Remove old entries (outside the window)
-            await self.redis_client.zremrangebyscore(redis_key, 0, window_start)
 
-            # Count requests in current window
-            request_count = await self.redis_client.zcard(redis_key)
-
-            if request_count >= max_requests:
-                # Rate limit exceeded
-                # Get oldest request to calculate reset time
-                oldest = await self.redis_client.zrange(
-                    redis_key, 0, 0, withscores=True
-                )
-                if oldest:
-                    oldest_time = oldest[0][1]
-                    reset_time = int((oldest_time + window_seconds) - current_time)
-                else:
-                    reset_time = window_seconds
-
-                return False, 0, max(reset_time, 1)
-
-            # Add current request
-            await self.redis_client.zadd(redis_key, {str(current_time): current_time})
-
-            # Set expiry on the key (cleanup)
-            await self.redis_client.expire(redis_key, window_seconds * 2)
+            # Timestamp alone collides when a burst lands in the same tick
+            member = f"{current_time}:{uuid.uuid4().hex}"
+            allowed, remaining, reset_time = await self._sliding_window(
+                keys=[f"ratelimit:{key}"],
+                args=[current_time, window_seconds, max_requests, member],
+            )
 
-            remaining = max_requests - (request_count + 1)
-            return True, remaining, window_seconds
+            if not allowed:
+                return False, 0, max(int(reset_time), 1)
+            return True, int(remaining), int(reset_time)
 
         except Exception as e:
             logger.error(f"Redis rate limit check failed: {e}")
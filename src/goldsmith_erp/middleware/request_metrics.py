@@ -17,9 +17,7 @@ import time
 from collections import deque
 from typing import Any, Deque, Dict, List, Tuple
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # ---------------------------------------------------------------------------
 # Module-level ring buffers — all access is single-threaded inside asyncio
@@ -124,25 +122,39 @@ def get_metrics() -> Dict[str, Any]:
     }
 
 
-class RequestMetricsMiddleware(BaseHTTPMiddleware):
+class RequestMetricsMiddleware:
     """
-    Starlette middleware that records response time and status code for every
-    request passing through the application.
+    Pure ASGI middleware that records response time and status code for every
+    HTTP request passing through the application.
+
+    The duration is taken when the response starts (headers sent), as with
+    the former ``BaseHTTPMiddleware`` version.
     """
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         start = time.monotonic()
+        recorded = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal recorded
+            if message["type"] == "http.response.start":
+                recorded = True
+                duration_ms = round((time.monotonic() - start) * 1000, 2)
+                _record(duration_ms, message["status"])
+            await send(message)
+
         try:
-            response: Response = await call_next(request)
-            status_code = response.status_code
+            await self.app(scope, receive, send_wrapper)
         except Exception:
-            # Unhandled exception — count as 500
-            duration_ms = round((time.monotonic() - start) * 1000, 2)
-            _record(duration_ms, 500)
+            # Unhandled exception before a response started — count as 500
+            if not recorded:
+                duration_ms = round((time.monotonic() - start) * 1000, 2)
+                _record(duration_ms, 500)
             raise
-
-        duration_ms = round((time.monotonic() - start) * 1000, 2)
-        _record(duration_ms, status_code)
-        return response
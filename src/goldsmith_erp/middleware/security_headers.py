@@ -3,35 +3,52 @@ Security headers middleware.
 Adds CSP, X-Content-Type-Options, X-Frame-Options, and other security headers.
 """
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Adds security headers to all responses."""
-
-    async def dispatch(self, request: Request, call_next) -> Response:
-        response = await call_next(request)
-
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "script-src 'self'; "
-            "style-src 'self' 'unsafe-inline'; "
-            "img-src 'self' data:; "
-            "connect-src 'self' ws: wss:; "
-            "font-src 'self'; "
-            "frame-ancestors 'none'"
-        )
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "0"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        # camera=(self): the product's own QR scanner (frontend
-        # QrCameraScanner.tsx) needs getUserMedia. camera=() would block it once
-        # frontend and backend share an origin behind the Caddy+nginx proxy.
-        # microphone/geolocation stay fully disabled — nothing in the app uses them.
-        response.headers["Permissions-Policy"] = (
-            "camera=(self), microphone=(), geolocation=()"
-        )
-
-        return response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_SECURITY_HEADERS = {
+    "Content-Security-Policy": (
+        "default-src 'self'; "
+        "script-src 'self'; "
+        "style-src 'self' 'unsafe-inline'; "
+        "img-src 'self' data:; "
+        "connect-src 'self' ws: wss:; "
+        "font-src 'self'; "
+        "frame-ancestors 'none'"
+    ),
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "0",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    # camera=(self): the product's own QR scanner (frontend
+    # QrCameraScanner.tsx) needs getUserMedia. camera=() would block it once
+    # frontend and backend share an origin behind the Caddy+nginx proxy.
+    # microphone/geolocation stay fully disabled — nothing in the app uses them.
+    "Permissions-Policy": "camera=(self), microphone=(), geolocation=()",
+}
+
+
+class SecurityHeadersMiddleware:
+    """
+    Adds security headers to all responses.
+
+    Pure ASGI: the headers are set on ``http.response.start`` instead of
+    wrapping the response in ``BaseHTTPMiddleware``'s extra task and stream.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in _SECURITY_HEADERS.items():
+                    headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -433,8 +433,9 @@ class CostCalculationService:
         if order.price is None:
             order.price = price_breakdown.final_price
 
+        # Sessions use expire_on_commit=False: ``order`` already holds the
+        # values just written, no re-SELECT needed.
         await db.commit()
-        await db.refresh(order)
 
         logger.info(
             "Order price updated",
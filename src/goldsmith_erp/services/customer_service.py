@@ -7,7 +7,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import and_, delete, desc, func, null, or_, select, update
+from sqlalchemy import and_, delete, desc, func, literal, null, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -611,6 +611,21 @@ class CustomerService:
         )
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def email_exists(db: AsyncSession, email: str) -> bool:
+        """Whether any customer already uses ``email`` (blind-index lookup).
+
+        Uniqueness checks only need a yes/no: this selects a constant with
+        ``LIMIT 1`` instead of loading (and decrypting) the whole row the
+        way ``get_customer_by_email`` does.
+        """
+        result = await db.execute(
+            select(literal(1))
+            .where(CustomerModel.email_hash == hmac_blind_index(email))
+            .limit(1)
+        )
+        return result.first() is not None
+
     @staticmethod
     async def create_customer(
         db: AsyncSession, customer_in: CustomerCreate
@@ -625,10 +640,7 @@ class CustomerService:
         """
         async with transactional(db):
             # Check if email already exists (via blind-index)
-            existing = await CustomerService.get_customer_by_email(
-                db, customer_in.email
-            )
-            if existing:
+            if await CustomerService.email_exists(db, customer_in.email):
                 raise ValueError(
                     "Ein Kunde mit dieser E-Mail-Adresse existiert bereits"
                 )
@@ -677,10 +689,7 @@ class CustomerService:
 
             # Check email uniqueness if email is being updated
             if "email" in update_data and update_data["email"] != db_customer.email:
-                existing = await CustomerService.get_customer_by_email(
-                    db, update_data["email"]
-                )
-                if existing:
+                if await CustomerService.email_exists(db, update_data["email"]):
                     raise ValueError(
                         "Ein Kunde mit dieser E-Mail-Adresse existiert bereits"
                     )
@@ -141,7 +141,7 @@ class HandoffService:
         - The sender is not handing off to themselves.
 
         After persisting, sends a notification to the recipient and publishes
-        an event to the ``order_updates`` Redis channel.
+        an event to the ``events:orders:updated`` Redis channel.
 
         Raises:
             ValueError: If any validation fails.
@@ -202,8 +202,8 @@ class HandoffService:
 
         # --- Publish order update event ---
         try:
-            await pubsub.publish_event(
-                "order_updates",
+            await pubsub.publish_order_event(
+                "updated",
                 json.dumps(
                     {
                         "action": "handoff_created",
@@ -294,8 +294,8 @@ class HandoffService:
 
         # --- Publish event ---
         try:
-            await pubsub.publish_event(
-                "order_updates",
+            await pubsub.publish_order_event(
+                "updated",
                 json.dumps(
                     {
                         "action": "handoff_accepted",
@@ -385,8 +385,8 @@ class HandoffService:
 
         # --- Publish event ---
         try:
-            await pubsub.publish_event(
-                "order_updates",
+            await pubsub.publish_order_event(
+                "updated",
                 json.dumps(
                     {
                         "action": "handoff_declined",
@@ -86,7 +86,9 @@ class InvoiceService:
         Uses a SELECT MAX query inside the current transaction to determine
         the highest existing sequence number for this year, then increments it.
         This is safe for low-concurrency ERP usage; a DB sequence would be
-        preferable for high-throughput scenarios.
+        preferable for high-throughput scenarios. The year prefix is matched
+        with ``LIKE 'RE-2026-%'``, which the ``text_pattern_ops`` index
+        ``ix_invoices_number_pattern`` serves whatever the database collation.
         """
         year = datetime.utcnow().year
         prefix = f"RE-{year}-"
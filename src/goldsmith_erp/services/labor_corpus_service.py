@@ -51,6 +51,10 @@ Design notes
   regardless of how many orders/entries match, this executes a constant
   number of queries (the main SELECT plus one batched SELECT per
   ``selectinload`` level) — no N+1.
+* Streamed in batches of ``_CORPUS_BATCH_SIZE`` orders (``yield_per``): the
+  ``selectinload`` SELECTs run once per batch and each batch's ORM objects
+  can be collected once folded into ``CorpusOrder`` rows, so peak memory
+  stays flat as the order history grows.
 """
 
 from __future__ import annotations
@@ -74,6 +78,9 @@ logger = logging.getLogger(__name__)
 # auto_calculate_actual_hours.
 _COMPLETED_STATUSES = (OrderStatusEnum.COMPLETED, OrderStatusEnum.DELIVERED)
 
+# Orders (with their time entries) held in memory at once while streaming.
+_CORPUS_BATCH_SIZE = 200
+
 
 @dataclass(frozen=True)
 class CorpusOrder:
@@ -99,7 +106,7 @@ async def load_corpus(db: AsyncSession) -> list[CorpusOrder]:
     ``order_type`` set, and orders with zero total billable hours (nothing
     for the estimator to learn from).
     """
-    result = await db.execute(
+    result = await db.stream_scalars(
         select(OrderModel)
         .where(
             OrderModel.status.in_(_COMPLETED_STATUSES),
@@ -113,14 +120,14 @@ async def load_corpus(db: AsyncSession) -> list[CorpusOrder]:
             ),
             selectinload(OrderModel.gemstones),
         )
-        .order_by(OrderModel.id)
+        .order_by(OrderModel.id),
+        execution_options={"yield_per": _CORPUS_BATCH_SIZE},
     )
-    orders = list(result.scalars().all())
 
     corpus: list[CorpusOrder] = []
     skipped_zero_hours = 0
 
-    for order in orders:
+    async for order in result:
         activity_hours: dict[int, float] = {}
 
         for entry in order.time_entries:
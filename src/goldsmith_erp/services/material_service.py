@@ -230,26 +230,31 @@ class MaterialService:
         Returns:
             Aktualisiertes Material-Objekt oder None
         """
-        material = await MaterialService.get_material_by_id(db, material_id)
-        if not material:
-            return None
-
-        # Neuen Bestand berechnen
         if operation == "add":
-            new_stock = material.stock + quantity
+            delta = quantity
         elif operation == "subtract":
-            new_stock = material.stock - quantity
-            if new_stock < 0:
-                raise ValueError("Stock cannot be negative")
+            delta = -quantity
         else:
             raise ValueError(f"Invalid operation: {operation}")
 
-        # Bestand aktualisieren
-        await db.execute(
+        # Bestand atomar in der DB anpassen: stock = stock ± :q mit
+        # Nicht-negativ-Guard im WHERE — kein Lost Update bei parallelen
+        # Buchungen (früher: lesen, in Python rechnen, zurückschreiben).
+        new_stock = MaterialModel.stock + delta
+        result = await db.execute(
             update(MaterialModel)
-            .where(MaterialModel.id == material_id)
+            .where(MaterialModel.id == material_id, new_stock >= 0)
             .values(stock=new_stock)
+            .returning(MaterialModel.id)
         )
+        if result.scalar_one_or_none() is None:
+            exists = await db.scalar(
+                select(MaterialModel.id).where(MaterialModel.id == material_id)
+            )
+            if exists is None:
+                return None
+            raise ValueError("Stock cannot be negative")
+
         await db.commit()
         await invalidate(_MATERIALS_LIST_KEY)
 
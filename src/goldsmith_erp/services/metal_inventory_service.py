@@ -11,7 +11,7 @@ from datetime import datetime
 from typing import List, Literal, Optional, Tuple
 
 from fastapi import HTTPException
-from sqlalchemy import and_, asc, desc, func, select
+from sqlalchemy import desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -23,6 +23,7 @@ from ..db.models import (
     MetalType,
     Order,
 )
+from ..db.repositories.metal_purchase import MetalPurchaseRepository
 from ..db.transaction import transactional
 from ..models.metal_inventory import (
     InventoryAdjustmentCreate,
@@ -304,34 +305,22 @@ class MetalInventoryService:
                 costing_method=costing_method,
             )
 
-        # For FIFO, LIFO, AVERAGE: Get available purchases
-        if costing_method == CostingMethod.FIFO:
-            order_by = asc(MetalPurchase.date_purchased)
-        elif costing_method == CostingMethod.LIFO:
-            order_by = desc(MetalPurchase.date_purchased)
-        else:  # AVERAGE
-            order_by = asc(
-                MetalPurchase.date_purchased
-            )  # Order doesn't matter for average
-
-        # Get available batches
-        result = await db.execute(
-            select(MetalPurchase)
-            .filter(
-                and_(
-                    MetalPurchase.metal_type == metal_type,
-                    MetalPurchase.remaining_weight_g > 0.01,
-                )
-            )
-            .order_by(order_by)
+        # For FIFO, LIFO, AVERAGE: select the batches in SQL. The running
+        # SUM() OVER (ORDER BY date_purchased) window returns only the
+        # batches this allocation actually draws from, plus the total open
+        # weight for the shortfall check.
+        repo = MetalPurchaseRepository(db)
+        batches = await repo.select_batches_for_consumption(
+            metal_type,
+            required_weight_g,
+            lifo=costing_method == CostingMethod.LIFO,
         )
-        available_purchases = list(result.scalars().all())
 
-        if not available_purchases:
+        if not batches:
             raise ValueError(f"No inventory available for {metal_type.value}")
 
         # Calculate total available weight
-        total_available = sum(p.remaining_weight_g for p in available_purchases)
+        total_available = batches[0].total_available_g
         if total_available < required_weight_g:
             raise ValueError(
                 f"Insufficient inventory: {total_available:.2f}g available, "
@@ -340,20 +329,17 @@ class MetalInventoryService:
 
         # Weighted Average Cost calculation
         if costing_method == CostingMethod.AVERAGE:
-            total_value = sum(
-                p.remaining_weight_g * p.price_per_gram for p in available_purchases
-            )
-            avg_price_per_gram = total_value / total_available
+            _, avg_price_per_gram = await repo.get_weighted_average(metal_type)
 
             # Allocate from first batch (for simplicity), but use average price
             allocations = [
                 MetalAllocation(
-                    metal_purchase_id=available_purchases[0].id,
+                    metal_purchase_id=batches[0].id,
                     metal_type=metal_type,
                     weight_allocated_g=required_weight_g,
                     price_per_gram=avg_price_per_gram,
                     cost=required_weight_g * avg_price_per_gram,
-                    date_purchased=available_purchases[0].date_purchased,
+                    date_purchased=batches[0].date_purchased,
                 )
             ]
 
@@ -369,21 +355,21 @@ class MetalInventoryService:
         allocations = []
         remaining_need = required_weight_g
 
-        for purchase in available_purchases:
+        for batch in batches:
             if remaining_need <= 0:
                 break
 
             # How much to take from this batch
-            allocated_from_batch = min(purchase.remaining_weight_g, remaining_need)
+            allocated_from_batch = min(batch.remaining_weight_g, remaining_need)
 
             allocations.append(
                 MetalAllocation(
-                    metal_purchase_id=purchase.id,
-                    metal_type=purchase.metal_type,
+                    metal_purchase_id=batch.id,
+                    metal_type=batch.metal_type,
                     weight_allocated_g=allocated_from_batch,
-                    price_per_gram=purchase.price_per_gram,
-                    cost=allocated_from_batch * purchase.price_per_gram,
-                    date_purchased=purchase.date_purchased,
+                    price_per_gram=batch.price_per_gram,
+                    cost=allocated_from_batch * batch.price_per_gram,
+                    date_purchased=batch.date_purchased,
                 )
             )
 
@@ -417,9 +403,9 @@ class MetalInventoryService:
 
         This method:
         1. Allocates material using specified costing method
-        2. Locks the target MetalPurchase row(s) with SELECT ... FOR UPDATE
-           (Lena §3 concurrency fix; A3.4) so two parallel consumes cannot
-           race the remaining_weight_g below zero.
+        2. Decrements the target MetalPurchase row(s) in one guarded
+           UPDATE ... RETURNING (Lena §3 concurrency fix; A3.4) so two
+           parallel consumes cannot race the remaining_weight_g below zero.
         3. Checks alloy match (order.alloy vs metal_purchase metal_type);
            if mismatch AND alloy_override=False, raises 409 ALLOY_MISMATCH.
         4. If alloy_override=True, requires override_reason AND
@@ -427,9 +413,8 @@ class MetalInventoryService:
            three onto the MaterialUsage row for the 10-year financial
            audit trail.
         5. Creates MaterialUsage record
-        6. Reduces remaining_weight_g in MetalPurchase(s)
-        7. Updates Order.material_cost_calculated
-        8. Publishes a material_updates pubsub event with source=origin.
+        6. Updates Order.material_cost_calculated
+        7. Publishes a material_updates pubsub event with source=origin.
 
         Args:
             usage_data: Usage details (order_id, weight, costing method)
@@ -474,47 +459,33 @@ class MetalInventoryService:
                 specific_purchase_id=usage_data.metal_purchase_id,
             )
 
-            # 2. Consume from inventory with ROW LOCKS (A3.4 / Lena §3).
-            #    Re-fetch each purchase WITH FOR UPDATE so concurrent
-            #    consumes on the same bar serialise and can never drive
-            #    remaining_weight_g below zero.
-            locked_purchases: dict[int, MetalPurchase] = {}
+            # 2. Consume from inventory atomically (A3.4 / Lena §3). One
+            #    guarded UPDATE ... RETURNING decrements every allocated
+            #    batch; the UPDATE row locks serialise concurrent consumes
+            #    on the same bar, and the WHERE guard re-checks stock under
+            #    that lock so remaining_weight_g can never go below zero.
+            takes: dict[int, float] = {}
             for alloc in allocation.allocations:
-                locked = await db.execute(
-                    select(MetalPurchase)
-                    .where(MetalPurchase.id == alloc.metal_purchase_id)
-                    .with_for_update()
+                takes[alloc.metal_purchase_id] = (
+                    takes.get(alloc.metal_purchase_id, 0.0) + alloc.weight_allocated_g
                 )
-                purchase = locked.scalar_one_or_none()
-                if not purchase:
-                    raise ValueError(
-                        f"Metal purchase {alloc.metal_purchase_id} not found"
-                    )
-                locked_purchases[alloc.metal_purchase_id] = purchase
-
-                # Re-check stock UNDER THE LOCK. The planner's view may
-                # be stale if a concurrent consume happened between
-                # allocate and the lock acquisition.
-                if purchase.remaining_weight_g + 0.01 < alloc.weight_allocated_g:
+            consumed = await MetalPurchaseRepository(db).consume_batches(takes)
+            for purchase_id, weight_g in takes.items():
+                if purchase_id not in consumed:
+                    # The planner's view was stale: a concurrent consume
+                    # drained the batch between allocate and the UPDATE.
                     raise ValueError(
-                        f"Cannot consume {alloc.weight_allocated_g}g from "
-                        f"purchase {purchase.id}: only "
-                        f"{purchase.remaining_weight_g:.3f}g remaining "
+                        f"Cannot consume {weight_g}g from purchase "
+                        f"{purchase_id}: insufficient stock remaining "
                         "(concurrent consume)"
                     )
 
-                # Apply the decrement.
-                purchase.remaining_weight_g -= alloc.weight_allocated_g
-                if purchase.remaining_weight_g < 0.01:
-                    purchase.remaining_weight_g = 0.0
-
             # 3. Alloy-match check against the ORDER alloy. Uses the
             #    metal_type of the PRIMARY batch — if a multi-batch
             #    allocation ever spans alloys, we fail closed (any
             #    mismatched batch triggers the check).
             primary_allocation = allocation.allocations[0]
-            primary_purchase = locked_purchases[primary_allocation.metal_purchase_id]
-            expected_alloy = _expected_alloy(primary_purchase.metal_type)
+            expected_alloy = _expected_alloy(primary_allocation.metal_type)
 
             order_result = await db.execute(
                 select(Order).filter(Order.id == usage_data.order_id)
@@ -534,7 +505,7 @@ class MetalInventoryService:
                 raise AlloyMismatchError(
                     order_alloy=order.alloy,
                     purchase_alloy=expected_alloy,
-                    metal_purchase_id=primary_purchase.id,
+                    metal_purchase_id=primary_allocation.metal_purchase_id,
                 )
 
             # 4. Create MaterialUsage record. R10 audit fields persisted
@@ -1,13 +1,13 @@
 import json
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException
-from sqlalchemy import delete, update
+from sqlalchemy import bindparam, delete, insert, lambda_stmt, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import contains_eager, joinedload, raiseload, selectinload
 
 # Import the module (not the function) so the unit-test conftest monkeypatch on
 # goldsmith_erp.core.pubsub.publish_event actually intercepts our calls (see
@@ -15,12 +15,34 @@ from sqlalchemy.orm import selectinload
 from goldsmith_erp.core import pubsub
 from goldsmith_erp.db.models import Customer, LocationHistory, Material
 from goldsmith_erp.db.models import Order as OrderModel
-from goldsmith_erp.db.models import OrderStatusEnum, TimeEntry
+from goldsmith_erp.db.models import OrderStatusEnum, TimeEntry, order_materials
 from goldsmith_erp.db.transaction import transactional
 from goldsmith_erp.models.order import OrderCreate, OrderUpdate
 
 logger = logging.getLogger(__name__)
 
+# Single-order reads behind every order detail / update call. Built once as
+# lambda statements (cached by code location), so repeat calls skip statement
+# construction and cache-key generation; the ID is bound per execution.
+_ORDER_DETAIL_STMT = lambda_stmt(
+    lambda: select(OrderModel)
+    .outerjoin(OrderModel.materials)
+    .options(
+        joinedload(OrderModel.customer),
+        contains_eager(OrderModel.materials),
+        selectinload(OrderModel.gemstones),  # FIXED: Added gemstones
+        raiseload("*"),
+    )
+    .filter(
+        OrderModel.id == bindparam("order_id"), OrderModel.is_deleted == False
+    )  # noqa: E712
+)
+_ORDER_ROW_STMT = lambda_stmt(
+    lambda: select(OrderModel).filter(
+        OrderModel.id == bindparam("order_id"), OrderModel.is_deleted == False
+    )  # noqa: E712
+)
+
 
 # ---------------------------------------------------------------------------
 # Slice 5 — Punzierungs-Check guard constants (M4 / R8 / A5.3).
@@ -37,6 +59,14 @@ _PUNZIERUNG_REQUIRED_TARGETS: frozenset[OrderStatusEnum] = frozenset(
     {OrderStatusEnum.COMPLETED}
 )
 
+# Target statuses whose guards in ``OrderService.update_order`` read the
+# current row (Punzierung, CONFIRMED Pflichtfelder, first completion).
+_ROW_GUARDED_STATUSES: frozenset[OrderStatusEnum] = _PUNZIERUNG_REQUIRED_TARGETS | {
+    OrderStatusEnum.CONFIRMED,
+    OrderStatusEnum.COMPLETED,
+    OrderStatusEnum.DELIVERED,
+}
+
 
 class PunzierungRequiredError(HTTPException):
     """Raised when advancing to COMPLETED without a verified Punzierung (M4).
@@ -134,12 +164,19 @@ class OrderService:
         skip: int = 0,
         limit: int = 100,
         customer_id: Optional[int] = None,
+        cursor: Optional[Tuple[datetime, int]] = None,
     ) -> List[OrderModel]:
         """
         Holt alle Aufträge mit Pagination.
 
-        Uses eager loading to prevent N+1 queries when accessing relationships.
+        Uses eager loading to prevent N+1 queries when accessing relationships;
+        any other relationship raises on access instead of lazy-loading per row.
         Optionally filters by customer_id to avoid client-side filtering over large datasets.
+
+        Newest first with an ``id`` tiebreaker. With ``cursor`` — the
+        ``(created_at, id)`` of the previous page's last order — the page
+        seeks past it instead of skipping rows (``skip`` is then ignored),
+        so deep pages cost the same as the first.
         """
         query = (
             select(OrderModel)
@@ -147,15 +184,22 @@ class OrderService:
                 selectinload(OrderModel.materials),
                 selectinload(OrderModel.customer),
                 selectinload(OrderModel.gemstones),  # FIXED: Added gemstones
+                raiseload("*"),
             )
             .where(
                 OrderModel.is_deleted == False
             )  # noqa: E712 — SQLAlchemy requires == not is
-            .order_by(OrderModel.created_at.desc())
+            .order_by(OrderModel.created_at.desc(), OrderModel.id.desc())
         )
         if customer_id is not None:
             query = query.where(OrderModel.customer_id == customer_id)
-        result = await db.execute(query.offset(skip).limit(limit))
+        if cursor is not None:
+            query = query.where(
+                tuple_(OrderModel.created_at, OrderModel.id) < tuple_(*cursor)
+            )
+        else:
+            query = query.offset(skip)
+        result = await db.execute(query.limit(limit))
         return result.scalars().all()
 
     @staticmethod
@@ -164,18 +208,17 @@ class OrderService:
         Holt einen einzelnen Auftrag über seine ID.
 
         Uses eager loading to prevent N+1 queries when accessing relationships.
+        Customer and materials come back in the order's own query (JOIN +
+        LEFT JOIN); gemstones stay a selectin load, since joining a second
+        collection would multiply the rows. Other relationships raise on access.
         """
-        result = await db.execute(
-            select(OrderModel)
-            .options(
-                selectinload(OrderModel.materials),
-                selectinload(OrderModel.customer),
-                selectinload(OrderModel.gemstones),  # FIXED: Added gemstones
-            )
-            .filter(
-                OrderModel.id == order_id, OrderModel.is_deleted == False
-            )  # noqa: E712
-        )
+        result = await db.execute(_ORDER_DETAIL_STMT, {"order_id": order_id})
+        return result.unique().scalar_one_or_none()
+
+    @staticmethod
+    async def _get_order_row(db: AsyncSession, order_id: int) -> Optional[OrderModel]:
+        """Live order by ID, columns only (no relationship eager loads)."""
+        result = await db.execute(_ORDER_ROW_STMT, {"order_id": order_id})
         return result.scalar_one_or_none()
 
     @staticmethod
@@ -193,25 +236,30 @@ class OrderService:
                 order_data["costing_method_used"] = order_in.costing_method
             db_order = OrderModel(**order_data)
 
-            # Materialien verknüpfen, falls angegeben
+            # Validate all materials exist (IDs only, no Material rows loaded)
             if order_in.materials:
                 material_results = await db.execute(
-                    select(Material).filter(Material.id.in_(order_in.materials))
+                    select(Material.id).filter(Material.id.in_(order_in.materials))
                 )
-                materials = material_results.scalars().all()
-
-                # Validate all materials exist
-                if len(materials) != len(order_in.materials):
-                    found_ids = {m.id for m in materials}
-                    missing_ids = set(order_in.materials) - found_ids
+                found_ids = set(material_results.scalars().all())
+                missing_ids = set(order_in.materials) - found_ids
+                if missing_ids:
                     raise ValueError(f"Materials not found: {missing_ids}")
 
-                db_order.materials = materials
-
             db.add(db_order)
             # Flush to get the ID before commit
             await db.flush()
 
+            # Materialien verknüpfen: one executemany INSERT into the link table
+            if order_in.materials:
+                await db.execute(
+                    insert(order_materials),
+                    [
+                        {"order_id": db_order.id, "material_id": material_id}
+                        for material_id in order_in.materials
+                    ],
+                )
+
         # Re-fetch with eager loading after commit so relationships are available
         # for response serialization without requiring an active greenlet
         db_order = await OrderService.get_order(db, db_order.id)
@@ -219,8 +267,8 @@ class OrderService:
         # Publish event to Redis AFTER successful transaction commit
         # If this fails, the order is still created (eventual consistency)
         try:
-            await pubsub.publish_event(
-                "order_updates",
+            await pubsub.publish_order_event(
+                "created",
                 json.dumps(
                     {
                         "action": "create",
@@ -316,11 +364,6 @@ class OrderService:
           - completed_at: set to utcnow()
           - actual_hours: calculated from closed time entries minus interruptions
         """
-        # Zuerst prüfen, ob der Auftrag existiert
-        order = await OrderService.get_order(db, order_id)
-        if not order:
-            return None
-
         update_data = order_in.dict(exclude_unset=True, exclude={"costing_method"})
 
         # OrderUpdate uses 'costing_method' but the ORM column is 'costing_method_used'
@@ -328,6 +371,42 @@ class OrderService:
             update_data["costing_method_used"] = order_in.costing_method
 
         new_status = update_data.get("status")
+        pending_marks = update_data.get("punzierung_verified_marks")
+
+        # Fast path (e.g. a Kanban drag to IN_PROGRESS): no guard below
+        # needs the current row, so the existence check rides on the
+        # UPDATE itself instead of a SELECT first.
+        if (
+            update_data
+            and pending_marks is None
+            and new_status not in _ROW_GUARDED_STATUSES
+        ):
+            async with transactional(db):
+                result = await db.execute(
+                    update(OrderModel)
+                    .where(
+                        OrderModel.id == order_id, OrderModel.is_deleted == False
+                    )  # noqa: E712
+                    .values(**update_data)
+                    .returning(OrderModel.id)
+                )
+                if result.scalar_one_or_none() is None:
+                    return None
+            return await OrderService._after_order_update(
+                db,
+                order_id,
+                origin,
+                verified_by_user_id,
+                is_completing=False,
+                status_changed=new_status is not None,
+            )
+
+        # Zuerst prüfen, ob der Auftrag existiert. The guards below only
+        # read columns, so the relationship eager loads of get_order are
+        # left to the post-commit fetch.
+        order = await OrderService._get_order_row(db, order_id)
+        if not order:
+            return None
 
         # ------------------------------------------------------------------
         # Slice 5 / M4 / R8 / A5.3 — Punzierungs-Check guard.
@@ -338,7 +417,6 @@ class OrderService:
         # bypass OrderService.update_order are enumerated in the Slice 5
         # report; any new path MUST also call _check_punzierung_requirement.
         # ------------------------------------------------------------------
-        pending_marks = update_data.get("punzierung_verified_marks")
         _check_punzierung_requirement(order, new_status, pending_marks)
 
         # A2.8 — when a Punzierungs-Check is recorded (first time marks
@@ -408,7 +486,26 @@ class OrderService:
                 )
 
                 await MLDataService.auto_calculate_actual_hours(db, order_id)
+        return await OrderService._after_order_update(
+            db,
+            order_id,
+            origin,
+            verified_by_user_id,
+            is_completing=is_completing,
+            status_changed=new_status is not None,
+        )
 
+    @staticmethod
+    async def _after_order_update(
+        db: AsyncSession,
+        order_id: int,
+        origin: str,
+        verified_by_user_id: Optional[int],
+        *,
+        is_completing: bool,
+        status_changed: bool,
+    ) -> Optional[OrderModel]:
+        """Post-commit half of :meth:`update_order`: fetch, events."""
         # Aktualisiertes Objekt holen after transaction commits
         updated_order = await OrderService.get_order(db, order_id)
 
@@ -419,6 +516,7 @@ class OrderService:
             db=db,
             order=updated_order,
             action="update",
+            event_type="status" if status_changed else "updated",
             source=origin,
             user_id=verified_by_user_id,
         )
@@ -446,10 +544,11 @@ class OrderService:
         db: AsyncSession,
         order: OrderModel,
         action: str,
+        event_type: str,
         source: str,
         user_id: Optional[int],
     ) -> None:
-        """Publish order_updates + notify user on pubsub failure (A5.4 / A5.5)."""
+        """Publish an order event + notify user on pubsub failure (A5.4 / A5.5)."""
         envelope = {
             "action": action,
             "source": source,
@@ -476,7 +575,7 @@ class OrderService:
         }
         publish_ok = False
         try:
-            await pubsub.publish_event("order_updates", json.dumps(envelope))
+            await pubsub.publish_order_event(event_type, json.dumps(envelope))
             publish_ok = True
         except Exception as e:
             logger.error(
@@ -599,8 +698,8 @@ class OrderService:
 
         # Publish event to Redis AFTER successful transaction commit
         try:
-            await pubsub.publish_event(
-                "order_updates",
+            await pubsub.publish_order_event(
+                "updated",
                 json.dumps(
                     {
                         "action": "delete",
@@ -638,7 +737,7 @@ class OrderService:
             await db.execute(
                 update(OrderModel)
                 .where(OrderModel.id == order_id)
-                .values(current_location=location, updated_at=datetime.utcnow())
+                .values(current_location=location)
             )
             history_entry = LocationHistory(
                 order_id=order_id,
@@ -651,8 +750,8 @@ class OrderService:
         updated_order = await OrderService.get_order(db, order_id)
 
         try:
-            await pubsub.publish_event(
-                "order_updates",
+            await pubsub.publish_order_event(
+                "updated",
                 json.dumps(
                     {
                         "action": "location_change",
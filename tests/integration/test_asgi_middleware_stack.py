@@ -0,0 +1,113 @@
+"""
+Integration tests for the pure-ASGI middleware stack in main.py.
+
+Tests cover:
+- RequestLoggingMiddleware stamps X-Request-ID / X-Process-Time on responses,
+  reusing a well-formed inbound X-Request-ID
+- AuthRequiredMiddleware answers unauthenticated API calls with 401
+- RequestSizeLimitMiddleware rejects oversized bodies with 413 before auth
+- SecurityHeadersMiddleware stamps its headers on every response, including
+  early rejections
+- AuditLoggingMiddleware records the status code the handler sent, and only
+  links customer_id for successful responses
+"""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from goldsmith_erp.db.models import CustomerAuditLog
+
+
+@pytest.fixture(autouse=True)
+def _patch_middleware_session(monkeypatch, db_session):
+    """Point the audit middleware's direct writes at the test engine."""
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import sessionmaker
+
+    from goldsmith_erp.middleware import audit_logging
+
+    factory = sessionmaker(
+        bind=db_session.bind, class_=AsyncSession, expire_on_commit=False
+    )
+    monkeypatch.setattr(audit_logging, "AsyncSessionLocal", factory)
+
+
+@pytest.mark.asyncio
+async def test_response_headers_stamped(client: AsyncClient):
+    resp = await client.get("/health")
+
+    assert resp.headers["X-Request-ID"]
+    assert float(resp.headers["X-Process-Time"]) >= 0
+
+
+@pytest.mark.asyncio
+async def test_inbound_request_id_reused_only_if_well_formed(client: AsyncClient):
+    resp = await client.get("/health", headers={"X-Request-ID": "edge-4f2a.1"})
+    assert resp.headers["X-Request-ID"] == "edge-4f2a.1"
+
+    resp = await client.get("/health", headers={"X-Request-ID": "a b\tc"})
+    assert len(resp.headers["X-Request-ID"]) == 32
+
+
+@pytest.mark.asyncio
+async def test_unauthenticated_request_rejected(client: AsyncClient):
+    resp = await client.get("/api/v1/orders/")
+
+    assert resp.status_code == 401
+    assert resp.json() == {"detail": "Authentication required"}
+
+
+@pytest.mark.asyncio
+async def test_security_headers_on_every_response(client: AsyncClient):
+    for resp in (
+        await client.get("/health"),
+        await client.get("/api/v1/orders/"),  # 401 from an inner layer
+    ):
+        assert resp.headers["X-Frame-Options"] == "DENY"
+        assert resp.headers["X-Content-Type-Options"] == "nosniff"
+        assert "frame-ancestors 'none'" in resp.headers["Content-Security-Policy"]
+        assert resp.headers["Permissions-Policy"].startswith("camera=(self)")
+
+
+@pytest.mark.asyncio
+async def test_oversized_body_rejected(client: AsyncClient):
+    resp = await client.post(
+        "/api/v1/orders/",
+        content=b"{}",
+        headers={"content-length": str(11 * 1024 * 1024)},
+    )
+
+    assert resp.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_audit_row_records_handler_status(
+    authenticated_client: AsyncClient, db_session
+):
+    resp = await authenticated_client.get("/api/v1/customers/999999")
+    assert resp.status_code == 404
+
+    result = await db_session.execute(
+        select(CustomerAuditLog).where(CustomerAuditLog.entity_id == 999999)
+    )
+    row = result.scalars().one()
+    assert row.details["status_code"] == 404
+    # A missing customer must not land in the customer_id foreign key.
+    assert row.customer_id is None
+
+
+@pytest.mark.asyncio
+async def test_audit_row_links_existing_customer(
+    authenticated_client: AsyncClient, db_session, sample_customer
+):
+    resp = await authenticated_client.get(f"/api/v1/customers/{sample_customer.id}")
+    assert resp.status_code == 200
+
+    result = await db_session.execute(
+        select(CustomerAuditLog).where(
+            CustomerAuditLog.entity_id == sample_customer.id,
+            CustomerAuditLog.details["http_method"].as_string() == "GET",
+        )
+    )
+    assert result.scalars().first().customer_id == sample_customer.id
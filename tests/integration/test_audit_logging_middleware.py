@@ -242,3 +242,46 @@ async def test_single_customer_get_uses_accessed_action(
         "— did the R1 fix accidentally reroute single reads to list_accessed?"
     )
     assert row.entity_id == test_customer.id
+
+
+# ---------------------------------------------------------------------------
+# Path classification — prefix fast path agrees with the segment parser
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "path, entity_type",
+    [
+        ("/api/v1/customers/123", "customer"),
+        ("/api/v1/scrap-gold/alloy-x", "scrap_gold"),
+        ("/api/v1//customers", "customer"),
+        ("api/v1/invoices", "invoice"),
+        ("/api/v1/customersearch", None),
+        ("/api/v1/orders/1", None),
+        ("/health", None),
+    ],
+)
+def test_extract_audit_context(path, entity_type):
+    from goldsmith_erp.middleware.audit_logging import AuditLoggingMiddleware
+
+    context = AuditLoggingMiddleware._extract_audit_context(path)
+    assert (context[0] if context else None) == entity_type
+
+
+@pytest.mark.parametrize(
+    "path, entity_id",
+    [
+        ("/api/v1/customers/123", 123),
+        ("/api/v1/customers/123/consent", 123),
+        ("/api/v1//customers/7/", 7),
+        ("/api/v1/customers", None),
+        ("/api/v1/customers/search", None),
+        ("/api/v1/customers/12a", None),
+        ("/api/v1/customers/²", None),
+        ("/api/v1/customers/2147483648", None),
+    ],
+)
+def test_extract_entity_id(path, entity_id):
+    from goldsmith_erp.middleware.audit_logging import AuditLoggingMiddleware
+
+    assert AuditLoggingMiddleware._extract_entity_id(path) == entity_id
@@ -10,18 +10,19 @@ same :class:`MetalPurchase` serialise correctly:
 
 Why PostgreSQL only
 -------------------
-SQLite silently ignores ``SELECT ... FOR UPDATE`` — it executes the
-statement but acquires no row lock, so it cannot demonstrate
-serialisation under genuine concurrency. Running this test on SQLite
+SQLite has no row-level locks — it serialises whole-database writes —
+so it cannot demonstrate row-lock serialisation under genuine
+concurrency. Running this test on SQLite
 would either be trivially flaky (async tasks racing without locks can
 double-consume) or produce false passes (single-threaded executor
 serialises accidentally).
 
-On PostgreSQL, ``FOR UPDATE`` acquires a row-level lock inside the
-current transaction; a second ``FOR UPDATE`` on the same row blocks
-until the first transaction commits or rolls back. This is what the
-service relies on (see ``metal_inventory_service.consume_material``
-step 2 — "re-fetch each purchase WITH FOR UPDATE").
+On PostgreSQL, the guarded ``UPDATE`` acquires a row-level lock inside
+the current transaction; a second ``UPDATE`` on the same row blocks
+until the first transaction commits or rolls back, then re-evaluates
+its stock guard against the committed value. This is what the service
+relies on (see ``metal_inventory_service.consume_material`` step 2 and
+``MetalPurchaseRepository.consume_batches``).
 
 The test is therefore guarded with a skip marker keyed on the
 ``DATABASE_URL`` environment variable. CI runs it under PostgreSQL.
@@ -81,7 +82,7 @@ def _engine_is_postgres(engine) -> bool:
 pytestmark = pytest.mark.skipif(
     _IS_SQLITE or not _DATABASE_URL,
     reason=(
-        "Concurrent SELECT FOR UPDATE is a no-op on SQLite. "
+        "Row-level locking is not observable on SQLite. "
         "Set DATABASE_URL to a PostgreSQL URL to exercise this test."
     ),
 )
@@ -168,7 +169,7 @@ async def _consume(
 @pytest.mark.asyncio
 class TestConcurrentConsumption:
     """Two parallel ``consume_material`` calls on the same
-    ``MetalPurchase``. The SELECT FOR UPDATE lock must serialise them
+    ``MetalPurchase``. The guarded UPDATE's row lock must serialise them
     such that stock never goes negative."""
 
     async def test_two_parallel_consumes_serialise(self, db_session):
@@ -230,7 +231,7 @@ class TestConcurrentConsumption:
             assert reloaded.remaining_weight_g == pytest.approx(2.0, abs=0.01)
             assert (
                 reloaded.remaining_weight_g >= 0.0
-            ), "Stock went negative — FOR UPDATE lock did not serialise"
+            ), "Stock went negative — UPDATE row lock did not serialise"
 
     async def test_two_parallel_consumes_that_both_fit_both_succeed(self, db_session):
         """Setup: 10g bar. Two tasks each consume 3g.
@@ -0,0 +1,72 @@
+"""
+Integration tests for the yearly document-number generators on PostgreSQL.
+
+Tests cover:
+- the next number follows the year's highest one under the database's own
+  collation (a non-C collation such as en_US.utf8 sorts '~' before digits,
+  which broke the former ``>= prefix AND < prefix~`` range)
+
+PostgreSQL only: SQLite compares bytewise and cannot show the difference.
+Set TEST_DATABASE_URL to a PostgreSQL URL to run them.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from goldsmith_erp.db.models import Invoice, InvoiceStatus, Order, RepairJob
+from goldsmith_erp.services.invoice_service import InvoiceService
+from goldsmith_erp.services.repair_service import _generate_repair_number
+from tests.integration.conftest import test_engine as _test_engine
+
+pytestmark = pytest.mark.skipif(
+    _test_engine.dialect.name != "postgresql",
+    reason="Collation-dependent; set TEST_DATABASE_URL to a PostgreSQL URL.",
+)
+
+
+@pytest.mark.asyncio
+async def test_repair_number_follows_existing(db_session, test_customer, admin_user):
+    year = datetime.utcnow().year
+    db_session.add(
+        RepairJob(
+            repair_number=f"REP-{year}-0042",
+            bag_number=f"TU-{year}-0042",
+            customer_id=test_customer.id,
+            received_by=admin_user.id,
+            item_description="Ring, Schiene gebrochen",
+        )
+    )
+    await db_session.commit()
+
+    repair_number, bag_number = await _generate_repair_number(db_session)
+
+    assert (repair_number, bag_number) == (f"REP-{year}-0043", f"TU-{year}-0043")
+
+
+@pytest.mark.asyncio
+async def test_invoice_number_follows_existing(db_session, test_customer, admin_user):
+    year = datetime.utcnow().year
+    order = Order(title="Ring", customer_id=test_customer.id)
+    db_session.add(order)
+    await db_session.flush()
+    db_session.add(
+        Invoice(
+            invoice_number=f"RE-{year}-0042",
+            order_id=order.id,
+            customer_id=test_customer.id,
+            created_by=admin_user.id,
+            status=InvoiceStatus.DRAFT,
+            issue_date=datetime.utcnow(),
+            due_date=datetime.utcnow() + timedelta(days=30),
+            subtotal=100.0,
+            tax_rate=19.0,
+            tax_amount=19.0,
+            total=119.0,
+        )
+    )
+    await db_session.commit()
+
+    assert await InvoiceService.generate_invoice_number(db_session) == (
+        f"RE-{year}-0043"
+    )
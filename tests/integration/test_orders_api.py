@@ -15,6 +15,8 @@ Permission matrix tested:
   - No auth  — 401
 """
 
+from datetime import datetime, timedelta
+
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -117,6 +119,66 @@ class TestListOrders:
         assert isinstance(response.json(), list)
         assert len(response.json()) <= 5
 
+    @pytest.mark.asyncio
+    async def test_list_orders_keyset_cursor(
+        self,
+        client: AsyncClient,
+        admin_auth_headers: dict,
+        test_customer: Customer,
+    ):
+        """after_created_at + after_id continue past the previous page."""
+        for title in ("First", "Second", "Third"):
+            post_resp = await client.post(
+                ORDERS_URL,
+                json=_create_payload(test_customer.id, title=title),
+                headers=admin_auth_headers,
+            )
+            assert post_resp.status_code == 200
+
+        params = {"limit": 2, "customer_id": test_customer.id}
+        page1 = (
+            await client.get(ORDERS_URL, params=params, headers=admin_auth_headers)
+        ).json()
+        last = page1[-1]
+        page2 = (
+            await client.get(
+                ORDERS_URL,
+                params={
+                    **params,
+                    "after_created_at": last["created_at"],
+                    "after_id": last["id"],
+                },
+                headers=admin_auth_headers,
+            )
+        ).json()
+
+        assert [o["title"] for o in page1 + page2] == ["Third", "Second", "First"]
+
+        # The same instant with an explicit offset selects the same page.
+        for created_at in (
+            f"{last['created_at']}Z",
+            (
+                datetime.fromisoformat(last["created_at"]) + timedelta(hours=2)
+            ).isoformat()
+            + "+02:00",
+        ):
+            aware = await client.get(
+                ORDERS_URL,
+                params={
+                    **params,
+                    "after_created_at": created_at,
+                    "after_id": last["id"],
+                },
+                headers=admin_auth_headers,
+            )
+            assert aware.status_code == 200
+            assert [o["title"] for o in aware.json()] == ["First"]
+
+        half_cursor = await client.get(
+            ORDERS_URL, params={"after_id": last["id"]}, headers=admin_auth_headers
+        )
+        assert half_cursor.status_code == 422
+
 
 # ---------------------------------------------------------------------------
 # POST /api/v1/orders/ — create order
@@ -5,8 +5,10 @@ Tests cover:
 - /ws/orders rejects connections without a token (close code 4001)
 - /ws/orders rejects connections with an invalid JWT (close code 4001)
 - /ws/orders accepts connections with a valid JWT
+- /ws/orders rejects unknown ``types`` event filters (close code 1008)
 - /ws/notifications/{user_id} rejects when token user_id != path user_id
 - /ws/notifications/{user_id} accepts when token user_id matches path
+- closing a notification socket cancels its Redis forwarder
 
 WebSocket auth is handled by _authenticate_websocket in main.py, which reads
 the token from the ``access_token`` cookie or the ``token`` query parameter.
@@ -125,6 +127,27 @@ class TestWsOrdersAuth:
             # Close cleanly from the client side
             ws.close()
 
+    def test_ws_orders_unknown_event_type_rejected(self, ws_client, goldsmith_user):
+        """``?types=`` naming an unknown event type closes with 1008."""
+        from starlette.websockets import WebSocketDisconnect
+
+        token = _make_token(goldsmith_user.id)
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with ws_client.websocket_connect(
+                f"/ws/orders?token={token}&types=created,shipped"
+            ) as ws:
+                ws.receive_text()
+        assert exc_info.value.code == 1008
+
+    def test_ws_orders_event_type_filter_accepted(self, ws_client, goldsmith_user):
+        """Known event types are accepted, comma-separated or repeated."""
+        token = _make_token(goldsmith_user.id)
+        with ws_client.websocket_connect(
+            f"/ws/orders?token={token}&types=created,status&types=updated"
+        ) as ws:
+            ws.send_text("ping")
+            ws.close()
+
 
 # ===========================================================================
 # /ws/notifications/{user_id} tests
@@ -164,3 +187,26 @@ class TestWsNotificationsAuth:
             # Connection accepted — send a message to verify the socket is live
             ws.send_text("ping")
             ws.close()
+
+    def test_ws_notifications_disconnect_cancels_forwarder(
+        self, ws_client, goldsmith_user
+    ):
+        """Closing the socket cancels the Redis forwarder before the handler ends."""
+        cancelled = []
+
+        async def _forward(ws, channel):
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                cancelled.append(channel)
+                raise
+
+        token = _make_token(goldsmith_user.id)
+        with patch("goldsmith_erp.main.subscribe_and_forward", new=_forward):
+            with ws_client.websocket_connect(
+                f"/ws/notifications/{goldsmith_user.id}?token={token}"
+            ) as ws:
+                ws.send_text("ping")
+                ws.close()
+
+        assert cancelled == [f"notifications:{goldsmith_user.id}"]
@@ -0,0 +1,196 @@
+"""
+Unit tests for AuditLogBuffer
+
+Tests cover:
+- enqueue pads rows and rejects unknown columns
+- flush writes every queued row in batches of max_size
+- failed flushes re-queue the rows, up to max_retries
+- a row the database rejects is dropped without blocking the rest
+- a full queue refuses rows so callers write them directly
+- stop() drains the queue; the background task flushes once max_size is hit
+- CustomerRepository routes audit rows through the buffer / AUDIT_TRAIL_LEVEL
+- AuditLoggingMiddleware queues rows while the flusher runs, else writes them
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from goldsmith_erp.core.config import settings
+from goldsmith_erp.db.audit_buffer import AuditLogBuffer
+from goldsmith_erp.db.models import CustomerAuditLog
+from goldsmith_erp.db.repositories.customer import CustomerRepository
+from goldsmith_erp.middleware import audit_logging
+from goldsmith_erp.middleware.audit_logging import AuditLoggingMiddleware
+
+
+@pytest.fixture
+def buffer(db_session):
+    # Bind to the engine db_session uses (see test_audit_logging_middleware).
+    factory = sessionmaker(
+        bind=db_session.bind, class_=AsyncSession, expire_on_commit=False
+    )
+    return AuditLogBuffer(session_factory=factory, flush_interval=60, max_size=2)
+
+
+async def _audit_count(db_session) -> int:
+    result = await db_session.execute(select(func.count(CustomerAuditLog.id)))
+    return result.scalar_one()
+
+
+@pytest.mark.asyncio
+class TestAuditLogBuffer:
+    async def test_enqueue_rejects_unknown_columns(self, buffer):
+        with pytest.raises(ValueError, match="legal_basis"):
+            buffer.enqueue({"action": "accessed", "legal_basis": "contract"})
+        assert len(buffer) == 0
+
+    async def test_flush_writes_all_rows_in_batches(self, buffer, db_session):
+        for index in range(5):
+            buffer.enqueue({"action": "accessed", "entity_id": index})
+
+        assert await buffer.flush() == 5
+        assert len(buffer) == 0
+        assert await _audit_count(db_session) == 5
+        row = (await db_session.execute(select(CustomerAuditLog).limit(1))).scalar()
+        assert row.timestamp is not None and row.created_at is not None
+
+    async def test_failed_flush_requeues(self, db_session):
+        def _broken_factory():
+            raise RuntimeError("database unavailable")
+
+        buffer = AuditLogBuffer(session_factory=_broken_factory, max_size=10)
+        buffer.enqueue({"action": "accessed"})
+
+        assert await buffer.flush() == 0
+        assert len(buffer) == 1
+
+    async def test_failed_rows_dropped_after_max_retries(self, caplog):
+        def _broken_factory():
+            raise RuntimeError("database unavailable")
+
+        buffer = AuditLogBuffer(session_factory=_broken_factory, max_retries=2)
+        buffer.enqueue({"action": "accessed"})
+
+        await buffer.flush()
+        assert len(buffer) == 1
+        await buffer.flush()
+        assert len(buffer) == 0
+        assert "audit row dropped" in caplog.text
+
+    async def test_bad_row_is_dropped_and_good_rows_written(self, db_session, caplog):
+        factory = sessionmaker(
+            bind=db_session.bind, class_=AsyncSession, expire_on_commit=False
+        )
+        buffer = AuditLogBuffer(session_factory=factory, max_size=10)
+        for index in range(5):
+            buffer.enqueue({"action": "accessed", "entity_id": index})
+        buffer.enqueue({"action": None, "entity_id": 99})  # NOT NULL violation
+        for index in range(5, 9):
+            buffer.enqueue({"action": "accessed", "entity_id": index})
+
+        assert await buffer.flush() == 9
+        assert len(buffer) == 0
+        assert await _audit_count(db_session) == 9
+        assert "rejected by the database" in caplog.text
+
+        # The queue is not poisoned: later rows still go through.
+        buffer.enqueue({"action": "updated"})
+        assert await buffer.flush() == 1
+
+    async def test_full_queue_refuses_rows(self, db_session):
+        buffer = AuditLogBuffer(max_queue=2, max_size=10)
+        assert buffer.enqueue({"action": "accessed"}) is True
+        assert buffer.enqueue({"action": "accessed"}) is True
+        assert buffer.enqueue({"action": "accessed"}) is False
+        assert len(buffer) == 2
+
+    async def test_background_task_flushes_when_full_and_stop_drains(
+        self, buffer, db_session
+    ):
+        buffer.start()
+        buffer.enqueue({"action": "accessed"})
+        buffer.enqueue({"action": "accessed"})
+        for _ in range(50):
+            if len(buffer) == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert len(buffer) == 0
+
+        buffer.enqueue({"action": "updated"})
+        await buffer.stop()
+
+        assert await _audit_count(db_session) == 3
+
+
+@pytest.mark.asyncio
+class TestRepositoryBuffering:
+    async def test_repository_enqueues_instead_of_session_add(
+        self, buffer, db_session, sample_customer, sample_user
+    ):
+        repo = CustomerRepository(
+            db_session, current_user_id=sample_user.id, audit_buffer=buffer
+        )
+
+        await repo.update(sample_customer.id, notes="A", source="walk-in")
+
+        assert len(buffer) == 2
+        assert await _audit_count(db_session) == 0
+        await buffer.flush()
+        assert await _audit_count(db_session) == 2
+
+    async def test_mutations_only_level_skips_reads(
+        self, buffer, db_session, sample_customer, sample_user, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "AUDIT_TRAIL_LEVEL", "mutations_only")
+        repo = CustomerRepository(
+            db_session, current_user_id=sample_user.id, audit_buffer=buffer
+        )
+
+        await repo.get_by_id(sample_customer.id)
+        assert len(buffer) == 0
+        await repo.delete(sample_customer.id)
+        assert len(buffer) == 1
+
+
+@pytest.mark.asyncio
+class TestMiddlewareBuffering:
+    async def _log(self, middleware):
+        await middleware._log_to_database(
+            customer_id=None,
+            action="list_accessed",
+            method="GET",
+            endpoint="/api/v1/customers",
+            user_id=None,
+            user_email=None,
+            user_role=None,
+            ip_address="127.0.0.1",
+            user_agent="pytest",
+            status_code=200,
+            duration_ms=1.0,
+        )
+
+    async def test_running_buffer_takes_the_row(self, buffer, db_session):
+        middleware = AuditLoggingMiddleware(app=None, audit_buffer=buffer)
+        buffer.start()
+
+        await self._log(middleware)
+        assert len(buffer) == 1
+        assert await _audit_count(db_session) == 0
+
+        await buffer.stop()
+        assert await _audit_count(db_session) == 1
+
+    async def test_idle_buffer_falls_back_to_direct_write(
+        self, buffer, db_session, monkeypatch
+    ):
+        monkeypatch.setattr(audit_logging, "AsyncSessionLocal", buffer._session_factory)
+        middleware = AuditLoggingMiddleware(app=None, audit_buffer=buffer)
+
+        await self._log(middleware)
+
+        assert len(buffer) == 0
+        assert await _audit_count(db_session) == 1
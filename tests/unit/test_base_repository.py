@@ -0,0 +1,158 @@
+"""
+Unit tests for BaseRepository
+
+Tests cover:
+- default_criteria applied as global loader criteria on get_all / count
+- iter_all streaming with filters and ordering
+- lambda_stmt-backed get_by_id / exists (per-model, no cross-talk)
+- operator filters (in / range / ilike) on get_all, count and iter_all
+- filter / order fields resolved against the precomputed column map only
+"""
+
+import pytest
+
+from goldsmith_erp.db.models import Material, MetalPurchase
+from goldsmith_erp.db.repositories.base import BaseRepository
+
+
+async def _seed_materials(db_session):
+    db_session.add_all(
+        [
+            Material(name="Gold 750", unit_price=60.0, stock=10.0, unit="g"),
+            Material(name="Silber 925", unit_price=1.0, stock=0.0, unit="g"),
+            Material(name="Platin", unit_price=35.0, stock=3.0, unit="g"),
+        ]
+    )
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+class TestDefaultCriteria:
+    """default_criteria narrows every get_all / count query"""
+
+    async def test_without_criteria_returns_everything(self, db_session):
+        await _seed_materials(db_session)
+        repo = BaseRepository(Material, db_session)
+
+        assert len(await repo.get_all()) == 3
+        assert await repo.count() == 3
+
+    async def test_criteria_filter_get_all_and_count(self, db_session):
+        await _seed_materials(db_session)
+        repo = BaseRepository(
+            Material, db_session, default_criteria=[Material.stock > 0]
+        )
+
+        names = {m.name for m in await repo.get_all()}
+        assert names == {"Gold 750", "Platin"}
+        assert await repo.count() == 2
+
+    async def test_criteria_combine_with_filters(self, db_session):
+        await _seed_materials(db_session)
+        repo = BaseRepository(
+            Material, db_session, default_criteria=[Material.stock > 0]
+        )
+
+        result = await repo.get_all(filters={"name": "Silber 925"})
+        assert result == []
+        assert await repo.count(filters={"name": "Platin"}) == 1
+
+
+@pytest.mark.asyncio
+class TestOperatorFilters:
+    """Dict-valued filters map to IN / range / LIKE predicates in SQL"""
+
+    async def test_in_filter(self, db_session):
+        await _seed_materials(db_session)
+        repo = BaseRepository(Material, db_session)
+
+        result = await repo.get_all(filters={"name": {"in": ["Platin", "Gold 750"]}})
+        assert sorted(m.name for m in result) == ["Gold 750", "Platin"]
+
+    async def test_range_filter(self, db_session):
+        await _seed_materials(db_session)
+        repo = BaseRepository(Material, db_session)
+
+        filters = {"unit_price": {"gte": 1.0, "lt": 60.0}}
+        assert sorted(m.name for m in await repo.get_all(filters=filters)) == [
+            "Platin",
+            "Silber 925",
+        ]
+        assert await repo.count(filters=filters) == 2
+
+    async def test_ilike_filter_with_equality(self, db_session):
+        await _seed_materials(db_session)
+        repo = BaseRepository(Material, db_session)
+
+        filters = {"name": {"ilike": "%GOLD%"}, "unit": "g"}
+        assert [m.name async for m in repo.iter_all(filters=filters)] == ["Gold 750"]
+
+    async def test_only_mapped_columns_filter_and_order(self, db_session):
+        await _seed_materials(db_session)
+        repo = BaseRepository(Material, db_session)
+
+        # Relationships and methods are not filter/order targets: ignored.
+        result = await repo.get_all(
+            filters={"orders": 1, "get_all": 1}, order_by="-orders"
+        )
+        assert len(result) == 3
+        assert [m.name for m in await repo.get_all(order_by="-unit_price")] == [
+            "Gold 750",
+            "Platin",
+            "Silber 925",
+        ]
+
+    async def test_unknown_operator_rejected(self, db_session):
+        repo = BaseRepository(Material, db_session)
+
+        with pytest.raises(ValueError, match="Unsupported filter operator"):
+            await repo.get_all(filters={"stock": {"between": (1, 2)}})
+
+
+@pytest.mark.asyncio
+class TestIterAll:
+    """iter_all streams the same rows get_all would return, unpaginated"""
+
+    async def test_streams_all_rows_in_order(self, db_session):
+        await _seed_materials(db_session)
+        repo = BaseRepository(Material, db_session)
+
+        names = [m.name async for m in repo.iter_all(order_by="name", chunk_size=1)]
+        assert names == ["Gold 750", "Platin", "Silber 925"]
+
+    async def test_respects_filters_and_default_criteria(self, db_session):
+        await _seed_materials(db_session)
+        repo = BaseRepository(
+            Material, db_session, default_criteria=[Material.stock > 0]
+        )
+
+        names = [m.name async for m in repo.iter_all(filters={"unit": "g"})]
+        assert sorted(names) == ["Gold 750", "Platin"]
+
+
+@pytest.mark.asyncio
+class TestLambdaLookups:
+    """get_by_id / exists run through cached lambda statements"""
+
+    async def test_get_by_id_and_exists(self, db_session):
+        await _seed_materials(db_session)
+        repo = BaseRepository(Material, db_session)
+        material = (await repo.get_all(order_by="name"))[0]
+
+        assert (await repo.get_by_id(material.id)).name == "Gold 750"
+        assert await repo.exists(material.id) is True
+        assert await repo.get_by_id(-1) is None
+        assert await repo.exists(-1) is False
+
+    async def test_statement_cache_is_per_model(
+        self, db_session, sample_metal_purchase
+    ):
+        await _seed_materials(db_session)
+        materials = BaseRepository(Material, db_session)
+        purchases = BaseRepository(MetalPurchase, db_session)
+
+        purchase = await purchases.get_by_id(sample_metal_purchase.id)
+        material = await materials.get_by_id((await materials.get_all())[0].id)
+
+        assert isinstance(purchase, MetalPurchase)
+        assert isinstance(material, Material)
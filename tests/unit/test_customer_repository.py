@@ -0,0 +1,423 @@
+"""
+Unit tests for CustomerRepository PII handling
+
+Tests cover:
+- EncryptionService.decrypt_many (positional alignment, empty slots, errors)
+- _decrypt_customers_pii: one batch call per page, per-slot fallback
+- create: one INSERT ... RETURNING, no refresh
+- update: per-field audit rows written in one executemany INSERT, PII redacted
+- update / soft delete as single UPDATE ... RETURNING statements
+- _log_audit adds rows without its own flush; the closing commit writes them
+- email_exists / search: blind-index lookups for full email addresses
+- search: substring match on decrypted names, page loaded by ID
+- list_summary: narrow column tuples, no ORM instances
+- iter_scheduled_for_deletion: streamed in decrypted partitions
+- get_by_id / get_by_email / get_audit_logs as lambda statements
+- get_by_id_with_orders / get_all_with_orders: selectinload of live orders
+- order_by whitelist and keyset pagination (list_after)
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from cryptography.fernet import Fernet
+from sqlalchemy import select
+
+from goldsmith_erp.core import encryption as encryption_mod
+from goldsmith_erp.core.encryption import EncryptionError, EncryptionService
+from goldsmith_erp.db.models import Customer, CustomerAuditLog, Order
+from goldsmith_erp.db.repositories.customer import CustomerRepository
+
+
+@pytest.fixture
+def encryption(monkeypatch):
+    monkeypatch.setattr(
+        encryption_mod.settings, "ENCRYPTION_KEY", Fernet.generate_key().decode()
+    )
+    return EncryptionService()
+
+
+@pytest.fixture
+def repo(encryption):
+    repository = CustomerRepository(session=None, current_user_id=1)
+    repository.encryption = encryption
+    return repository
+
+
+def _customer(encryption, id, phone=None, address_line1=None, address_line2=None):
+    return SimpleNamespace(
+        id=id,
+        phone=encryption.encrypt(phone),
+        address_line1=encryption.encrypt(address_line1),
+        address_line2=encryption.encrypt(address_line2),
+    )
+
+
+class TestDecryptMany:
+    def test_aligned_with_input(self, encryption):
+        tokens = [encryption.encrypt("a"), None, "", encryption.encrypt("b")]
+
+        assert encryption.decrypt_many(tokens) == ["a", None, None, "b"]
+
+    def test_invalid_token_raises(self, encryption):
+        with pytest.raises(EncryptionError):
+            encryption.decrypt_many([encryption.encrypt("a"), "not-a-token"])
+
+
+class TestDecryptCustomersPii:
+    def test_single_batch_call_for_page(self, repo, encryption, monkeypatch):
+        customers = [
+            _customer(encryption, 1, phone="+49 1", address_line1="Hauptstr. 1"),
+            _customer(encryption, 2, address_line2="Hinterhaus"),
+        ]
+        calls = []
+        real = encryption.decrypt_many
+        monkeypatch.setattr(
+            encryption,
+            "decrypt_many",
+            lambda values: calls.append(values) or real(values),
+        )
+
+        result = repo._decrypt_customers_pii(customers)
+
+        assert len(calls) == 1 and len(calls[0]) == 3
+        assert (result[0].phone, result[0].address_line1) == ("+49 1", "Hauptstr. 1")
+        assert result[0].address_line2 is None
+        assert result[1].address_line2 == "Hinterhaus"
+
+    def test_corrupt_slot_keeps_ciphertext(self, repo, encryption, caplog):
+        good = _customer(encryption, 1, phone="+49 1")
+        bad = _customer(encryption, 2)
+        bad.phone = "corrupt"
+
+        repo._decrypt_customers_pii([good, bad])
+
+        assert good.phone == "+49 1"
+        assert bad.phone == "corrupt"
+        assert "customer 2 field=phone" in caplog.text
+
+    def test_no_pii_skips_decryption(self, repo, encryption, monkeypatch):
+        monkeypatch.setattr(
+            encryption, "decrypt_many", lambda values: pytest.fail("unexpected call")
+        )
+
+        assert repo._decrypt_customers_pii([_customer(encryption, 1)])[0].phone is None
+
+    def test_batch_success_skips_per_slot_decrypt(self, repo, encryption, monkeypatch):
+        customers = [_customer(encryption, 1, phone="+49 1")]
+        monkeypatch.setattr(
+            encryption, "decrypt", lambda value: pytest.fail("unexpected call")
+        )
+
+        assert repo._decrypt_customers_pii(customers)[0].phone == "+49 1"
+
+
+@pytest.mark.asyncio
+class TestCreate:
+    async def test_create_is_single_insert_returning(
+        self, db_session, sample_user, monkeypatch
+    ):
+        repo = CustomerRepository(db_session, current_user_id=sample_user.id)
+        monkeypatch.setattr(
+            db_session, "refresh", lambda *a, **k: pytest.fail("unexpected refresh")
+        )
+
+        customer = await repo.create(
+            customer_number="CUST-202610-0001",
+            first_name="Erika",
+            last_name="Musterfrau",
+            email="erika@example.com",
+            city="Köln",
+        )
+
+        assert customer.id is not None
+        assert customer.email_hash is not None and customer.country == "Deutschland"
+        assert await repo.email_exists("erika@example.com") is True
+        log = (
+            await db_session.execute(
+                select(CustomerAuditLog).where(
+                    CustomerAuditLog.customer_id == customer.id
+                )
+            )
+        ).scalar_one()
+        assert log.action == "created"
+        assert log.details == {"legal_basis": "contract", "purpose": None}
+
+
+@pytest.mark.asyncio
+class TestUpdateAuditRows:
+    async def test_multi_field_update_adds_audit_rows_in_one_batch(
+        self, db_session, sample_customer, sample_user, monkeypatch
+    ):
+        repo = CustomerRepository(db_session, current_user_id=sample_user.id)
+        flushes = []
+        real_flush = db_session.flush
+
+        async def _counting_flush(*args, **kwargs):
+            flushes.append(1)
+            return await real_flush(*args, **kwargs)
+
+        monkeypatch.setattr(db_session, "flush", _counting_flush)
+
+        updated = await repo.update(
+            sample_customer.id, notes="Stammkunde", source="walk-in", city="Köln"
+        )
+
+        assert updated.notes == "Stammkunde"
+        assert flushes == []
+        # Written through Core executemany: no ORM audit instances created.
+        assert not any(
+            isinstance(obj, CustomerAuditLog)
+            for obj in db_session.identity_map.values()
+        )
+        rows = (
+            await db_session.execute(
+                select(CustomerAuditLog.field_name).where(
+                    CustomerAuditLog.customer_id == sample_customer.id,
+                    CustomerAuditLog.action == "updated",
+                )
+            )
+        ).scalars()
+        assert sorted(rows) == ["city", "notes", "source"]
+
+    async def test_pii_values_redacted_in_audit_rows(
+        self, db_session, sample_customer, sample_user
+    ):
+        repo = CustomerRepository(db_session, current_user_id=sample_user.id)
+
+        await repo.update(
+            sample_customer.id, city="Köln", birthday=datetime(1990, 5, 17)
+        )
+
+        rows = (
+            await db_session.execute(
+                select(
+                    CustomerAuditLog.field_name,
+                    CustomerAuditLog.old_value,
+                    CustomerAuditLog.new_value,
+                )
+                .where(CustomerAuditLog.customer_id == sample_customer.id)
+                .order_by(CustomerAuditLog.field_name)
+            )
+        ).all()
+        assert [tuple(row) for row in rows] == [
+            ("birthday", None, "1990-05-17T00:00:00"),
+            ("city", None, "[REDACTED]"),
+        ]
+
+    async def test_untracked_update_skips_old_values(
+        self, db_session, sample_customer, sample_user
+    ):
+        repo = CustomerRepository(db_session, current_user_id=sample_user.id)
+
+        updated = await repo.update(
+            sample_customer.id, track_changes=False, notes="VIP", no_such_field=1
+        )
+
+        assert updated.notes == "VIP"
+        log = (
+            await db_session.execute(
+                select(CustomerAuditLog).where(
+                    CustomerAuditLog.customer_id == sample_customer.id
+                )
+            )
+        ).scalar_one()
+        assert (log.field_name, log.old_value, log.new_value) == ("notes", None, "VIP")
+
+    async def test_update_missing_or_deleted_customer(
+        self, db_session, sample_customer, sample_user
+    ):
+        repo = CustomerRepository(db_session, current_user_id=sample_user.id)
+
+        assert await repo.update(-1, notes="x") is None
+        assert await repo.delete(sample_customer.id, deletion_reason="Test") is True
+        assert await repo.update(sample_customer.id, notes="x") is None
+        assert await repo.update(sample_customer.id, track_changes=False) is None
+
+
+@pytest.mark.asyncio
+class TestSoftDelete:
+    async def test_soft_delete_is_single_update(
+        self, db_session, sample_customer, sample_user
+    ):
+        repo = CustomerRepository(db_session, current_user_id=sample_user.id)
+
+        assert await repo.delete(sample_customer.id, deletion_reason="Umzug") is True
+        assert await repo.delete(sample_customer.id) is False
+
+        row = (
+            await db_session.execute(
+                select(Customer.is_deleted, Customer.deletion_reason).where(
+                    Customer.id == sample_customer.id
+                )
+            )
+        ).one()
+        assert tuple(row) == (True, "Umzug")
+
+    async def test_audit_row_written_by_commit_not_extra_flush(
+        self, db_session, sample_customer, sample_user, monkeypatch
+    ):
+        repo = CustomerRepository(db_session, current_user_id=sample_user.id)
+        flushes = []
+        real_flush = db_session.flush
+
+        async def _counting_flush(*args, **kwargs):
+            flushes.append(1)
+            return await real_flush(*args, **kwargs)
+
+        monkeypatch.setattr(db_session, "flush", _counting_flush)
+
+        await repo.delete(sample_customer.id, deletion_reason="Umzug")
+
+        assert flushes == []
+        log = (
+            await db_session.execute(
+                select(CustomerAuditLog).where(
+                    CustomerAuditLog.customer_id == sample_customer.id
+                )
+            )
+        ).scalar_one()
+        assert log.action == "soft_deleted"
+        assert log.details == {"legal_basis": None, "purpose": "Umzug"}
+
+
+@pytest.mark.asyncio
+class TestLookups:
+    async def test_email_exists_ignores_soft_deleted(
+        self, db_session, sample_customer, sample_user
+    ):
+        repo = CustomerRepository(db_session, current_user_id=sample_user.id)
+
+        assert await repo.email_exists(sample_customer.email) is True
+        assert await repo.email_exists("nobody@example.com") is False
+        await repo.delete(sample_customer.id)
+        assert await repo.email_exists(sample_customer.email) is False
+
+    async def test_search_by_full_email_uses_blind_index(
+        self, db_session, sample_customer, sample_user
+    ):
+        repo = CustomerRepository(db_session, current_user_id=sample_user.id)
+
+        found = await repo.search(sample_customer.email.upper())
+
+        assert [c.id for c in found] == [sample_customer.id]
+
+    async def test_get_all_defaults_to_newest_active_first(
+        self, db_session, sample_customer, business_customer, sample_user
+    ):
+        repo = CustomerRepository(db_session, current_user_id=sample_user.id)
+        await repo.delete(sample_customer.id)
+
+        assert [c.id for c in await repo.get_all()] == [business_customer.id]
+        assert len(await repo.get_all(include_deleted=True)) == 2
+
+    async def test_list_summary_returns_column_tuples(
+        self, db_session, sample_customer, business_customer, sample_user
+    ):
+        repo = CustomerRepository(db_session, current_user_id=sample_user.id)
+        await repo.delete(sample_customer.id)
+        db_session.expunge_all()
+
+        summaries = await repo.list_summary()
+
+        assert [s.id for s in summaries] == [business_customer.id]
+        assert summaries[0].email == business_customer.email
+        assert summaries[0].is_active is True
+        assert len(db_session.identity_map) == 0
+        ordered = await repo.list_summary(include_deleted=True, order_by="id")
+        assert [s.id for s in ordered] == sorted(
+            [sample_customer.id, business_customer.id]
+        )
+
+    async def test_lambda_lookups_bind_fresh_parameters(
+        self, db_session, sample_customer, business_customer, sample_user
+    ):
+        repo = CustomerRepository(db_session, current_user_id=sample_user.id)
+
+        # Same code location, different closure values: no stale binds.
+        assert (await repo.get_by_id(sample_customer.id)).id == sample_customer.id
+        assert (await repo.get_by_id(business_customer.id)).id == business_customer.id
+        found = await repo.get_by_email(business_customer.email)
+        assert found.id == business_customer.id
+
+        await repo.delete(sample_customer.id)
+        assert await repo.get_by_id(sample_customer.id) is None
+        assert await repo.get_by_id(sample_customer.id, include_deleted=True)
+        assert await repo.get_by_email(sample_customer.email) is None
+
+        logs = await repo.get_audit_logs(sample_customer.id)
+        assert sorted(log.action for log in logs) == ["accessed", "soft_deleted"]
+        assert (
+            len(await repo.get_audit_logs(sample_customer.id, skip=1)) == len(logs) - 1
+        )
+
+    async def test_iter_scheduled_for_deletion_streams_due_rows(
+        self, db_session, sample_customer, business_customer, sample_user
+    ):
+        repo = CustomerRepository(db_session, current_user_id=sample_user.id)
+        now = datetime.utcnow()
+        sample_customer.deletion_scheduled_at = now - timedelta(days=1)
+        business_customer.deletion_scheduled_at = now + timedelta(days=1)
+        await db_session.commit()
+
+        due = [c async for c in repo.iter_scheduled_for_deletion(now, chunk_size=1)]
+
+        assert [c.id for c in due] == [sample_customer.id]
+        later = now + timedelta(days=2)
+        assert [c.id async for c in repo.iter_scheduled_for_deletion(later)] == sorted(
+            [sample_customer.id, business_customer.id]
+        )
+
+    async def test_search_matches_decrypted_names_and_pages_by_name(
+        self, db_session, sample_customer, business_customer, sample_user
+    ):
+        repo = CustomerRepository(db_session, current_user_id=sample_user.id)
+
+        assert [c.id for c in await repo.search("muster")] == [sample_customer.id]
+        assert [c.id for c in await repo.search("EDELMETALL")] == [business_customer.id]
+        # "m" hits both customers; results are ordered by last name.
+        both = await repo.search("m")
+        assert [c.last_name for c in both] == ["Mustermann", "Smith"]
+        assert [c.id for c in await repo.search("m", skip=1)] == [business_customer.id]
+        assert await repo.search("nobody") == []
+
+    async def test_with_orders_variants_eager_load_live_orders(
+        self, db_session, sample_customer, sample_order, sample_user
+    ):
+        repo = CustomerRepository(db_session, current_user_id=sample_user.id)
+        db_session.add(
+            Order(title="Storniert", customer_id=sample_customer.id, is_deleted=True)
+        )
+        await db_session.commit()
+        db_session.expunge_all()
+
+        customer = await repo.get_by_id_with_orders(sample_customer.id)
+        # Loaded up front: no lazy load (which would fail under asyncio).
+        assert [o.id for o in customer.orders] == [sample_order.id]
+
+        db_session.expunge_all()
+        page = await repo.get_all_with_orders()
+        assert [len(c.orders) for c in page] == [1]
+
+    async def test_order_by_whitelist(self, db_session, sample_customer, sample_user):
+        repo = CustomerRepository(db_session, current_user_id=sample_user.id)
+
+        assert len(await repo.get_all(order_by="-updated_at")) == 1
+        with pytest.raises(ValueError, match="last_name"):
+            await repo.get_all(order_by="last_name")
+        with pytest.raises(ValueError, match="email"):
+            await repo.list_summary(order_by="-email")
+
+    async def test_list_after_walks_pages_by_keyset(
+        self, db_session, sample_customer, business_customer, sample_user
+    ):
+        repo = CustomerRepository(db_session, current_user_id=sample_user.id)
+        expected = [c.id for c in await repo.get_all(order_by="-created_at")]
+
+        seen, cursor = [], None
+        while page := await repo.list_after(cursor, limit=1):
+            seen.extend(c.id for c in page)
+            cursor = (page[-1].created_at, page[-1].id)
+
+        assert sorted(seen) == sorted(expected) and len(seen) == 2
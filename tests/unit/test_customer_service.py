@@ -157,6 +157,15 @@ class TestCustomerRetrieval:
 
         assert customer is None
 
+    async def test_email_exists(self, db_session, sample_customer):
+        """email_exists answers via the blind index, case-insensitively"""
+        assert await CustomerService.email_exists(
+            db_session, sample_customer.email.upper()
+        )
+        assert not await CustomerService.email_exists(
+            db_session, "nonexistent@example.com"
+        )
+
     async def test_get_customers_all(
         self, db_session, sample_customer, business_customer
     ):
@@ -0,0 +1,97 @@
+"""Eager-loading hygiene for the repository and service layers.
+
+Purpose
+-------
+Pin the loader heuristic documented in ``db/repositories/order.py``:
+collections → ``selectinload``, scalars (many-to-one) → ``joinedload``.
+
+Background
+----------
+``joinedload`` of a collection repeats every parent row once per child
+(and multiplies across several collections), so list queries grow with
+parents × children instead of parents + children. ``selectinload`` reads
+each child row once with a ``WHERE ... IN`` query.
+
+The check parses ``db/repositories`` and ``services`` and resolves each
+``joinedload(Model.attr)`` against the mapped relationships; a collection
+target fails the test. ``contains_eager`` over an explicit JOIN is a
+deliberate choice and is not flagged.
+"""
+
+from __future__ import annotations
+
+import ast
+from pathlib import Path
+
+from sqlalchemy import inspect as sa_inspect
+
+from goldsmith_erp.db import models
+
+_SRC = Path(models.__file__).resolve().parents[1]
+_SCANNED = (_SRC / "db" / "repositories", _SRC / "services")
+
+
+def _model_aliases(tree: ast.Module) -> dict[str, str]:
+    """Local name → model class name for ``from ...db.models import X as Y``."""
+    aliases = {}
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, ast.ImportFrom)
+            and node.module == "goldsmith_erp.db.models"
+        ):
+            for name in node.names:
+                aliases[name.asname or name.name] = name.name
+    return aliases
+
+
+def _joinedload_targets(tree: ast.Module):
+    """(line, class name, attribute) for each ``joinedload(Class.attr)`` call."""
+    aliases = _model_aliases(tree)
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call) or not node.args:
+            continue
+        func = node.func
+        name = (
+            func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+        )
+        target = node.args[0]
+        if (
+            name == "joinedload"
+            and isinstance(target, ast.Attribute)
+            and isinstance(target.value, ast.Name)
+            and target.value.id in aliases
+        ):
+            yield node.lineno, aliases[target.value.id], target.attr
+
+
+def test_joinedload_only_targets_scalar_relationships():
+    offenders = []
+    for directory in _SCANNED:
+        for path in sorted(directory.rglob("*.py")):
+            tree = ast.parse(path.read_text(encoding="utf-8"))
+            for lineno, class_name, attr in _joinedload_targets(tree):
+                model = getattr(models, class_name, None)
+                if model is None:
+                    continue
+                relationship = sa_inspect(model).relationships.get(attr)
+                if relationship is not None and relationship.uselist:
+                    offenders.append(
+                        f"{path.relative_to(_SRC)}:{lineno} {class_name}.{attr}"
+                    )
+
+    assert not offenders, (
+        "joinedload() of a collection duplicates the parent row per child; "
+        "use selectinload() for collections (joinedload is for many-to-one): "
+        + ", ".join(offenders)
+    )
+
+
+def test_detector_flags_collection_joinedload():
+    """Guard the scanner itself against silently matching nothing."""
+    tree = ast.parse(
+        "from goldsmith_erp.db.models import Order as OrderModel\n"
+        "q = select(OrderModel).options(joinedload(OrderModel.materials))\n"
+    )
+
+    assert list(_joinedload_targets(tree)) == [(2, "Order", "materials")]
+    assert sa_inspect(models.Order).relationships["materials"].uselist
@@ -9,6 +9,7 @@ Covers:
 - Interruption minutes are subtracted from the raw duration_minutes.
 - Orders with zero billable hours are excluded entirely.
 - has_stone_setting reflects gemstone presence on the order (True/False).
+- Orders streamed across several yield_per batches all land in the corpus.
 """
 
 import uuid
@@ -414,3 +415,30 @@ class TestLoadCorpus:
 
         row_a = next(r for r in corpus if r.order_id == order_a.id)
         assert row_a.actual_hours == pytest.approx(1.0)
+
+    async def test_streams_across_batches(
+        self,
+        db_session,
+        corpus_customer,
+        corpus_user,
+        billable_activity,
+        monkeypatch,
+    ):
+        monkeypatch.setattr(
+            "goldsmith_erp.services.labor_corpus_service._CORPUS_BATCH_SIZE", 2
+        )
+        orders = [_make_order(corpus_customer.id) for _ in range(5)]
+        db_session.add_all(orders)
+        await db_session.flush()
+        db_session.add_all(
+            [
+                _make_entry(order.id, corpus_user.id, billable_activity.id, 30)
+                for order in orders
+            ]
+        )
+        await db_session.commit()
+
+        corpus = await load_corpus(db_session)
+
+        assert [row.order_id for row in corpus] == sorted(o.id for o in orders)
+        assert all(row.actual_hours == 0.5 for row in corpus)
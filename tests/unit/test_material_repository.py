@@ -0,0 +1,82 @@
+"""
+Unit tests for MaterialRepository
+
+Tests cover:
+- get_total_value aggregated in SQL (empty table, filters, operator filters)
+- adjust_stock as a guarded atomic UPDATE (add, subtract, negative guard)
+- set_stock returns the committed instance without a refresh
+"""
+
+import pytest
+from sqlalchemy import select
+
+from goldsmith_erp.db.models import Material
+from goldsmith_erp.db.repositories.material import MaterialRepository
+
+
+@pytest.mark.asyncio
+class TestTotalValue:
+    async def test_empty_inventory_is_zero(self, db_session):
+        assert await MaterialRepository(db_session).get_total_value() == 0.0
+
+    async def test_sums_stock_times_price_with_filters(self, db_session):
+        db_session.add_all(
+            [
+                Material(name="Gold 750", unit_price=60.0, stock=10.0, unit="g"),
+                Material(name="Silber 925", unit_price=1.0, stock=0.0, unit="g"),
+                Material(name="Platin", unit_price=35.0, stock=3.0, unit="g"),
+            ]
+        )
+        await db_session.commit()
+        repo = MaterialRepository(db_session)
+
+        assert await repo.get_total_value() == pytest.approx(705.0)
+        assert await repo.get_total_value({"name": "Platin"}) == pytest.approx(105.0)
+        assert await repo.get_total_value(
+            {"unit_price": {"lt": 50.0}}
+        ) == pytest.approx(105.0)
+
+
+@pytest.mark.asyncio
+class TestAdjustStock:
+    async def _material(self, db_session, stock):
+        material = Material(name="Gold 750", unit_price=60.0, stock=stock, unit="g")
+        db_session.add(material)
+        await db_session.commit()
+        return material
+
+    async def test_add_and_subtract(self, db_session):
+        material = await self._material(db_session, 10.0)
+        repo = MaterialRepository(db_session)
+
+        assert (await repo.adjust_stock(material.id, 5.0)).stock == 15.0
+        updated = await repo.adjust_stock(material.id, 15.0, "subtract")
+        assert updated.stock == 0.0
+
+    async def test_guard_rejects_negative_stock(self, db_session):
+        material = await self._material(db_session, 10.0)
+        repo = MaterialRepository(db_session)
+
+        with pytest.raises(ValueError, match="Available: 10.0"):
+            await repo.adjust_stock(material.id, 15.0, "subtract")
+        stock = await db_session.scalar(
+            select(Material.stock).where(Material.id == material.id)
+        )
+        assert stock == 10.0
+
+    async def test_missing_material_and_invalid_operation(self, db_session):
+        repo = MaterialRepository(db_session)
+
+        assert await repo.adjust_stock(-1, 1.0) is None
+        with pytest.raises(ValueError, match="Invalid operation"):
+            await repo.adjust_stock(-1, 1.0, "multiply")
+
+    async def test_set_stock_returns_committed_value(self, db_session):
+        material = await self._material(db_session, 10.0)
+        repo = MaterialRepository(db_session)
+
+        assert (await repo.set_stock(material.id, 4.0)).stock == 4.0
+        stock = await db_session.scalar(
+            select(Material.stock).where(Material.id == material.id)
+        )
+        assert stock == 4.0
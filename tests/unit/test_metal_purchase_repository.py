@@ -0,0 +1,105 @@
+"""
+Unit tests for MetalPurchaseRepository
+
+Tests cover:
+- SQL-side FIFO/LIFO batch selection (only the batches actually drawn from)
+- Weighted average over open batches
+- Guarded UPDATE ... RETURNING decrement (snap-to-zero, stock guard)
+- default_criteria hides depleted batches from get_all / count
+"""
+
+import pytest
+from sqlalchemy import select
+
+from goldsmith_erp.db.models import MetalPurchase, MetalType
+from goldsmith_erp.db.repositories.metal_purchase import MetalPurchaseRepository
+
+
+@pytest.mark.asyncio
+class TestBatchSelection:
+    """select_batches_for_consumption returns the minimal batch prefix"""
+
+    async def test_fifo_returns_only_needed_batches(
+        self, db_session, multiple_metal_purchases
+    ):
+        repo = MetalPurchaseRepository(db_session)
+
+        batches = await repo.select_batches_for_consumption(MetalType.GOLD_18K, 150.0)
+
+        assert [b.price_per_gram for b in batches] == [44.0, 45.0]
+        assert [b.cumulative_weight_g for b in batches] == [100.0, 200.0]
+        assert all(b.total_available_g == 300.0 for b in batches)
+
+    async def test_lifo_starts_with_newest(self, db_session, multiple_metal_purchases):
+        repo = MetalPurchaseRepository(db_session)
+
+        batches = await repo.select_batches_for_consumption(
+            MetalType.GOLD_18K, 50.0, lifo=True
+        )
+
+        assert [b.price_per_gram for b in batches] == [46.0]
+
+    async def test_shortfall_returns_every_open_batch(
+        self, db_session, multiple_metal_purchases
+    ):
+        repo = MetalPurchaseRepository(db_session)
+
+        batches = await repo.select_batches_for_consumption(MetalType.GOLD_18K, 500.0)
+
+        assert len(batches) == 3
+        assert batches[0].total_available_g == 300.0
+
+    async def test_no_inventory(self, db_session):
+        repo = MetalPurchaseRepository(db_session)
+
+        assert await repo.select_batches_for_consumption(MetalType.GOLD_24K, 1.0) == []
+
+    async def test_weighted_average(self, db_session, multiple_metal_purchases):
+        repo = MetalPurchaseRepository(db_session)
+
+        total, avg = await repo.get_weighted_average(MetalType.GOLD_18K)
+
+        assert total == pytest.approx(300.0)
+        assert avg == pytest.approx(45.0)
+        assert await repo.get_weighted_average(MetalType.GOLD_24K) == (0.0, None)
+
+
+@pytest.mark.asyncio
+class TestConsumeBatches:
+    """consume_batches decrements atomically and guards stock"""
+
+    async def test_decrements_and_snaps_to_zero(
+        self, db_session, multiple_metal_purchases
+    ):
+        first, second, _ = multiple_metal_purchases
+        repo = MetalPurchaseRepository(db_session)
+
+        consumed = await repo.consume_batches({first.id: 99.995, second.id: 30.0})
+
+        assert consumed == {first.id: 0.0, second.id: pytest.approx(70.0)}
+
+    async def test_guard_skips_batches_without_enough_stock(
+        self, db_session, sample_metal_purchase
+    ):
+        repo = MetalPurchaseRepository(db_session)
+        purchase_id = sample_metal_purchase.id
+
+        consumed = await repo.consume_batches({purchase_id: 150.0})
+
+        assert consumed == {}
+        result = await db_session.execute(
+            select(MetalPurchase.remaining_weight_g).where(
+                MetalPurchase.id == purchase_id
+            )
+        )
+        assert result.scalar_one() == 100.0
+
+    async def test_default_criteria_hide_depleted_batches(
+        self, db_session, multiple_metal_purchases
+    ):
+        first = multiple_metal_purchases[0]
+        repo = MetalPurchaseRepository(db_session)
+        await repo.consume_batches({first.id: 100.0})
+
+        assert await repo.count() == 2
+        assert first.id not in {p.id for p in await repo.get_all()}
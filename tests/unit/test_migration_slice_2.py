@@ -439,7 +439,7 @@ def test_fk_restrict_blocks_delete_via_orders_punzierung_verified_by(
                 "retention_class, is_deleted, scrap_percentage, "
                 "hourly_rate, profit_margin_percent, vat_rate, "
                 "has_scrap_gold) "
-                "VALUES (1, 'T', 'NEW', '585', CURRENT_TIMESTAMP, "
+                "VALUES (1, 'T', 'new', '585', CURRENT_TIMESTAMP, "
                 "CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, :uid, '[]', "
                 "'hallmark_10y', 0, 5.0, 75.0, 40.0, 19.0, 0)"
             ),
@@ -464,7 +464,7 @@ def test_fk_restrict_blocks_delete_via_material_usage_user_id(
                 "created_at, updated_at, punzierung_verified_marks, "
                 "retention_class, is_deleted, scrap_percentage, "
                 "hourly_rate, profit_margin_percent, vat_rate, "
-                "has_scrap_gold) VALUES (2, 'T', 'NEW', '585', "
+                "has_scrap_gold) VALUES (2, 'T', 'new', '585', "
                 "CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, '[]', "
                 "'indefinite_business', 0, 5.0, 75.0, 40.0, 19.0, 0)"
             )
@@ -0,0 +1,32 @@
+"""
+Unit tests for time-ordered (UUIDv7) primary keys
+
+Tests cover:
+- uuid7_str produces RFC 9562 version-7 / RFC 4122-variant UUIDs
+- ids sort by creation time (index locality on insert)
+- TimeEntry / OrderPhoto use it as their default id
+"""
+
+import time
+import uuid
+
+from goldsmith_erp.db.models import OrderPhoto, TimeEntry, uuid7_str
+
+
+def test_uuid7_version_and_variant():
+    value = uuid.UUID(uuid7_str())
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+
+
+def test_uuid7_sorts_by_creation_time():
+    first = uuid7_str()
+    time.sleep(0.002)
+    second = uuid7_str()
+    assert first < second
+
+
+def test_high_insert_tables_default_to_uuid7():
+    for model in (TimeEntry, OrderPhoto):
+        default = model.__table__.c.id.default
+        assert default.arg.__name__ == "uuid7_str"
@@ -0,0 +1,746 @@
+"""
+Unit tests for OrderRepository
+
+Tests cover:
+- keyset (cursor) pagination walks every live order exactly once
+- cursor pages match the OFFSET pages they replace
+- cursor cannot be combined with a custom order_by
+- cached lambda statements still bind each call's filters / sort column
+- many-to-one relationships joined, collections selectin-loaded
+- get_by_id_with_items loads only the requested relationships
+- relationships not eager-loaded raise instead of lazy-loading
+- list_orders_page: has_more from limit + 1 rows, no count query
+- iter_orders streams the list_orders query unpaginated
+- count_orders(estimate=True) stays exact off PostgreSQL
+- count_by_status / count_by_customer: cached, invalidated by order writes
+- get_order_statistics: all counters from one aggregate query
+- get_order_statistics: Redis cache-aside, invalidated by writes, single-flight
+- _recalculate_order_costs: server-side UPDATE with a SUM subquery
+- add_order_items: one insert flush, one recalculation, one commit
+- update_order_item: one UPDATE ... RETURNING, recalculation only on cost fields
+- remove_order_item: delete and recalculation in one commit
+- update_order / soft_delete_order: one UPDATE ... RETURNING each
+- updated_at stamped by the column's onupdate on every UPDATE path
+- UPDATE ... RETURNING repopulates instances already in the session
+- order_by / update fields checked against precomputed allow-sets
+- create_order: order and initial status history in one transaction
+- add_status_history_many: one executemany INSERT, one commit
+- order_number derived from created_at / ID, no per-create COUNT query
+- get_by_order_number: primary key plus created_at month range
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+import pytest
+
+from sqlalchemy import event, select, update
+from sqlalchemy.exc import InvalidRequestError
+
+from goldsmith_erp.core.cache import ORDER_STATISTICS_KEY
+from goldsmith_erp.db.models import (
+    Order,
+    OrderItem,
+    OrderStatusEnum,
+    OrderStatusHistory,
+)
+from goldsmith_erp.db.repositories.order import OrderRepository
+
+
+async def _seed_orders(db_session, customer_id: int) -> None:
+    base = datetime(2026, 1, 1)
+    db_session.add_all(
+        [
+            # Two orders share a created_at: the id tiebreaker must order them.
+            Order(title="A", customer_id=customer_id, created_at=base),
+            Order(title="B", customer_id=customer_id, created_at=base),
+            Order(title="C", customer_id=customer_id, created_at=base + timedelta(1)),
+            Order(
+                title="D",
+                customer_id=customer_id,
+                created_at=base + timedelta(2),
+                is_deleted=True,
+            ),
+        ]
+    )
+    await db_session.commit()
+
+
+@pytest.fixture
+def sql_statements(db_session):
+    """SQL statements sent to the database while the test runs."""
+    statements = []
+    engine = db_session.bind.sync_engine
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _record)
+
+
+@pytest.mark.asyncio
+class TestLoaderStrategies:
+    async def test_list_orders_joins_customer(
+        self, db_session, sample_customer, sql_statements
+    ):
+        await _seed_orders(db_session, sample_customer.id)
+        repo = OrderRepository(db_session)
+        sql_statements.clear()
+
+        orders = await repo.list_orders()
+
+        assert len(sql_statements) == 1
+        assert {o.customer.id for o in orders} == {sample_customer.id}
+
+    async def test_get_by_id_with_items(
+        self, db_session, sample_order, sample_user, sql_statements
+    ):
+        db_session.add_all(
+            [
+                OrderItem(order_id=sample_order.id, description="Öse", quantity=1),
+                OrderStatusHistory(
+                    order_id=sample_order.id,
+                    to_status="draft",
+                    changed_by=sample_user.id,
+                ),
+            ]
+        )
+        await db_session.commit()
+        db_session.expunge_all()
+        repo = OrderRepository(db_session)
+        sql_statements.clear()
+
+        order = await repo.get_by_id_with_items(sample_order.id)
+
+        # Order + customer, items, history + user.
+        assert len(sql_statements) == 3
+        assert order.customer is not None
+        assert [i.description for i in order.order_items] == ["Öse"]
+        assert order.status_history[0].user.id == sample_user.id
+
+    async def test_unloaded_relationships_raise(self, db_session, sample_order):
+        repo = OrderRepository(db_session)
+        db_session.expunge_all()
+
+        (listed,) = await repo.list_orders()
+        with pytest.raises(InvalidRequestError):
+            listed.order_items
+        db_session.expunge_all()
+
+        order = await repo.get_by_id_with_items(sample_order.id, load=["customer"])
+        assert order.customer is not None
+        with pytest.raises(InvalidRequestError):
+            order.status_history
+
+    async def test_get_by_id_with_items_selected_loads(
+        self, db_session, sample_order, sql_statements
+    ):
+        repo = OrderRepository(db_session)
+        db_session.expunge_all()
+        sql_statements.clear()
+
+        order = await repo.get_by_id_with_items(sample_order.id, load=["order_items"])
+
+        assert len(sql_statements) == 2
+        assert order.order_items == []
+        assert "status_history" not in order.__dict__
+        with pytest.raises(ValueError, match="assigned_user"):
+            await repo.get_by_id_with_items(sample_order.id, load=["assigned_user"])
+
+
+@pytest.mark.asyncio
+class TestListOrdersKeyset:
+    async def test_cursor_pages_cover_live_orders_once(
+        self, db_session, sample_customer
+    ):
+        await _seed_orders(db_session, sample_customer.id)
+        repo = OrderRepository(db_session)
+
+        titles, cursor = [], None
+        while page := await repo.list_orders(limit=2, cursor=cursor):
+            titles.extend(o.title for o in page)
+            cursor = (page[-1].created_at, page[-1].id)
+
+        assert titles == ["C", "B", "A"]
+        offset_pages = await repo.list_orders(skip=1, limit=2)
+        assert [o.title for o in offset_pages] == ["B", "A"]
+
+    async def test_page_reports_has_more_without_counting(
+        self, db_session, sample_customer
+    ):
+        await _seed_orders(db_session, sample_customer.id)
+        repo = OrderRepository(db_session)
+
+        first, has_more = await repo.list_orders_page(limit=2)
+        assert [o.title for o in first] == ["C", "B"]
+        assert has_more is True
+
+        last = first[-1]
+        rest, has_more = await repo.list_orders_page(
+            limit=2, cursor=(last.created_at, last.id)
+        )
+        assert [o.title for o in rest] == ["A"]
+        assert has_more is False
+
+    async def test_iter_orders_streams_in_list_order(self, db_session, sample_customer):
+        await _seed_orders(db_session, sample_customer.id)
+        repo = OrderRepository(db_session)
+
+        streamed = [o async for o in repo.iter_orders(chunk_size=1)]
+
+        assert [o.title for o in streamed] == ["C", "B", "A"]
+        assert [o.title for o in await repo.list_orders()] == ["C", "B", "A"]
+        assert all(o.customer.id == sample_customer.id for o in streamed)
+        titles = [o.title async for o in repo.iter_orders(include_deleted=True)]
+        assert titles == ["D", "C", "B", "A"]
+
+    async def test_estimated_count_is_exact_off_postgres(
+        self, db_session, sample_customer
+    ):
+        await _seed_orders(db_session, sample_customer.id)
+        repo = OrderRepository(db_session)
+
+        assert await repo.count_orders(estimate=True) == 3
+        assert await repo.count_orders(estimate=True, include_deleted=True) == 4
+
+    async def test_cached_statement_rebinds_filters_and_sort(
+        self, db_session, sample_customer
+    ):
+        await _seed_orders(db_session, sample_customer.id)
+        repo = OrderRepository(db_session)
+
+        db_session.add(Order(title="0", customer_id=sample_customer.id))
+        await db_session.commit()
+
+        # Same code path, different sort column: must not reuse the first.
+        by_title = await repo.list_orders(order_by="title")
+        by_id = await repo.list_orders(order_by="id")
+        assert [o.title for o in by_title] == ["0", "A", "B", "C"]
+        assert [o.title for o in by_id] == ["A", "B", "C", "0"]
+
+        other = sample_customer.id + 1000
+        assert len(await repo.list_orders(customer_id=sample_customer.id)) == 4
+        assert await repo.list_orders(customer_id=other) == []
+        assert len(await repo.list_orders(skip=3)) == 1
+
+    async def test_cursor_rejects_custom_order(self, db_session):
+        repo = OrderRepository(db_session)
+
+        with pytest.raises(ValueError, match="default order"):
+            await repo.list_orders(order_by="title", cursor=(datetime(2026, 1, 1), 1))
+
+
+class _FakeRedis:
+    """In-memory stand-in for the get/set/setex/delete calls core.cache makes."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+
+@pytest.fixture
+def fake_cache(monkeypatch):
+    fake = _FakeRedis()
+
+    @asynccontextmanager
+    async def _client():
+        yield fake
+
+    monkeypatch.setattr("goldsmith_erp.core.cache.get_redis_client", _client)
+    return fake
+
+
+@pytest.mark.asyncio
+class TestCachedCounts:
+    async def test_counts_cached_until_order_write(
+        self, db_session, sample_customer, fake_cache
+    ):
+        await _seed_orders(db_session, sample_customer.id)
+        repo = OrderRepository(db_session)
+
+        assert await repo.count_by_status(OrderStatusEnum.NEW) == 3
+        assert await repo.count_by_customer(sample_customer.id) == 3
+        assert "cache:orders:count:status:new" in fake_cache.data
+
+        # A write bypassing the repository is served stale until the TTL...
+        db_session.add(Order(title="E", customer_id=sample_customer.id))
+        await db_session.commit()
+        assert await repo.count_by_customer(sample_customer.id) == 3
+        assert await repo.count_by_customer(sample_customer.id, use_cache=False) == 4
+
+        # ...while repository writes drop every cached count.
+        await repo.create_order(customer_id=sample_customer.id, title="F")
+        assert not any(k.startswith("cache:orders:count:") for k in fake_cache.data)
+        assert await repo.count_by_status(OrderStatusEnum.NEW) == 4
+        assert await repo.count_by_customer(sample_customer.id) == 5
+
+
+@pytest.mark.asyncio
+class TestOrderStatistics:
+    async def test_single_aggregate_query(
+        self, db_session, sample_customer, monkeypatch
+    ):
+        past = datetime.utcnow() - timedelta(days=1)
+        db_session.add_all(
+            [
+                Order(
+                    title="Geliefert",
+                    customer_id=sample_customer.id,
+                    status=OrderStatusEnum.DELIVERED,
+                    price=1000.0,
+                    material_cost_calculated=300.0,
+                    labor_cost=200.0,
+                ),
+                Order(
+                    title="Überfällig",
+                    customer_id=sample_customer.id,
+                    status=OrderStatusEnum.IN_PROGRESS,
+                    deadline=past,
+                ),
+                Order(
+                    title="Fertig",
+                    customer_id=sample_customer.id,
+                    status=OrderStatusEnum.COMPLETED,
+                    deadline=past,
+                ),
+                Order(
+                    title="Gelöscht",
+                    customer_id=sample_customer.id,
+                    status=OrderStatusEnum.DELIVERED,
+                    price=50.0,
+                    is_deleted=True,
+                ),
+            ]
+        )
+        await db_session.commit()
+        repo = OrderRepository(db_session)
+        statements = []
+        real_execute = db_session.execute
+
+        async def _counting_execute(statement, *args, **kwargs):
+            statements.append(statement)
+            return await real_execute(statement, *args, **kwargs)
+
+        monkeypatch.setattr(db_session, "execute", _counting_execute)
+
+        stats = await repo.get_order_statistics(use_cache=False)
+
+        assert len(statements) == 1
+        assert stats["total_orders"] == 3
+        assert (stats["delivered_orders"], stats["in_progress_orders"]) == (1, 1)
+        assert (stats["total_revenue"], stats["total_costs"]) == (1000.0, 500.0)
+        assert stats["average_margin"] == 50.0
+        assert stats["overdue_orders"] == 1
+
+    async def test_cached_until_a_write_invalidates(
+        self, db_session, sample_customer, fake_cache
+    ):
+        repo = OrderRepository(db_session)
+        assert (await repo.get_order_statistics())["total_orders"] == 0
+        assert "cache:" + ORDER_STATISTICS_KEY in fake_cache.data
+
+        # A write that bypasses the order write paths is not seen...
+        db_session.add(Order(title="Direkt", customer_id=sample_customer.id))
+        await db_session.commit()
+        assert (await repo.get_order_statistics())["total_orders"] == 0
+
+        # ...but create_order invalidates after commit.
+        await repo.create_order(customer_id=sample_customer.id, title="Neu")
+        assert (await repo.get_order_statistics())["total_orders"] == 2
+
+    async def test_single_flight_waits_for_concurrent_fill(
+        self, db_session, fake_cache, monkeypatch
+    ):
+        key = "cache:" + ORDER_STATISTICS_KEY
+        fake_cache.data[key + ":lock"] = "1"
+        real_get = fake_cache.get
+
+        async def _filled_after_first_poll(k):
+            if k == key and fake_cache.data.get(key) is None:
+                fake_cache.data[key] = '{"total_orders": 42}'
+                return None
+            return await real_get(k)
+
+        monkeypatch.setattr(fake_cache, "get", _filled_after_first_poll)
+        repo = OrderRepository(db_session)
+
+        async def _no_compute():
+            raise AssertionError("lock holder is computing; must not recompute")
+
+        monkeypatch.setattr(repo, "_compute_order_statistics", _no_compute)
+
+        assert await repo.get_order_statistics() == {"total_orders": 42}
+
+
+@pytest.mark.asyncio
+class TestRecalculateOrderCosts:
+    async def test_costs_computed_in_one_update(self, db_session, sample_order):
+        sample_order.labor_hours = 2.0
+        sample_order.hourly_rate = 80.0
+        db_session.add_all(
+            [
+                OrderItem(
+                    order_id=sample_order.id,
+                    description="Gold 750",
+                    quantity=3,
+                    unit_price=10.0,
+                ),
+                OrderItem(order_id=sample_order.id, description="Öse", quantity=1),
+            ]
+        )
+        await db_session.commit()
+        repo = OrderRepository(db_session)
+
+        await repo._recalculate_order_costs(sample_order.id)
+
+        await db_session.refresh(sample_order)
+        assert sample_order.material_cost_calculated == 30.0
+        assert sample_order.labor_cost == 160.0
+
+        sample_order.actual_hours = 1.5
+        await db_session.commit()
+        await repo._recalculate_order_costs(sample_order.id)
+        await db_session.refresh(sample_order)
+        assert sample_order.labor_cost == 120.0
+
+
+@pytest.mark.asyncio
+class TestAddOrderItems:
+    async def test_batch_commits_once_and_recalculates(
+        self, db_session, sample_order, monkeypatch
+    ):
+        commits = []
+        real_commit = db_session.commit
+
+        async def _counting_commit():
+            commits.append(1)
+            await real_commit()
+
+        monkeypatch.setattr(db_session, "commit", _counting_commit)
+        repo = OrderRepository(db_session)
+
+        items = await repo.add_order_items(
+            sample_order.id,
+            [
+                {"description": "Gold 750", "quantity": 3, "unit_price": 10.0},
+                {"description": "Brillant", "quantity": 1, "unit_price": 250.0},
+            ],
+        )
+
+        assert len(commits) == 1
+        assert [i.description for i in items] == ["Gold 750", "Brillant"]
+        assert all(i.id is not None for i in items)
+        await db_session.refresh(sample_order)
+        assert sample_order.material_cost_calculated == 280.0
+
+    async def test_single_item_and_unknown_fields(self, db_session, sample_order):
+        repo = OrderRepository(db_session)
+
+        item = await repo.add_order_item(
+            sample_order.id,
+            material_id=None,
+            quantity_planned=2,
+            unit="g",
+            unit_price=5.0,
+        )
+        assert (item.description, item.quantity) == ("2 g", 2)
+
+        with pytest.raises(ValueError, match="unit"):
+            await repo.add_order_items(sample_order.id, [{"unit": "g"}])
+
+
+@pytest.mark.asyncio
+class TestUpdateOrderItem:
+    async def test_cost_change_updates_and_recalculates_in_one_commit(
+        self, db_session, sample_order, sql_statements, monkeypatch
+    ):
+        repo = OrderRepository(db_session)
+        (item,) = await repo.add_order_items(
+            sample_order.id,
+            [{"description": "Gold 750", "quantity": 3, "unit_price": 10.0}],
+        )
+        commits = []
+        real_commit = db_session.commit
+
+        async def _counting_commit():
+            commits.append(1)
+            await real_commit()
+
+        monkeypatch.setattr(db_session, "commit", _counting_commit)
+        sql_statements.clear()
+
+        updated = await repo.mark_material_used(item.id, 2, notes="Ring-Schiene")
+
+        assert len(commits) == 1
+        assert not any(s.lstrip().upper().startswith("SELECT") for s in sql_statements)
+        assert (updated.quantity, updated.description) == (2, "Ring-Schiene")
+        await db_session.refresh(sample_order)
+        assert sample_order.material_cost_calculated == 20.0
+
+    async def test_non_cost_change_skips_recalculation(
+        self, db_session, sample_order, sql_statements
+    ):
+        repo = OrderRepository(db_session)
+        (item,) = await repo.add_order_items(
+            sample_order.id, [{"description": "Öse", "quantity": 1}]
+        )
+        sql_statements.clear()
+
+        await repo.update_order_item(item.id, description="Öse 925")
+
+        assert sum("UPDATE orders" in s for s in sql_statements) == 0
+        assert await repo.update_order_item(-1, quantity=1) is None
+
+    async def test_allocate_writes_nothing(
+        self, db_session, sample_order, sql_statements
+    ):
+        repo = OrderRepository(db_session)
+        (item,) = await repo.add_order_items(
+            sample_order.id, [{"description": "Öse", "quantity": 1}]
+        )
+        sql_statements.clear()
+
+        assert (await repo.allocate_material(item.id)).id == item.id
+        assert len(sql_statements) == 1
+
+
+@pytest.mark.asyncio
+class TestRemoveOrderItem:
+    async def test_delete_and_recalculation_in_one_commit(
+        self, db_session, sample_order, monkeypatch
+    ):
+        repo = OrderRepository(db_session)
+        gold, _ = await repo.add_order_items(
+            sample_order.id,
+            [
+                {"description": "Gold 750", "quantity": 3, "unit_price": 10.0},
+                {"description": "Brillant", "quantity": 1, "unit_price": 250.0},
+            ],
+        )
+        commits = []
+        real_commit = db_session.commit
+
+        async def _counting_commit():
+            commits.append(1)
+            await real_commit()
+
+        monkeypatch.setattr(db_session, "commit", _counting_commit)
+
+        assert await repo.remove_order_item(gold.id) is True
+
+        assert len(commits) == 1
+        await db_session.refresh(sample_order)
+        assert sample_order.material_cost_calculated == 250.0
+        assert await repo.remove_order_item(gold.id) is False
+
+
+@pytest.mark.asyncio
+class TestUpdateReturning:
+    async def test_update_order_is_one_statement(
+        self, db_session, sample_order, sql_statements
+    ):
+        repo = OrderRepository(db_session)
+        sql_statements.clear()
+
+        order = await repo.update_order(
+            sample_order.id, title="Neuer Titel", updated_by=1, assigned_user=2
+        )
+
+        assert len(sql_statements) == 1
+        assert "RETURNING" in sql_statements[0]
+        assert order.title == "Neuer Titel"
+        assert await repo.update_order(-1, title="x") is None
+
+    async def test_updated_at_stamped_by_column_onupdate(
+        self, db_session, sample_order
+    ):
+        stale = datetime(2020, 1, 1)
+        await db_session.execute(
+            update(Order).where(Order.id == sample_order.id).values(updated_at=stale)
+        )
+        await db_session.commit()
+        repo = OrderRepository(db_session)
+
+        order = await repo.update_order(sample_order.id, title="Neuer Titel")
+        assert order.updated_at > stale
+
+        await db_session.execute(
+            update(Order).where(Order.id == sample_order.id).values(updated_at=stale)
+        )
+        await repo._recalculate_order_costs(sample_order.id)
+        await db_session.refresh(sample_order)
+        assert sample_order.updated_at > stale
+
+    async def test_session_instances_repopulated_without_refresh(
+        self, db_session, sample_order, sql_statements
+    ):
+        repo = OrderRepository(db_session)
+        (item,) = await repo.add_order_items(
+            sample_order.id,
+            [{"description": "Gold 750", "quantity": 3, "unit_price": 10.0}],
+        )
+        assert sample_order.material_cost_calculated == 30.0
+
+        await repo.update_order_item(item.id, quantity=5)
+        await repo.update_order(sample_order.id, title="Neuer Titel")
+        sql_statements.clear()
+
+        assert (item.quantity, sample_order.title) == (5, "Neuer Titel")
+        assert sample_order.material_cost_calculated == 50.0
+        assert sql_statements == []
+
+    async def test_update_order_ignores_protected_columns(
+        self, db_session, sample_order
+    ):
+        repo = OrderRepository(db_session)
+
+        order = await repo.update_order(
+            sample_order.id, id=999, is_deleted=True, price=120.0
+        )
+
+        assert (order.id, order.is_deleted, order.price) == (
+            sample_order.id,
+            False,
+            120.0,
+        )
+
+    async def test_unsupported_order_by_rejected(self, db_session):
+        repo = OrderRepository(db_session)
+
+        for order_by in ("-__class__", "customer", "special_instructions"):
+            with pytest.raises(ValueError, match="Unsupported order_by field"):
+                await repo.list_orders(order_by=order_by)
+
+    async def test_soft_delete_order(self, db_session, sample_order):
+        repo = OrderRepository(db_session)
+
+        order = await repo.soft_delete_order(sample_order.id)
+
+        assert order.is_deleted is True and order.deleted_at is not None
+        assert await repo.soft_delete_order(sample_order.id) is None
+        assert await repo.get_by_id(sample_order.id) is None
+
+
+@pytest.mark.asyncio
+class TestCreateOrder:
+    async def test_order_and_history_committed_together(
+        self, db_session, sample_customer, sample_user, monkeypatch
+    ):
+        async def _no_refresh(*args, **kwargs):
+            raise AssertionError("create_order must not refresh")
+
+        monkeypatch.setattr(db_session, "refresh", _no_refresh)
+        repo = OrderRepository(db_session, current_user_id=sample_user.id)
+
+        order = await repo.create_order(
+            customer_id=sample_customer.id,
+            title="Trauring",
+            estimated_hours=2.0,
+            hourly_rate=80.0,
+            customer_price=450.0,
+        )
+
+        assert order.id is not None
+        assert order.status == OrderStatusEnum.DRAFT
+        assert order.labor_cost == 160.0
+        assert order.price == 450.0
+        history = (
+            (
+                await db_session.execute(
+                    select(OrderStatusHistory).where(
+                        OrderStatusHistory.order_id == order.id
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+        assert [(h.from_status, h.to_status) for h in history] == [(None, "draft")]
+        assert history[0].changed_by == sample_user.id
+
+    async def test_order_number_derived_from_id(self, db_session, sample_customer):
+        repo = OrderRepository(db_session)
+
+        first = await repo.create_order(customer_id=sample_customer.id, title="A")
+        second = await repo.create_order(customer_id=sample_customer.id, title="B")
+
+        month = first.created_at.strftime("%Y%m")
+        assert first.order_number == f"ORD-{month}-{first.id:04d}"
+        assert second.order_number != first.order_number
+        assert Order(title="unsaved").order_number is None
+
+    async def test_get_by_order_number(self, db_session, sample_customer):
+        repo = OrderRepository(db_session)
+        order = await repo.create_order(customer_id=sample_customer.id, title="A")
+
+        assert (await repo.get_by_order_number(order.order_number)).id == order.id
+        other_month = order.created_at - timedelta(days=40)
+        wrong = f"ORD-{other_month:%Y%m}-{order.id:04d}"
+        assert await repo.get_by_order_number(wrong) is None
+        assert await repo.get_by_order_number("ORD-202613-0001") is None
+        assert await repo.get_by_order_number("RE-2026-0001") is None
+
+
+@pytest.mark.asyncio
+class TestStatusHistoryMany:
+    async def test_bulk_entries_one_commit(
+        self, db_session, sample_order, sample_user, monkeypatch
+    ):
+        commits = []
+        real_commit = db_session.commit
+
+        async def _counting_commit():
+            commits.append(1)
+            await real_commit()
+
+        monkeypatch.setattr(db_session, "commit", _counting_commit)
+        repo = OrderRepository(db_session, current_user_id=sample_user.id)
+
+        written = await repo.add_status_history_many(
+            [
+                {
+                    "order_id": sample_order.id,
+                    "old_status": None,
+                    "new_status": "draft",
+                },
+                {
+                    "order_id": sample_order.id,
+                    "old_status": "draft",
+                    "new_status": "in_progress",
+                    "reason": "Sammelfreigabe",
+                },
+            ]
+        )
+
+        assert written == 2 and len(commits) == 1
+        history = (
+            (
+                await db_session.execute(
+                    select(OrderStatusHistory).order_by(OrderStatusHistory.id)
+                )
+            )
+            .scalars()
+            .all()
+        )
+        assert [(h.to_status, h.notes) for h in history] == [
+            ("draft", None),
+            ("in_progress", "Sammelfreigabe"),
+        ]
+        assert {h.changed_by for h in history} == {sample_user.id}
+        assert await repo.add_status_history_many([]) == 0
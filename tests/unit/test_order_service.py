@@ -4,7 +4,7 @@ Unit tests for OrderService
 Tests cover:
 - Order creation with validation
 - Order creation with materials, metal types, and cost fields
-- Order retrieval (by ID, listing, pagination)
+- Order retrieval (by ID, listing, pagination, fixed query counts)
 - Order updates (status transitions, fields, relationships)
 - Order deletion
 - Material validation and relationships
@@ -16,6 +16,8 @@ Tests cover:
 from datetime import datetime, timedelta
 
 import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
 
 from goldsmith_erp.db.models import (
     CostingMethod,
@@ -28,6 +30,20 @@ from goldsmith_erp.models.order import OrderCreate, OrderUpdate
 from goldsmith_erp.services.order_service import OrderService
 
 
+@pytest.fixture
+def sql_statements(db_session):
+    """SQL statements sent to the database while the test runs."""
+    statements = []
+    engine = db_session.bind.sync_engine
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _record)
+
+
 @pytest.mark.asyncio
 class TestOrderCreation:
     """Test order creation and validation"""
@@ -111,6 +127,23 @@ class TestOrderCreation:
 
         assert len(order.materials) == 3
 
+    async def test_create_order_links_materials_without_loading_them(
+        self, db_session, sample_customer, sample_material, sql_statements
+    ):
+        """Materials are validated by ID and linked with one INSERT"""
+        order_data = OrderCreate(
+            title="Linked materials",
+            description="Test order",
+            customer_id=sample_customer.id,
+            materials=[sample_material.id],
+        )
+
+        order = await OrderService.create_order(db_session, order_data)
+
+        link_inserts = [s for s in sql_statements if "INTO order_materials" in s]
+        assert len(link_inserts) == 1
+        assert [m.id for m in order.materials] == [sample_material.id]
+
     async def test_create_order_with_invalid_material_raises_error(
         self, db_session, sample_customer
     ):
@@ -248,6 +281,78 @@ class TestOrderRetrieval:
         assert len(retrieved.materials) == 1
         assert retrieved.materials[0].id == sample_material.id
 
+    async def test_get_order_single_query_for_customer_and_materials(
+        self, db_session, sample_customer, sample_material, sql_statements
+    ):
+        """Customer and materials share one query; gemstones add one more"""
+        order = await OrderService.create_order(
+            db_session,
+            OrderCreate(
+                title="Order with materials",
+                description="Test order",
+                customer_id=sample_customer.id,
+                materials=[sample_material.id],
+            ),
+        )
+        db_session.expunge_all()
+        sql_statements.clear()
+
+        retrieved = await OrderService.get_order(db_session, order.id)
+
+        assert len(sql_statements) == 2
+        assert retrieved.customer.id == sample_customer.id
+        assert [m.id for m in retrieved.materials] == [sample_material.id]
+        assert retrieved.gemstones == []
+
+    async def test_get_order_reuses_compiled_statement(
+        self, db_session, sample_customer
+    ):
+        """Lookups for different IDs share one compiled SELECT"""
+        orders = [
+            Order(title=f"O{i}", customer_id=sample_customer.id) for i in range(2)
+        ]
+        db_session.add_all(orders)
+        await db_session.commit()
+        compiled = []
+        engine = db_session.bind.sync_engine
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                compiled.append(context.compiled)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            for order in orders:
+                db_session.expunge_all()
+                retrieved = await OrderService.get_order(db_session, order.id)
+                assert retrieved.id == order.id
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+        # Two SELECTs per call (order + gemstones); the order SELECT of the
+        # second call reuses the first call's Compiled object.
+        assert len(compiled) == 4
+        assert compiled[2] is compiled[0]
+
+    async def test_get_orders_query_count_independent_of_rows(
+        self, db_session, sample_customer, sql_statements
+    ):
+        """List path: one query per eager load, not per order; no lazy loads"""
+        db_session.add_all(
+            [Order(title=f"O{i}", customer_id=sample_customer.id) for i in range(3)]
+        )
+        await db_session.commit()
+        db_session.expunge_all()
+        sql_statements.clear()
+
+        orders = await OrderService.get_orders(db_session)
+
+        # orders, materials, customer, gemstones
+        assert len(sql_statements) == 4
+        assert len(orders) == 3
+        with pytest.raises(InvalidRequestError):
+            orders[0].time_entries
+
     async def test_get_orders_all(self, db_session, sample_order):
         """Test getting all orders"""
         orders = await OrderService.get_orders(db_session)
@@ -278,6 +383,31 @@ class TestOrderRetrieval:
         # Ensure different orders
         assert page1[0].id != page2[0].id
 
+    async def test_get_orders_keyset_cursor(self, db_session, sample_customer):
+        """A (created_at, id) cursor continues exactly after the last row"""
+        base = datetime(2026, 1, 1)
+        db_session.add_all(
+            [
+                # Shared created_at: the id tiebreaker must order them.
+                Order(title="A", customer_id=sample_customer.id, created_at=base),
+                Order(title="B", customer_id=sample_customer.id, created_at=base),
+                Order(
+                    title="C",
+                    customer_id=sample_customer.id,
+                    created_at=base + timedelta(days=1),
+                ),
+            ]
+        )
+        await db_session.commit()
+
+        page1 = await OrderService.get_orders(db_session, limit=2)
+        last = page1[-1]
+        page2 = await OrderService.get_orders(
+            db_session, skip=50, limit=2, cursor=(last.created_at, last.id)
+        )
+
+        assert [o.title for o in page1 + page2] == ["C", "B", "A"]
+
     async def test_get_orders_ordered_by_created_at_desc(
         self, db_session, sample_customer
     ):
@@ -329,6 +459,32 @@ class TestOrderUpdate:
 
         assert updated.status == OrderStatusEnum.IN_PROGRESS
 
+    async def test_unguarded_status_change_updates_without_prior_select(
+        self, db_session, sample_order, sql_statements
+    ):
+        """No guard needs the row: the UPDATE is the first statement"""
+        sql_statements.clear()
+
+        updated = await OrderService.update_order(
+            db_session, sample_order.id, OrderUpdate(status=OrderStatusEnum.IN_PROGRESS)
+        )
+
+        assert sql_statements[0].lstrip().upper().startswith("UPDATE")
+        assert updated.status == OrderStatusEnum.IN_PROGRESS
+
+    async def test_unguarded_update_of_deleted_order_returns_none(
+        self, db_session, sample_order
+    ):
+        """The fast path still skips soft-deleted orders"""
+        sample_order.is_deleted = True
+        await db_session.commit()
+
+        updated = await OrderService.update_order(
+            db_session, sample_order.id, OrderUpdate(status=OrderStatusEnum.IN_PROGRESS)
+        )
+
+        assert updated is None
+
     async def test_update_order_status_transitions(self, db_session, sample_order):
         """Test full status workflow"""
         # NEW -> IN_PROGRESS
@@ -352,6 +508,27 @@ class TestOrderUpdate:
         order = await OrderService.get_order(db_session, sample_order.id)
         assert order.status == OrderStatusEnum.DELIVERED
 
+    async def test_status_change_loads_relationships_once(
+        self, db_session, sample_order, monkeypatch
+    ):
+        """Guards read the bare row; only the returned order is eager-loaded"""
+        calls = []
+        get_order = OrderService.get_order
+
+        async def _counting_get_order(db, order_id):
+            calls.append(order_id)
+            return await get_order(db, order_id)
+
+        monkeypatch.setattr(OrderService, "get_order", _counting_get_order)
+
+        updated = await OrderService.advance_status(
+            db_session, sample_order.id, OrderStatusEnum.IN_PROGRESS
+        )
+
+        assert calls == [sample_order.id]
+        assert updated.status == OrderStatusEnum.IN_PROGRESS
+        assert updated.customer is not None
+
     async def test_update_order_deadline(self, db_session, sample_order):
         """Test updating order deadline"""
         new_deadline = datetime.utcnow() + timedelta(days=30)
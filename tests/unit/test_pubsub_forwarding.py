@@ -0,0 +1,150 @@
+"""
+Unit tests for core.pubsub forwarding
+
+Tests cover:
+- every message's payload is forwarded to the socket
+- a failed send ends forwarding and closes the Redis subscription at once
+- ChannelBroadcaster fans one subscription out to all sockets, dropping
+  sockets whose send fails
+- a socket that falls queue_size messages behind is dropped and closed
+  with 1013 without delaying the others
+- sockets only receive the order event channels they registered for, and
+  publish_order_event routes each event type to its own channel
+"""
+
+import asyncio
+
+import pytest
+
+from goldsmith_erp.core import pubsub
+
+
+class _Socket:
+    def __init__(self, fail_after=None, stalled=False):
+        self.sent = []
+        self.fail_after = fail_after
+        self.stalled = stalled
+        self.close_code = None
+
+    async def send_text(self, data):
+        if self.stalled:
+            await asyncio.Event().wait()
+        if self.fail_after is not None and len(self.sent) >= self.fail_after:
+            raise RuntimeError("client gone")
+        self.sent.append(data)
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+@pytest.fixture
+def fake_subscription(monkeypatch):
+    state = {"closed": False, "messages": ["a", "b", "c"]}
+
+    async def _subscribe(*channels):
+        try:
+            for data in state["messages"]:
+                yield {"type": "message", "channel": channels[0], "data": data}
+        finally:
+            state["closed"] = True
+
+    monkeypatch.setattr(pubsub, "_subscribe", _subscribe)
+    return state
+
+
+@pytest.mark.asyncio
+class TestSubscribeAndForward:
+    async def test_forwards_payloads(self, fake_subscription):
+        ws = _Socket()
+
+        await pubsub.subscribe_and_forward(ws, "order_updates")
+
+        assert ws.sent == ["a", "b", "c"]
+        assert fake_subscription["closed"]
+
+    async def test_failed_send_drops_subscription(self, fake_subscription):
+        ws = _Socket(fail_after=1)
+
+        await pubsub.subscribe_and_forward(ws, "order_updates")
+
+        assert ws.sent == ["a"]
+        assert fake_subscription["closed"]
+
+
+@pytest.mark.asyncio
+class TestChannelBroadcaster:
+    async def test_broadcast_drops_failed_sockets(self):
+        broadcaster = pubsub.ChannelBroadcaster(["order_updates"])
+        healthy, broken = _Socket(), _Socket(fail_after=0)
+        broadcaster.connect(healthy)
+        broadcaster.connect(broken)
+
+        broadcaster.broadcast("a")
+        await asyncio.sleep(0.01)
+        broadcaster.broadcast("b")
+        await asyncio.sleep(0.01)
+
+        assert healthy.sent == ["a", "b"]
+        assert len(broadcaster) == 1
+        await broadcaster.stop()
+
+    async def test_slow_socket_dropped_when_queue_overflows(self):
+        broadcaster = pubsub.ChannelBroadcaster(["order_updates"], queue_size=2)
+        healthy, slow = _Socket(), _Socket(stalled=True)
+        broadcaster.connect(healthy)
+        broadcaster.connect(slow)
+
+        # The slow socket's sender holds "a"; "b" and "c" fill its queue.
+        for data in "abcd":
+            broadcaster.broadcast(data)
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+
+        assert healthy.sent == ["a", "b", "c", "d"]
+        assert slow.close_code == 1013
+        assert len(broadcaster) == 1
+        await broadcaster.stop()
+
+    async def test_one_subscription_feeds_every_socket(self, fake_subscription):
+        broadcaster = pubsub.ChannelBroadcaster(["order_updates"])
+        sockets = [_Socket(), _Socket()]
+        for ws in sockets:
+            broadcaster.connect(ws)
+
+        broadcaster.start()
+        for _ in range(50):
+            if fake_subscription["closed"] and all(len(ws.sent) == 3 for ws in sockets):
+                break
+            await asyncio.sleep(0.01)
+        await broadcaster.stop()
+
+        assert [ws.sent for ws in sockets] == [["a", "b", "c"]] * 2
+
+    async def test_sockets_only_get_their_channels(self):
+        created = pubsub.ORDER_EVENT_CHANNELS["created"]
+        status = pubsub.ORDER_EVENT_CHANNELS["status"]
+        broadcaster = pubsub.ChannelBroadcaster([created, status])
+        everything, status_only = _Socket(), _Socket()
+        broadcaster.connect(everything)
+        broadcaster.connect(status_only, [status])
+
+        broadcaster.broadcast("new", created)
+        broadcaster.broadcast("moved", status)
+        await asyncio.sleep(0.01)
+
+        assert everything.sent == ["new", "moved"]
+        assert status_only.sent == ["moved"]
+        with pytest.raises(ValueError, match="order_updates"):
+            broadcaster.connect(_Socket(), ["order_updates"])
+        await broadcaster.stop()
+
+    async def test_publish_order_event_uses_type_channel(self, monkeypatch):
+        published = []
+
+        async def _publish(channel, message):
+            published.append((channel, message))
+
+        monkeypatch.setattr(pubsub, "publish_event", _publish)
+        await pubsub.publish_order_event("status", "{}")
+
+        assert published == [("events:orders:status", "{}")]
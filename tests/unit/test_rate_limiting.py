@@ -0,0 +1,59 @@
+"""
+Unit tests for RateLimitMiddleware's Redis sliding window
+
+Tests cover:
+- the check is a single script call with a unique member per request
+- the script's {allowed, remaining, reset} reply maps onto the result tuple
+- a Redis error fails open
+"""
+
+import pytest
+
+from goldsmith_erp.middleware.rate_limiting import RateLimitMiddleware
+
+
+class _Script:
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+
+    async def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        if isinstance(self.reply, Exception):
+            raise self.reply
+        return self.reply
+
+
+def _limiter(reply):
+    limiter = RateLimitMiddleware(app=None)
+    limiter.redis_client = object()
+    limiter._sliding_window = _Script(reply)
+    return limiter
+
+
+@pytest.mark.asyncio
+class TestRedisSlidingWindow:
+    async def test_allowed_request_is_one_script_call(self):
+        limiter = _limiter([1, 99, 60])
+
+        assert await limiter._check_rate_limit("ip:1.2.3.4", 100, 60) == (
+            True,
+            99,
+            60,
+        )
+        await limiter._check_rate_limit("ip:1.2.3.4", 100, 60)
+
+        (keys, args), (_, second_args) = limiter._sliding_window.calls
+        assert keys == ["ratelimit:ip:1.2.3.4"]
+        assert args[1:3] == [60, 100]
+        assert args[3] != second_args[3]
+
+    async def test_denied_request_reports_reset(self):
+        limiter = _limiter([0, 0, 0])
+
+        assert await limiter._check_rate_limit("user:7", 5, 300) == (False, 0, 1)
+
+    async def test_redis_error_fails_open(self):
+        limiter = _limiter(ConnectionError("redis down"))
+
+        assert await limiter._check_rate_limit("user:7", 5, 300) == (True, 5, 300)
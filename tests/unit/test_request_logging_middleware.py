@@ -0,0 +1,76 @@
+"""
+Unit tests for middleware.logging.RequestLoggingMiddleware
+
+Tests cover:
+- every request gets an X-Request-ID, sampled or not
+- sample_rate=0 logs nothing for successful requests but still logs errors
+- health probes are never logged
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from goldsmith_erp.middleware import logging as request_logging
+from goldsmith_erp.middleware.logging import RequestLoggingMiddleware
+
+
+def _app(status):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    return app
+
+
+async def _call(middleware, path):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "headers": [],
+        "query_string": b"",
+        "server": ("testserver", 80),
+    }
+    await middleware(scope, receive, send)
+    return dict(sent[0]["headers"])
+
+
+@pytest.mark.asyncio
+class TestSampling:
+    async def test_unsampled_success_is_not_logged(self):
+        middleware = RequestLoggingMiddleware(_app(200), sample_rate=0.0)
+
+        with patch.object(request_logging.logger, "info") as info:
+            headers = await _call(middleware, "/api/v1/orders/")
+
+        assert b"x-request-id" in headers
+        info.assert_not_called()
+
+    async def test_errors_logged_even_when_unsampled(self):
+        middleware = RequestLoggingMiddleware(_app(500), sample_rate=0.0)
+
+        with patch.object(request_logging.logger, "info") as info:
+            await _call(middleware, "/api/v1/orders/")
+
+        assert [c.args[0] for c in info.call_args_list] == ["Request completed"]
+
+    async def test_probes_never_logged(self):
+        middleware = RequestLoggingMiddleware(_app(200), sample_rate=1.0)
+
+        with patch.object(request_logging.logger, "info") as info:
+            await _call(middleware, "/health/liveness")
+            await _call(middleware, "/api/v1/orders/")
+
+        assert [c.args[0] for c in info.call_args_list] == [
+            "Incoming request",
+            "Request completed",
+        ]
@@ -0,0 +1,66 @@
+"""
+Unit tests for db.transaction.transactional
+
+Tests cover:
+- the outermost block commits, and rolls back on error
+- a nested block does not commit the enclosing transaction early
+- a failed nested block only undoes its own work (SAVEPOINT)
+"""
+
+import pytest
+from sqlalchemy import event, select
+
+from goldsmith_erp.db.models import Material
+from goldsmith_erp.db.transaction import transactional
+
+
+async def _names(db_session):
+    result = await db_session.execute(select(Material.name).order_by(Material.name))
+    return list(result.scalars())
+
+
+@pytest.mark.asyncio
+class TestTransactional:
+    async def test_outer_block_commits_and_rolls_back(self, db_session):
+        async with transactional(db_session):
+            db_session.add(Material(name="Gold 750", unit_price=60.0, stock=1.0))
+
+        with pytest.raises(RuntimeError):
+            async with transactional(db_session):
+                db_session.add(Material(name="Platin", unit_price=35.0, stock=1.0))
+                await db_session.flush()
+                raise RuntimeError("boom")
+
+        assert await _names(db_session) == ["Gold 750"]
+
+    async def test_nested_block_does_not_commit_early(self, db_session):
+        commits = []
+        engine = db_session.bind.sync_engine
+
+        def _record(conn):
+            commits.append(conn)
+
+        event.listen(engine, "commit", _record)
+        try:
+            async with transactional(db_session):
+                async with transactional(db_session):
+                    db_session.add(
+                        Material(name="Gold 750", unit_price=60.0, stock=1.0)
+                    )
+                assert commits == []
+        finally:
+            event.remove(engine, "commit", _record)
+
+        assert len(commits) == 1
+
+    async def test_failed_nested_block_only_undoes_its_own_work(self, db_session):
+        async with transactional(db_session):
+            db_session.add(Material(name="Gold 750", unit_price=60.0, stock=1.0))
+            await db_session.flush()
+            with pytest.raises(RuntimeError):
+                async with transactional(db_session):
+                    db_session.add(Material(name="Platin", unit_price=35.0, stock=1.0))
+                    await db_session.flush()
+                    raise RuntimeError("boom")
+
+        assert await _names(db_session) == ["Gold 750"]
@@ -79,7 +79,7 @@ def _insert_order(conn, order_id: int) -> int:
             "updated_at, punzierung_verified_marks, retention_class, "
             "is_deleted, scrap_percentage, hourly_rate, "
             "profit_margin_percent, vat_rate, has_scrap_gold) "
-            "VALUES (:id, 'T', 'NEW', '585', CURRENT_TIMESTAMP, "
+            "VALUES (:id, 'T', 'new', '585', CURRENT_TIMESTAMP, "
             "CURRENT_TIMESTAMP, '[]', 'indefinite_business', 0, 5.0, "
             "75.0, 40.0, 19.0, 0)"
         ),